@@ -0,0 +1,85 @@
+"""
+Process wide cache of opened flopy binary output files.
+
+Opening a head or concentration file makes flopy scan all record headers
+to build its time index. The read data server keeps the opened files, so
+repeated requests of the same calculation only read the requested record.
+
+Files are evicted least recently used first when more than
+BINARY_FILE_CACHE_FILES files or BINARY_FILE_CACHE_BYTES bytes of output
+files are open. A file opened by several file classes counts once towards
+the bytes. A file is reopened when its modification time or size changed,
+e.g. after the calculation was run again. The listings of the latest
+BINARY_FILE_CACHE_FILES workspaces are kept as well.
+"""
+
+import os
+from collections import OrderedDict
+
+
+class BinaryFileCache:
+    max_files = int(os.environ.get('BINARY_FILE_CACHE_FILES', 32))
+    max_bytes = int(os.environ.get('BINARY_FILE_CACHE_BYTES', 4 * 1024 ** 3))
+
+    _files = OrderedDict()
+    _bytes = 0
+    _opened = {}
+    _listings = OrderedDict()
+
+    @classmethod
+    def get(cls, filename, file_class, **kwargs):
+        """Returns an opened instance of the flopy file class, e.g. HeadFile"""
+        stat = os.stat(filename)
+        key = (filename, file_class.__name__, tuple(sorted(kwargs.items())))
+
+        entry = cls._files.get(key)
+        if entry is not None and entry[0] == stat.st_mtime and entry[1] == stat.st_size:
+            cls._files.move_to_end(key)
+            return entry[2]
+
+        # The file changed, all its opened instances are outdated
+        outdated = [k for k, e in cls._files.items() if k[0] == filename and e[:2] != (stat.st_mtime, stat.st_size)]
+        for outdated_key in outdated:
+            cls.remove(outdated_key)
+
+        binary_file = file_class(filename=filename, **kwargs)
+        cls._files[key] = (stat.st_mtime, stat.st_size, binary_file)
+        if filename not in cls._opened:
+            cls._bytes += stat.st_size
+        cls._opened[filename] = cls._opened.get(filename, 0) + 1
+        cls.evict()
+
+        return binary_file
+
+    @classmethod
+    def evict(cls):
+        # The most recently opened file is always kept
+        while len(cls._files) > 1 and (len(cls._files) > cls.max_files or cls._bytes > cls.max_bytes):
+            cls.remove(next(iter(cls._files)))
+
+    @classmethod
+    def remove(cls, key):
+        mtime, size, binary_file = cls._files.pop(key)
+        cls._opened[key[0]] -= 1
+        if cls._opened[key[0]] == 0:
+            del cls._opened[key[0]]
+            cls._bytes -= size
+        try:
+            binary_file.close()
+        except Exception:
+            pass
+
+    @classmethod
+    def list_workspace(cls, workspace):
+        """Returns os.listdir of the workspace, listed again only if the directory changed"""
+        mtime = os.stat(workspace).st_mtime
+        listing = cls._listings.get(workspace)
+        if listing is None or listing[0] != mtime:
+            listing = (mtime, os.listdir(workspace))
+            cls._listings[workspace] = listing
+
+        cls._listings.move_to_end(workspace)
+        while len(cls._listings) > max(cls.max_files, 1):
+            cls._listings.popitem(last=False)
+
+        return listing[1]
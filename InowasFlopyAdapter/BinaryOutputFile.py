@@ -0,0 +1,113 @@
+"""
+Memory mapped reader of MODFLOW head/drawdown and MT3D concentration files.
+
+All records of these files are one layer with the same number of rows and
+columns, so the file is mapped as an array of (header, layer) records.
+Reading a cell of all time steps only touches the pages holding the
+requested values instead of reading through the whole file.
+
+Times are returned as the shortest decimal of the stored value, e.g. 0.1
+and not 0.10000000149011612 for a single precision file, and are matched
+exactly against the stored values at the precision of the file.
+"""
+
+import os
+import numpy as np
+
+
+class BinaryOutputFile:
+    """Head, drawdown (file_type='head') or concentration (file_type='ucn') file"""
+
+    def __init__(self, filename, file_type='head', precision='auto'):
+        if precision == 'auto':
+            precision = self.detect_precision(filename, file_type)
+
+        self._real = np.float32 if precision == 'single' else np.float64
+        header_dtype = self.header_dtype(file_type, precision)
+
+        first_header = np.fromfile(filename, dtype=header_dtype, count=1)[0]
+        self.nrow = int(first_header['nrow'])
+        self.ncol = int(first_header['ncol'])
+        record_dtype = np.dtype([('header', header_dtype), ('data', self._real, (self.nrow, self.ncol))])
+
+        if os.path.getsize(filename) % record_dtype.itemsize != 0:
+            raise Exception('Records of file ' + filename + ' do not have the same size.')
+
+        self._records = np.memmap(filename, dtype=record_dtype, mode='r')
+        headers = np.array(self._records['header'])
+        self._totim = headers['totim']
+        self._layer = headers['ilay'] - 1
+        self.times = [self.time_value(totim) for totim in np.unique(self._totim)]
+        self.nlay = int(self._layer.max()) + 1
+
+    @staticmethod
+    def header_dtype(file_type, precision):
+        real = '<f4' if precision == 'single' else '<f8'
+        if file_type == 'ucn':
+            return np.dtype([
+                ('ntrans', '<i4'), ('kstp', '<i4'), ('kper', '<i4'), ('totim', real),
+                ('text', 'S16'), ('ncol', '<i4'), ('nrow', '<i4'), ('ilay', '<i4')
+            ])
+
+        return np.dtype([
+            ('kstp', '<i4'), ('kper', '<i4'), ('pertim', real), ('totim', real),
+            ('text', 'S16'), ('ncol', '<i4'), ('nrow', '<i4'), ('ilay', '<i4')
+        ])
+
+    @classmethod
+    def detect_precision(cls, filename, file_type='head'):
+        """Returns 'single' or 'double', the precision for which the first header has a readable text"""
+        file_size = os.path.getsize(filename)
+        for precision in ('single', 'double'):
+            header_dtype = cls.header_dtype(file_type, precision)
+            if file_size < header_dtype.itemsize:
+                continue
+
+            header = np.fromfile(filename, dtype=header_dtype, count=1)[0]
+            try:
+                text = header['text'].decode('ascii')
+            except UnicodeDecodeError:
+                continue
+
+            if text.strip() and all(32 <= ord(char) < 127 for char in text) \
+                    and header['nrow'] > 0 and header['ncol'] > 0:
+                return precision
+
+        raise Exception('Precision of file ' + filename + ' could not be detected.')
+
+    def time_value(self, totim):
+        """Returns the stored time as float with the shortest decimal representation of its precision"""
+        if self._real is np.float32:
+            return float(str(np.float32(totim)))
+
+        return float(totim)
+
+    def get_times(self):
+        return self.times
+
+    def get_records(self):
+        """Returns (totim, layer index, 2D data) of all records in file order"""
+        for idx in range(len(self._records)):
+            yield self.time_value(self._totim[idx]), int(self._layer[idx]), self._records['data'][idx]
+
+    def get_layer(self, totim, layer):
+        record_idx = np.flatnonzero((self._layer == layer) & (self._totim == self._real(totim)))
+        if len(record_idx) == 0:
+            raise ValueError('No record for totim {} and layer {}.'.format(totim, layer))
+
+        return self._records['data'][record_idx[0]]
+
+    def get_ts(self, cells):
+        """Returns a time series [[totim, value], ...] for each (layer, row, column) of cells"""
+        time_series = []
+        for layer, row, column in cells:
+            record_idx = np.flatnonzero(self._layer == layer)
+            values = self._records['data'][record_idx, row, column]
+            time_series.append([
+                [self.time_value(totim), value] for totim, value in zip(self._totim[record_idx], values.tolist())
+            ])
+
+        return time_series
+
+    def close(self):
+        self._records = None
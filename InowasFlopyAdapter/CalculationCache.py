@@ -0,0 +1,232 @@
+"""
+Content addressed cache of calculation results.
+
+The key of a calculation is the hash of its version and normalized model
+data, i.e. without the model workspace and model name set by the server.
+The output files of a successful calculation are hard linked into a cache
+entry together with the calculation response. A calculation with the same
+key links these files into its workspace instead of running the models.
+
+Hard linked files share their content with the cache entry, the links of a
+workspace are recorded in .calculation_cache_links and removed by release()
+before the models run again. Files which are rewritten in place by the
+post-processing (summary, report, tiles) are copied instead of linked.
+
+The cache is enabled with CALCULATION_CACHE=1. Entries are kept in
+CALCULATION_CACHE_FOLDER (default <data folder>/.calculation_cache) and are
+evicted when they were not used for CALCULATION_CACHE_MAX_AGE_DAYS
+(default 30) or, oldest first, when all entries together are larger than
+CALCULATION_CACHE_MAX_SIZE_MB (default 10240). Eviction runs at most every
+CALCULATION_CACHE_EVICTION_INTERVAL seconds (default 600).
+
+An evicted entry is renamed to a hidden name before it is removed, so other
+workers see either the whole entry or none of it. A worker which is restoring
+the entry while it is evicted treats the calculation as not cached.
+"""
+
+import copy
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+
+class CalculationCache:
+    response_file = 'calculation_response.json'
+    links_file = '.calculation_cache_links'
+    eviction_file = '.last_eviction'
+    evicted_prefix = '.evicted-'
+    excluded_files = ['configuration.json', links_file]
+    copied_files = ['*.json', '*.report', 'tiles/*']
+
+    def __init__(self, folder, max_age_days=30, max_size_mb=10240, eviction_interval=600):
+        self._folder = folder
+        self._max_age = max_age_days * 24 * 3600
+        self._max_size = max_size_mb * 1024 * 1024
+        self._eviction_interval = eviction_interval
+
+    @classmethod
+    def from_environment(cls, datafolder):
+        """Returns the cache configured by environment variables, None if it is not enabled"""
+        if os.environ.get('CALCULATION_CACHE', '0').lower() not in ('1', 'true'):
+            return None
+
+        return cls(
+            folder=os.environ.get('CALCULATION_CACHE_FOLDER', os.path.join(datafolder, '.calculation_cache')),
+            max_age_days=float(os.environ.get('CALCULATION_CACHE_MAX_AGE_DAYS', 30)),
+            max_size_mb=float(os.environ.get('CALCULATION_CACHE_MAX_SIZE_MB', 10240)),
+            eviction_interval=float(os.environ.get('CALCULATION_CACHE_EVICTION_INTERVAL', 600))
+        )
+
+    @staticmethod
+    def key(version, data):
+        data = copy.deepcopy(data)
+        for model in ('mf', 'mt'):
+            if model in data and model in data[model]:
+                data[model][model].pop('model_ws', None)
+                data[model][model].pop('modelname', None)
+
+        content = json.dumps({'version': version, 'data': data}, sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def restore(self, version, data, target_directory):
+        """Links cached output files into the target directory and returns (data, message), None if not cached"""
+        entry = os.path.join(self._folder, self.key(version, data))
+        try:
+            with open(os.path.join(entry, self.response_file)) as f:
+                response = json.load(f)
+        except (IOError, ValueError):
+            return None
+
+        self.release(target_directory)
+        links = {}
+        try:
+            self.link_files(entry, target_directory, exclude=self.excluded_files + [self.response_file], links=links)
+            os.utime(entry)
+        except OSError:
+            # The entry was evicted while it was restored, the files linked so far are removed again
+            self.write_links(target_directory, links)
+            self.release(target_directory)
+            return None
+
+        self.write_links(target_directory, links)
+        return response['data'], response['message']
+
+    def store(self, version, data, target_directory, response_data, message):
+        entry = os.path.join(self._folder, self.key(version, data))
+        if os.path.exists(entry):
+            return
+
+        tmp_entry = os.path.join(self._folder, '.tmp-' + str(uuid.uuid4()))
+        try:
+            links = self.link_files(target_directory, tmp_entry, exclude=self.excluded_files)
+            size = self.directory_size(tmp_entry)
+            with open(os.path.join(tmp_entry, self.response_file), 'w') as f:
+                json.dump({'data': response_data, 'message': message, 'size': size}, f)
+            os.rename(tmp_entry, entry)
+        except OSError:
+            # Another worker stored the same calculation in the meantime
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            return
+
+        # The workspace files now share their content with the entry
+        self.write_links(target_directory, links)
+        self.evict()
+
+    @classmethod
+    def release(cls, target_directory):
+        """
+        Removes the files linked with the cache from the target directory, models write their files
+        in place and would otherwise change the cached files.
+        """
+        links_file = os.path.join(target_directory, cls.links_file)
+        try:
+            with open(links_file) as f:
+                links = json.load(f)
+        except (IOError, ValueError):
+            return
+
+        for file, inode in links.items():
+            filename = os.path.join(target_directory, file)
+            try:
+                if os.stat(filename).st_ino == inode:
+                    os.remove(filename)
+            except OSError:
+                pass
+
+        os.remove(links_file)
+
+    @classmethod
+    def write_links(cls, target_directory, links):
+        with open(os.path.join(target_directory, cls.links_file), 'w') as f:
+            json.dump(links, f)
+
+    @classmethod
+    def link_files(cls, source, target, exclude=(), links=None):
+        """Links the files of source into target and returns {relative path: inode} of the linked files"""
+        if links is None:
+            links = {}
+        for root, dirs, files in os.walk(source):
+            target_root = os.path.join(target, os.path.relpath(root, source))
+            if not os.path.exists(target_root):
+                os.makedirs(target_root)
+
+            for file in files:
+                if root == source and file in exclude:
+                    continue
+                source_file = os.path.join(root, file)
+                target_file = os.path.join(target_root, file)
+                if os.path.exists(target_file):
+                    os.remove(target_file)
+
+                relative_path = os.path.relpath(source_file, source).replace(os.sep, '/')
+                if any(fnmatch.fnmatch(relative_path, pattern) for pattern in cls.copied_files):
+                    shutil.copy2(source_file, target_file)
+                    continue
+
+                try:
+                    os.link(source_file, target_file)
+                    links[relative_path] = os.stat(target_file).st_ino
+                except OSError:
+                    shutil.copy2(source_file, target_file)
+
+        return links
+
+    @staticmethod
+    def directory_size(directory):
+        size = 0
+        for root, dirs, files in os.walk(directory):
+            size += sum(os.path.getsize(os.path.join(root, file)) for file in files)
+        return size
+
+    def entry_size(self, entry):
+        try:
+            with open(os.path.join(entry, self.response_file)) as f:
+                return json.load(f)['size']
+        except (IOError, ValueError, KeyError):
+            return self.directory_size(entry)
+
+    def evict(self, force=False):
+        """Removes expired entries and the oldest entries above the size limit, at most every eviction interval"""
+        eviction_file = os.path.join(self._folder, self.eviction_file)
+        now = time.time()
+        if not force and os.path.exists(eviction_file) and \
+                now - os.path.getmtime(eviction_file) < self._eviction_interval:
+            return
+
+        with open(eviction_file, 'w'):
+            pass
+
+        entries = []
+        for name in os.listdir(self._folder):
+            entry = os.path.join(self._folder, name)
+            if name.startswith(self.evicted_prefix):
+                # Left behind by an eviction which was interrupted
+                shutil.rmtree(entry, ignore_errors=True)
+            if name.startswith('.') or not os.path.isdir(entry):
+                continue
+            try:
+                entries.append((os.path.getmtime(entry), self.entry_size(entry), entry))
+            except OSError:
+                # Evicted by another worker in the meantime
+                continue
+
+        total_size = sum(entry[1] for entry in entries)
+        for mtime, size, entry in sorted(entries):
+            if now - mtime > self._max_age or total_size > self._max_size:
+                self.remove_entry(entry)
+                total_size -= size
+
+    def remove_entry(self, entry):
+        """Renames the entry to a hidden name before removing it, it can not be restored partially removed"""
+        evicted_entry = os.path.join(self._folder, self.evicted_prefix + str(uuid.uuid4()))
+        try:
+            os.rename(entry, evicted_entry)
+        except OSError:
+            # Evicted by another worker in the meantime
+            return
+
+        shutil.rmtree(evicted_entry, ignore_errors=True)
@@ -6,6 +6,8 @@ Author: Ralf Junghanns
 EMail: ralf.junghanns@gmail.com
 """
 
+import os
+
 from .BasAdapter import BasAdapter
 from .ChdAdapter import ChdAdapter
 from .DisAdapter import DisAdapter
@@ -19,10 +21,10 @@ from .OcAdapter import OcAdapter
 from .PcgAdapter import PcgAdapter
 from .RchAdapter import RchAdapter
 from .RivAdapter import RivAdapter
-from .ReadBudget import ReadBudget
 from .ReadConcentration import ReadConcentration
 from .ReadDrawdown import ReadDrawdown
 from .ReadHead import ReadHead
+from .ReadSummary import ReadSummary
 from .UpwAdapter import UpwAdapter
 from .WelAdapter import WelAdapter
 from .LmtAdapter import LmtAdapter
@@ -49,6 +51,9 @@ class InowasFlopyCalculationAdapter:
     _mt = None
     _report = ''
 
+    # Precomputed result tiles, without them zoomed layers are aggregated on request
+    result_tiles = os.environ.get('RESULT_TILES', '0').lower() in ('1', 'true')
+
     mf_package_order = [
         'mf', 'dis', 'bas', 'bas6',
         'riv', 'wel', 'rch', 'chd', 'ghb', 'hob',
@@ -85,6 +90,9 @@ class InowasFlopyCalculationAdapter:
                 self.success, report = self.run_model(self._mt, model_type='mt')
                 self._report += report
 
+            if self.success and self.result_tiles:
+                self.write_result_tiles(self._mf.model_ws)
+
     @staticmethod
     def read_packages(data):
         package_content = {}
@@ -124,6 +132,15 @@ class InowasFlopyCalculationAdapter:
         print('Calculate hob-statistics for model %s' % name)
         HobStatistics(model_ws, name).write_to_file()
 
+    @staticmethod
+    def write_result_tiles(model_ws):
+        for reader_class in [ReadHead, ReadDrawdown, ReadConcentration]:
+            try:
+                print('Write result tiles of %s' % reader_class.__name__)
+                reader_class(model_ws).write_tiles()
+            except Exception as e:
+                print('Could not write result tiles: %s' % str(e))
+
     def check_model(self):
         if self._mf is not None:
             self._mf.check()
@@ -194,19 +211,8 @@ class InowasFlopyCalculationAdapter:
         if 'MF' in self._mf_data:
             key = 'MF'
 
-        budgets = ReadBudget(self._mf_data[key]['model_ws'])
-        concentrations = ReadConcentration(self._mf_data[key]['model_ws'])
-        drawdowns = ReadDrawdown(self._mf_data[key]['model_ws'])
-        heads = ReadHead(self._mf_data[key]['model_ws'])
-
-        response = {}
-        response['budgets'] = budgets.read_times()
-        response['concentrations'] = concentrations.read_times()
-        response['drawdowns'] = drawdowns.read_times()
-        response['heads'] = heads.read_times()
-        response['number_of_layers'] = heads.read_number_of_layers()
-
-        return response
+        summary = ReadSummary(self._mf_data[key]['model_ws'])
+        return summary.read()
 
     def response_message(self):
         return self._report
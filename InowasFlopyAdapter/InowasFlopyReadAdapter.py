@@ -11,6 +11,7 @@ from .ReadConcentration import ReadConcentration
 from .ReadDrawdown import ReadDrawdown
 from .ReadHead import ReadHead
 from .ReadFile import ReadFile
+from .ReadSummary import ReadSummary
 
 
 class InowasFlopyReadAdapter:
@@ -24,77 +25,160 @@ class InowasFlopyReadAdapter:
         self._request = request
         self._projectfolder = projectfolder
         self._version = version
+        self._readers = {}
         pass
 
-    def read_head(self, totim, layer):
-        head_file = ReadHead(self._projectfolder)
-        return head_file.read_layer(totim=totim, layer=layer)
+    def reader(self, reader_class):
+        """Returns the reader of the project folder, created once per adapter"""
+        if reader_class not in self._readers:
+            self._readers[reader_class] = reader_class(self._projectfolder)
+        return self._readers[reader_class]
+
+    def read_head(self, totim, layer, data_format=None, zoom=None, window=None, aggregation='mean'):
+        head_file = self.reader(ReadHead)
+        return head_file.read_layer(
+            totim=totim, layer=layer, data_format=data_format, zoom=zoom, window=window, aggregation=aggregation
+        )
 
     def read_head_ts(self, layer, row, column):
-        head_file = ReadHead(self._projectfolder)
+        head_file = self.reader(ReadHead)
         return head_file.read_ts(layer=layer, row=row, column=column)
 
-    def read_concentration(self, totim, layer):
-        concentration_file = ReadConcentration(self._projectfolder)
-        return concentration_file.read_layer(totim=totim, layer=layer)
+    def read_head_ts_cells(self, cells):
+        head_file = self.reader(ReadHead)
+        return head_file.read_ts_cells(cells=cells)
+
+    def read_concentration(self, totim, layer, data_format=None, zoom=None, window=None, aggregation='mean'):
+        concentration_file = self.reader(ReadConcentration)
+        return concentration_file.read_layer(
+            totim=totim, layer=layer, data_format=data_format, zoom=zoom, window=window, aggregation=aggregation
+        )
 
     def read_concentration_ts(self, layer, row, column):
-        concentration_file = ReadConcentration(self._projectfolder)
+        concentration_file = self.reader(ReadConcentration)
         return concentration_file.read_ts(layer=layer, row=row, column=column)
 
-    def read_drawdown(self, totim, layer):
-        drawdown_file = ReadDrawdown(self._projectfolder)
-        return drawdown_file.read_layer(totim=totim, layer=layer)
+    def read_concentration_ts_cells(self, cells):
+        concentration_file = self.reader(ReadConcentration)
+        return concentration_file.read_ts_cells(cells=cells)
+
+    def read_drawdown(self, totim, layer, data_format=None, zoom=None, window=None, aggregation='mean'):
+        drawdown_file = self.reader(ReadDrawdown)
+        return drawdown_file.read_layer(
+            totim=totim, layer=layer, data_format=data_format, zoom=zoom, window=window, aggregation=aggregation
+        )
 
     def read_drawdown_ts(self, layer, row, column):
-        drawdown_file = ReadDrawdown(self._projectfolder)
+        drawdown_file = self.reader(ReadDrawdown)
         return drawdown_file.read_ts(layer=layer, row=row, column=column)
 
+    def read_drawdown_ts_cells(self, cells):
+        drawdown_file = self.reader(ReadDrawdown)
+        return drawdown_file.read_ts_cells(cells=cells)
+
     def read_cumulative_budget(self, totim):
-        budget_file = ReadBudget(self._projectfolder)
+        budget_file = self.reader(ReadBudget)
         return budget_file.read_cumulative_budget(totim=totim)
 
     def read_incremental_budget(self, totim):
-        budget_file = ReadBudget(self._projectfolder)
+        budget_file = self.reader(ReadBudget)
         return budget_file.read_incremental_budget(totim=totim)
 
     def read_file(self, extension):
-        namfile = ReadFile(self._projectfolder)
+        namfile = self.reader(ReadFile)
         return namfile.read_file(extension)
 
+    def read_summary(self):
+        summary = self.reader(ReadSummary)
+        return summary.read()
+
     def read_file_list(self):
-        namfile = ReadFile(self._projectfolder)
+        namfile = self.reader(ReadFile)
         return namfile.read_file_list()
 
     def response(self):
 
-        data = None
         request = self._request
 
+        if 'batch' in request:
+            data = self.read_batch(request['batch'])
+        else:
+            data = self.read_request(request)
+
+        if data is not None:
+            return dict(
+                status_code=200,
+                request=request,
+                response=data
+            )
+
+        return dict(
+            status_code=500,
+            message="Internal Server Error. Request data does not fit."
+        )
+
+    def read_batch(self, requests):
+        """
+        Returns the data of a list of requests in the same order.
+        Requests are read grouped by their output file, so every file is read in one go.
+        """
+        data = [None] * len(requests)
+        order = sorted(range(len(requests)), key=lambda idx: self.output_file(requests[idx]))
+        for idx in order:
+            data[idx] = self.read_request(requests[idx])
+
+        return data
+
+    @staticmethod
+    def output_file(request):
+        """Returns (output file, request type) of a request, e.g. ('head', 'timeseries')"""
+        for request_type in ('layerdata', 'timeseries'):
+            if request_type in request:
+                return str(request[request_type].get('type')), request_type
+
+        if 'budget' in request:
+            return 'budget', 'budget'
+
+        for request_type in ('file', 'filelist', 'summary'):
+            if request_type in request:
+                return request_type, request_type
+
+        return '', ''
+
+    def read_request(self, request):
+
+        data = None
+
         if 'budget' in request:
             if request['budget']['type'] == 'cumulative':
                 totim = request['budget']['totim']
                 data = self.read_cumulative_budget(totim=totim)
 
             if request['budget']['type'] == 'incremental':
-                totim = self._request['totim']
+                totim = request['budget']['totim']
                 data = self.read_incremental_budget(totim=totim)
 
         if 'layerdata' in request:
+            data_format = request['layerdata'].get('format')
+            tile_options = dict(
+                zoom=request['layerdata'].get('zoom'),
+                window=request['layerdata'].get('window'),
+                aggregation=request['layerdata'].get('aggregation', 'mean')
+            )
             if request['layerdata']['type'] == 'concentration':
                 totim = request['layerdata']['totim']
                 layer = request['layerdata']['layer']
-                data = self.read_concentration(totim=totim, layer=layer)
+                data = self.read_concentration(totim=totim, layer=layer, data_format=data_format, **tile_options)
 
             if request['layerdata']['type'] == 'drawdown':
                 totim = request['layerdata']['totim']
                 layer = request['layerdata']['layer']
-                data = self.read_drawdown(totim=totim, layer=layer)
+                data = self.read_drawdown(totim=totim, layer=layer, data_format=data_format, **tile_options)
 
             if request['layerdata']['type'] == 'head':
                 totim = request['layerdata']['totim']
                 layer = request['layerdata']['layer']
-                data = self.read_head(totim=totim, layer=layer)
+                data = self.read_head(totim=totim, layer=layer, data_format=data_format, **tile_options)
 
         if 'file' in request:
             data = [self.read_file(request['file'])]
@@ -102,33 +186,35 @@ class InowasFlopyReadAdapter:
         if 'filelist' in request:
             data = self.read_file_list()
 
+        if 'summary' in request:
+            data = self.read_summary()
+
         if 'timeseries' in request:
-            if request['timeseries']['type'] == 'concentration':
+            if request['timeseries']['type'] == 'concentration' and 'cells' in request['timeseries']:
+                data = self.read_concentration_ts_cells(cells=request['timeseries']['cells'])
+
+            elif request['timeseries']['type'] == 'concentration':
                 layer = request['timeseries']['layer']
                 row = request['timeseries']['row']
                 column = request['timeseries']['column']
                 data = self.read_concentration_ts(layer=layer, row=row, column=column)
 
-            if request['timeseries']['type'] == 'drawdown':
+            if request['timeseries']['type'] == 'drawdown' and 'cells' in request['timeseries']:
+                data = self.read_drawdown_ts_cells(cells=request['timeseries']['cells'])
+
+            elif request['timeseries']['type'] == 'drawdown':
                 layer = request['timeseries']['layer']
                 row = request['timeseries']['row']
                 column = request['timeseries']['column']
                 data = self.read_drawdown_ts(layer=layer, row=row, column=column)
 
-            if request['timeseries']['type'] == 'head':
+            if request['timeseries']['type'] == 'head' and 'cells' in request['timeseries']:
+                data = self.read_head_ts_cells(cells=request['timeseries']['cells'])
+
+            elif request['timeseries']['type'] == 'head':
                 layer = request['timeseries']['layer']
                 row = request['timeseries']['row']
                 column = request['timeseries']['column']
                 data = self.read_head_ts(layer=layer, row=row, column=column)
 
-        if data is not None:
-            return dict(
-                status_code=200,
-                request=request,
-                response=data
-            )
-
-        return dict(
-            status_code=500,
-            message="Internal Server Error. Request data does not fit."
-        )
+        return data
@@ -0,0 +1,35 @@
+"""
+Serialization of 2D layer data arrays of the binary output readers.
+
+Values are rounded to 2 decimals and values below -999 are no-data.
+By default a nested list with None for no-data cells is returned.
+With format 'base64' the layer is returned compact as little-endian
+float32 values and a bit packed no-data mask (1 = no-data, row major,
+most significant bit first), both base64 encoded.
+"""
+
+import base64
+import numpy as np
+
+NODATA_LIMIT = -999
+
+
+def serialize_layer(data, data_format=None):
+    data = np.round(np.asarray(data, dtype=np.float64), 2)
+    nodata = data < NODATA_LIMIT
+
+    if data_format == 'base64':
+        return dict(
+            format='base64',
+            dtype='float32',
+            shape=list(data.shape),
+            data=base64.b64encode(np.where(nodata, 0, data).astype('<f4').tobytes()).decode('ascii'),
+            nodata=base64.b64encode(np.packbits(nodata, axis=None).tobytes()).decode('ascii')
+        )
+
+    if not nodata.any():
+        return data.tolist()
+
+    values = data.astype(object)
+    values[nodata] = None
+    return values.tolist()
@@ -0,0 +1,184 @@
+"""
+Volumetric budget of a MODFLOW list file.
+
+The list file is read once, line by line, and the budget of all time steps
+is written to a columnar cache file next to it (<list file>.budget.npz)
+with the totims, the budget term names and the incremental and cumulative
+values as (ntimes, nterms) arrays. Budget requests read the cache file,
+which is parsed again only if the list file is newer.
+Term names and values are the ones of flopy's MfListBudget.
+"""
+
+import os
+from collections import OrderedDict
+import numpy as np
+
+from .BinaryFileCache import BinaryFileCache
+
+
+class ListBudget:
+    budget_key = 'VOLUMETRIC BUDGET FOR ENTIRE MODEL'
+    time_key = 'TIME SUMMARY AT END'
+    time_line_idx = 20
+    time_idx = 3
+
+    def __init__(self, filename):
+        with np.load(filename) as data:
+            self.totim = data['totim']
+            self.time_step = data['time_step']
+            self.stress_period = data['stress_period']
+            self.names = data['names'].tolist()
+            self.incremental = data['incremental']
+            self.cumulative = data['cumulative']
+
+        self.times = self.totim.tolist()
+
+    @classmethod
+    def load(cls, list_file):
+        cache_file = list_file + '.budget.npz'
+        if not os.path.exists(cache_file) or os.path.getmtime(cache_file) < os.path.getmtime(list_file):
+            cls.write_cache(list_file, cache_file)
+
+        return BinaryFileCache.get(cache_file, cls)
+
+    @classmethod
+    def write_cache(cls, list_file, cache_file):
+        names, time_step, stress_period, totim, incremental, cumulative = cls.parse(list_file)
+
+        tmp_file = cache_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            np.savez(
+                f,
+                names=np.array(names, dtype=str),
+                time_step=np.array(time_step, dtype=np.int32),
+                stress_period=np.array(stress_period, dtype=np.int32),
+                totim=np.array(totim, dtype=np.float32),
+                incremental=np.array(incremental, dtype=np.float32).reshape(len(totim), len(names)),
+                cumulative=np.array(cumulative, dtype=np.float32).reshape(len(totim), len(names))
+            )
+        os.replace(tmp_file, cache_file)
+
+    @classmethod
+    def parse(cls, list_file):
+        """Reads all budgets of the list file in a single pass"""
+        names = None
+        time_step, stress_period, totim = [], [], []
+        incremental, cumulative = [], []
+
+        with open(list_file, 'r', encoding='ascii', errors='replace') as f:
+            lines = iter(f)
+            for line in lines:
+                if cls.budget_key not in line:
+                    continue
+
+                ts, sp = cls.parse_ts_sp(line)
+                inc, cum = cls.parse_budget(lines)
+                if names is None:
+                    names = list(inc.keys())
+
+                for line in lines:
+                    if cls.time_key in line:
+                        break
+
+                time_step.append(ts - 1)
+                stress_period.append(sp - 1)
+                totim.append(cls.parse_totim(lines))
+                incremental.append([inc.get(name, np.nan) for name in names])
+                cumulative.append([cum.get(name, np.nan) for name in names])
+
+        return names or [], time_step, stress_period, totim, incremental, cumulative
+
+    @staticmethod
+    def parse_ts_sp(line):
+        line = line.replace(',', '')
+        ts = int(line[line.index('TIME STEP') + len('TIME STEP'):].split()[0])
+        sp = int(line[line.index('STRESS PERIOD') + len('STRESS PERIOD'):].split()[0])
+        return ts, sp
+
+    @staticmethod
+    def parse_value(value):
+        try:
+            return float(value)
+        except ValueError:
+            if 'NAN' in value.strip().upper():
+                return np.nan
+            raise
+
+    @classmethod
+    def parse_budget(cls, lines):
+        """Returns incremental and cumulative values of the budget terms until the percent discrepancy"""
+        tag = 'IN'
+        inc = OrderedDict()
+        cum = OrderedDict()
+        for line in lines:
+            if line.count('=') != 2:
+                if 'OUT:' in line.upper():
+                    tag = 'OUT'
+                continue
+
+            entry = line.strip().split('=')[0].strip()
+            line2 = line[line.index('=') + 1:]
+            cumu = cls.parse_value(line2.strip().split()[0])
+            flux = cls.parse_value(line2[line2.index('=') + 1:].strip())
+
+            if entry.endswith(tag.upper()):
+                if ' - ' in entry.upper():
+                    key = entry.replace(' ', '')
+                else:
+                    key = entry.replace(' ', '_')
+            elif 'PERCENT DISCREPANCY' in entry.upper():
+                key = entry.replace(' ', '_')
+            else:
+                key = '{}_{}'.format(entry.replace(' ', '_'), tag)
+
+            inc[key] = flux
+            cum[key] = cumu
+
+            if entry.upper() == 'PERCENT DISCREPANCY':
+                break
+
+        return inc, cum
+
+    @classmethod
+    def parse_time_line(cls, line):
+        raw = line[cls.time_line_idx:].split()
+        idx = cls.time_idx
+        try:
+            float(raw[0])
+        except (ValueError, IndexError):
+            # Table format without time units
+            raw = line[45:].split()
+            idx = 0
+        return float(raw[idx])
+
+    @classmethod
+    def parse_totim(cls, lines):
+        """Returns total time of the time summary, lines start after the 'TIME SUMMARY AT END' line"""
+        line = next(lines)
+        if 'SECONDS     MINUTES      HOURS       DAYS        YEARS' in line:
+            for line in lines:
+                if '-----------------------------------------------------------' in line:
+                    line = next(lines)
+                    break
+
+        # Time step length, stress period time and total time
+        next(lines)
+        return cls.parse_time_line(next(lines))
+
+    def get_times(self):
+        return self.times
+
+    def get_data(self, totim, incremental=False):
+        """Returns {name: value} of the budget at totim like the name and value fields of MfListBudget.get_data"""
+        ipos = self.times.index(totim)
+        values = self.incremental[ipos] if incremental else self.cumulative[ipos]
+
+        data = {}
+        for name, value in zip(self.names, values.tolist()):
+            if '_OUT' in name:
+                value = -value
+            data[name[:25]] = str(np.float32(value))
+        return data
+
+    def close(self):
+        pass
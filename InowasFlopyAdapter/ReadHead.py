@@ -1,47 +1,65 @@
 import os
 import flopy.utils.binaryfile as bf
+from .BinaryFileCache import BinaryFileCache
+from .BinaryOutputFile import BinaryOutputFile
+from .LayerData import serialize_layer
+from .ResultTiles import ResultTiles
 
 
 class ReadHead:
     _filename = None
 
     def __init__(self, workspace):
-        for file in os.listdir(workspace):
+        for file in BinaryFileCache.list_workspace(workspace):
             if file.endswith(".hds"):
                 self._filename = os.path.join(workspace, file)
         pass
 
     def read_times(self):
         try:
-            heads = bf.HeadFile(filename=self._filename, precision='single')
-            return heads.get_times()
+            output_file = BinaryFileCache.get(self._filename, BinaryOutputFile, file_type='head')
+            return output_file.get_times()
         except:
             return []
 
     def read_number_of_layers(self):
         try:
-            heads = bf.HeadFile(filename=self._filename, precision='single')
-            number_of_layers = heads.get_data().shape[0]
-            return number_of_layers
+            output_file = BinaryFileCache.get(self._filename, BinaryOutputFile, file_type='head')
+            return output_file.nlay
         except:
             return 0
 
-    def read_layer(self, totim, layer):
+    def read_layer(self, totim, layer, data_format=None, zoom=None, window=None, aggregation='mean'):
+        if zoom is not None or window is not None:
+            return self.read_layer_tile(totim, layer, data_format, zoom or 0, window, aggregation)
+
+        try:
+            heads = BinaryFileCache.get(self._filename, bf.HeadFile, precision='single')
+            return serialize_layer(heads.get_data(totim=totim, mflay=layer), data_format)
+        except:
+            return []
+
+    def read_layer_tile(self, totim, layer, data_format=None, zoom=0, window=None, aggregation='mean'):
         try:
-            heads = bf.HeadFile(filename=self._filename, precision='single')
-            data = heads.get_data(totim=totim, mflay=layer).tolist()
-            for i in range(len(data)):
-                for j in range(len(data[i])):
-                    data[i][j] = round(data[i][j], 2)
-                    if data[i][j] < -999:
-                        data[i][j] = None
-            return data
+            tiles = ResultTiles(self._filename, 'head', file_type='head')
+            data = tiles.read_layer(totim=totim, layer=layer, zoom=zoom, window=window, aggregation=aggregation)
+            return serialize_layer(data, data_format)
         except:
             return []
 
+    def write_tiles(self):
+        if self._filename is not None:
+            ResultTiles(self._filename, 'head', file_type='head').write()
+
     def read_ts(self, layer, row, column):
         try:
-            heads = bf.HeadFile(filename=self._filename, precision='single')
-            return heads.get_ts(idx=(layer, row, column)).tolist()
+            return self.read_ts_cells(cells=[(layer, row, column)])[0]
+        except:
+            return []
+
+    def read_ts_cells(self, cells):
+        try:
+            output_file = BinaryFileCache.get(self._filename, BinaryOutputFile, file_type='head')
+            return output_file.get_ts(cells)
         except:
             return []
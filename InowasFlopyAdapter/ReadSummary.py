@@ -0,0 +1,63 @@
+import json
+import os
+from .BinaryFileCache import BinaryFileCache
+from .ReadBudget import ReadBudget
+from .ReadConcentration import ReadConcentration
+from .ReadDrawdown import ReadDrawdown
+from .ReadHead import ReadHead
+
+
+class ReadSummary:
+    """
+    Times of all outputs and the number of layers of a calculation.
+    The summary is written to summary.json in the workspace and read from there
+    as long as it is newer than the output files.
+    """
+    _filename = None
+    _workspace = None
+
+    def __init__(self, workspace):
+        self._workspace = workspace
+        self._filename = os.path.join(workspace, 'summary.json')
+        pass
+
+    def read(self):
+        readers = dict(
+            budgets=ReadBudget(self._workspace),
+            concentrations=ReadConcentration(self._workspace),
+            drawdowns=ReadDrawdown(self._workspace),
+            heads=ReadHead(self._workspace)
+        )
+
+        summary = self.read_file(readers)
+        if summary is not None:
+            return summary
+
+        summary = {}
+        for key, reader in readers.items():
+            summary[key] = reader.read_times()
+        summary['number_of_layers'] = readers['heads'].read_number_of_layers()
+
+        try:
+            with open(self._filename, 'w') as f:
+                json.dump(summary, f)
+        except:
+            pass
+
+        return summary
+
+    def read_file(self, readers):
+        """Returns the persisted summary, None if there is none or an output file changed since"""
+        if os.path.basename(self._filename) not in BinaryFileCache.list_workspace(self._workspace):
+            return None
+
+        try:
+            mtime = os.path.getmtime(self._filename)
+            for reader in readers.values():
+                if reader._filename is not None and os.path.getmtime(reader._filename) > mtime:
+                    return None
+
+            with open(self._filename) as f:
+                return json.load(f)
+        except:
+            return None
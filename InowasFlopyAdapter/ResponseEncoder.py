@@ -0,0 +1,61 @@
+"""
+Encoding of calculation responses.
+
+Responses are serialized with orjson if it is installed, otherwise with
+the json module. NaN and infinite values are not valid JSON and are
+encoded as null, orjson does it while serializing, for the json module
+they are replaced beforehand. The response is published as one message,
+so it is serialized as a whole. Run reports longer than
+CALCULATION_MAX_MESSAGE_LENGTH characters (default 65536) are written to
+calculation.report in the calculation folder, the message keeps the
+beginning and the end of the report.
+"""
+
+import json
+import math
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+REPORT_FILE = 'calculation.report'
+
+
+def encode_response(response):
+    """Returns the response as JSON encoded bytes"""
+    if orjson is not None:
+        return orjson.dumps(response)
+
+    return json.dumps(finite_values(response), allow_nan=False).encode()
+
+
+def finite_values(value):
+    """Returns the value with NaN and infinite floats replaced by None"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: finite_values(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [finite_values(item) for item in value]
+    return value
+
+
+def bounded_message(message, target_directory, max_length=None):
+    """Returns (message, report file name), the report file name is None if the message was not offloaded"""
+    if max_length is None:
+        max_length = int(os.environ.get('CALCULATION_MAX_MESSAGE_LENGTH', 64 * 1024))
+
+    if message is None or len(message) <= max_length:
+        return message, None
+
+    with open(os.path.join(target_directory, REPORT_FILE), 'w') as f:
+        f.write(message)
+
+    part = max_length // 2
+    return (
+        message[:part] +
+        '\n...\n[Report truncated, the full report is in {}]\n...\n'.format(REPORT_FILE) +
+        message[-part:]
+    ), REPORT_FILE
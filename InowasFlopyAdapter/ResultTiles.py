@@ -0,0 +1,154 @@
+"""
+Multi-resolution tiles of head, drawdown and concentration layers.
+
+After a successful calculation with RESULT_TILES=1 the layers of an
+output file are aggregated to a pyramid of zoom levels, zoom level z is aggregated over blocks of
+2^z x 2^z cells. Levels are built until both dimensions are at most
+min_size cells. Each zoom level is one .npy file in the 'tiles' folder
+of the model workspace with shape (ntimes, nlay, 3, nrow, ncol) holding
+the min, mean and max of every block. No-data cells are left out of the
+aggregation, blocks without data are -9999. Zoom level 0 is read from the
+output file itself. A <type>.json index describes times and levels.
+Without tiles a zoomed layer is aggregated from the output file on request.
+"""
+
+import json
+import os
+import warnings
+import numpy as np
+
+from .BinaryFileCache import BinaryFileCache
+from .BinaryOutputFile import BinaryOutputFile
+from .LayerData import NODATA_LIMIT
+
+
+class ResultTiles:
+    min_size = 64
+    aggregations = ['min', 'mean', 'max']
+    nodata = -9999.
+
+    def __init__(self, filename, data_type, file_type='head'):
+        self._filename = filename
+        self._data_type = data_type
+        self._file_type = file_type
+        self._folder = os.path.join(os.path.dirname(filename), 'tiles')
+        self._index_file = os.path.join(self._folder, data_type + '.json')
+
+    @classmethod
+    def aggregate(cls, data, factor):
+        """Returns min, mean and max of factor x factor blocks as array of shape (3, nrow, ncol)"""
+        nrow = -(-data.shape[0] // factor)
+        ncol = -(-data.shape[1] // factor)
+        blocks = np.full((nrow * factor, ncol * factor), np.nan)
+        blocks[:data.shape[0], :data.shape[1]] = data
+        blocks[blocks < NODATA_LIMIT] = np.nan
+        blocks = blocks.reshape(nrow, factor, ncol, factor).swapaxes(1, 2).reshape(nrow, ncol, -1)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            aggregated = np.array([np.nanmin(blocks, 2), np.nanmean(blocks, 2), np.nanmax(blocks, 2)])
+
+        aggregated[np.isnan(aggregated)] = cls.nodata
+        return aggregated
+
+    def write(self):
+        if not os.path.exists(self._folder):
+            os.makedirs(self._folder)
+
+        # An outdated index must not point to tiles being rewritten
+        if os.path.exists(self._index_file):
+            os.remove(self._index_file)
+
+        output_file = BinaryOutputFile(self._filename, file_type=self._file_type)
+        try:
+            times = output_file.get_times()
+            levels = []
+            nrow, ncol = output_file.nrow, output_file.ncol
+            zoom = 1
+            while max(nrow, ncol) > self.min_size:
+                factor = 2 ** zoom
+                nrow = -(-output_file.nrow // factor)
+                ncol = -(-output_file.ncol // factor)
+                levels.append(dict(
+                    zoom=zoom, factor=factor, nrow=nrow, ncol=ncol,
+                    file='{}_{}.npy'.format(self._data_type, zoom)
+                ))
+                zoom += 1
+
+            tiles = [
+                np.lib.format.open_memmap(
+                    os.path.join(self._folder, level['file']), mode='w+', dtype='<f4',
+                    shape=(len(times), output_file.nlay, len(self.aggregations), level['nrow'], level['ncol'])
+                ) for level in levels
+            ]
+
+            time_indices = {totim: idx for idx, totim in enumerate(times)}
+            for totim, layer, data in output_file.get_records():
+                for level, tile in zip(levels, tiles):
+                    tile[time_indices[totim], layer] = self.aggregate(data, level['factor'])
+
+            for tile in tiles:
+                tile.flush()
+            del tiles
+
+            index = dict(
+                times=times, nlay=output_file.nlay, nrow=output_file.nrow, ncol=output_file.ncol,
+                aggregations=self.aggregations, levels=levels
+            )
+        finally:
+            output_file.close()
+
+        with open(self._index_file, 'w') as f:
+            json.dump(index, f)
+
+        return index
+
+    def read_layer(self, totim, layer, zoom=0, window=None, aggregation='mean'):
+        """
+        Returns the layer at the zoom level as 2D array.
+        The window {'row': {'min': .., 'max': ..}, 'col': {..}} is given in cells of the full grid.
+        """
+        factor = 2 ** zoom
+        if zoom == 0:
+            data = self.read_full_layer(totim, layer)
+        else:
+            data = self.read_tile(totim, layer, zoom, aggregation)
+            if data is None:
+                data = self.aggregate(
+                    self.read_full_layer(totim, layer), factor
+                )[self.aggregations.index(aggregation)]
+
+        if window is None:
+            return data
+
+        row_min = window.get('row', {}).get('min', 0) // factor
+        row_max = -(-window.get('row', {}).get('max', data.shape[0] * factor) // factor)
+        col_min = window.get('col', {}).get('min', 0) // factor
+        col_max = -(-window.get('col', {}).get('max', data.shape[1] * factor) // factor)
+
+        return data[row_min:row_max, col_min:col_max]
+
+    def read_full_layer(self, totim, layer):
+        output_file = BinaryFileCache.get(self._filename, BinaryOutputFile, file_type=self._file_type)
+        return output_file.get_layer(totim, layer)
+
+    def read_tile(self, totim, layer, zoom, aggregation):
+        """Returns the precomputed layer of the zoom level, None if there are no tiles"""
+        if not os.path.exists(self._index_file):
+            return None
+
+        if os.path.getmtime(self._index_file) < os.path.getmtime(self._filename):
+            return None
+
+        with open(self._index_file) as f:
+            index = json.load(f)
+
+        for level in index['levels']:
+            if level['zoom'] == zoom:
+                tile = np.load(os.path.join(self._folder, level['file']), mmap_mode='r')
+                if totim not in index['times']:
+                    raise ValueError('No tile for totim {}.'.format(totim))
+                time_idx = index['times'].index(totim)
+                return np.array(tile[time_idx, layer, index['aggregations'].index(aggregation)])
+
+        return None
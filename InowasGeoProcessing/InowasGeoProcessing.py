@@ -54,19 +54,27 @@ class InowasGeoProcessing:
             if 'height' in parameters:
                 height = parameters['height']
 
-            available_interpolation_methods = [
-                'constant', 'edge', 'wrap', 'reflect', 'symmetric'
-            ]
-
-            method = available_interpolation_methods[2]
-            if 'method' in parameters and parameters['method'] in available_interpolation_methods:
+            method = 'linear'
+            if 'method' in parameters:
                 method = parameters['method']
 
+            try:
+                RasterFile.resample_algorithm(method)
+            except ValueError as e:
+                return dict(
+                    status_code=422,
+                    body="Invalid argument exception, " + str(e)
+                )
+
+            bounding_box = None
+            if 'bounding_box' in parameters:
+                bounding_box = parameters['bounding_box']
+
             return dict(
                 status_code=200,
                 body={
                     'metadata': file.get_metadata(),
-                    'data': file.get_data(width=width, height=height, method=method)
+                    'data': file.get_data(width=width, height=height, method=method, bounding_box=bounding_box)
                 }
             )
 
@@ -1,11 +1,30 @@
+import math
 from osgeo import gdal
-from skimage.transform import resize
 
 
 class RasterFile:
     _filename = None
     _dataset = None
 
+    resample_algorithms = {
+        'nearest': gdal.GRIORA_NearestNeighbour,
+        'linear': gdal.GRIORA_Bilinear,
+        'cubic': gdal.GRIORA_Cubic,
+        'cubicspline': gdal.GRIORA_CubicSpline,
+        'lanczos': gdal.GRIORA_Lanczos,
+        'average': gdal.GRIORA_Average,
+        'mode': gdal.GRIORA_Mode
+    }
+
+    # Padding modes of the former skimage resize, it interpolated bilinear in all modes
+    legacy_methods = {
+        'constant': 'linear',
+        'edge': 'linear',
+        'wrap': 'linear',
+        'reflect': 'linear',
+        'symmetric': 'linear'
+    }
+
     def __init__(self, filename):
         self._filename = filename
         print('RasterFile filename: %s' % filename)
@@ -41,23 +60,69 @@ class RasterFile:
 
         return metadata
 
-    def get_data(self, width=False, height=False, method='wrap'):
+    @classmethod
+    def resample_algorithm(cls, method):
+        """Returns the GDAL resample algorithm of the method, raises a ValueError for unknown methods"""
+        method = cls.legacy_methods.get(method, method)
+        if method not in cls.resample_algorithms:
+            raise ValueError('Unknown resample method: {}.'.format(method))
+
+        return cls.resample_algorithms[method]
+
+    def get_data(self, width=False, height=False, method='linear', bounding_box=None):
+        """
+        Returns the data of all bands, optional only of the bounding box window.
+        With width and height the window is read resampled to width x height float64 cells,
+        GDAL reads from the overviews if there are any, the full resolution data is not read.
+        Without width and height the values have the data type of the band.
+        """
+        resample_algorithm = self.resample_algorithm(method)
+
         self.open_file()
         if not self.is_valid():
             raise FileNotFoundError('File not valid.')
 
+        x_offset, y_offset, x_size, y_size = self.window(bounding_box)
+
+        buffer_options = {}
+        if width and height:
+            buffer_options = dict(buf_xsize=int(width), buf_ysize=int(height), buf_type=gdal.GDT_Float64)
+
         data = []
         for iBand in range(1, self._dataset.RasterCount + 1):
             band = self._dataset.GetRasterBand(iBand)
-            band_data = band.ReadAsArray()
-
-            if width and height:
-                band_data = self.interpolate(data2d=band_data, target_width=width, target_height=height, method=method)
+            band_data = band.ReadAsArray(
+                x_offset, y_offset, x_size, y_size, resample_alg=resample_algorithm, **buffer_options
+            )
 
             data.append(band_data.tolist())
 
         return data
 
-    @staticmethod
-    def interpolate(data2d, target_width, target_height, method):
-        return resize(data2d, (int(target_height), int(target_width)), mode=method, preserve_range=True)
+    def window(self, bounding_box=None):
+        """
+        Returns (x_offset, y_offset, x_size, y_size) in pixels of the bounding box
+        {'x_min', 'x_max', 'y_min', 'y_max'} in the coordinates of the raster, the whole raster without bounding box.
+        """
+        x_size = self._dataset.RasterXSize
+        y_size = self._dataset.RasterYSize
+        if not bounding_box:
+            return 0, 0, x_size, y_size
+
+        origin_x, pixel_width, _, origin_y, _, pixel_height = self._dataset.GetGeoTransform()
+
+        columns = sorted([
+            (float(bounding_box['x_min']) - origin_x) / pixel_width,
+            (float(bounding_box['x_max']) - origin_x) / pixel_width
+        ])
+        rows = sorted([
+            (float(bounding_box['y_min']) - origin_y) / pixel_height,
+            (float(bounding_box['y_max']) - origin_y) / pixel_height
+        ])
+
+        x_min = min(max(int(math.floor(columns[0])), 0), x_size - 1)
+        x_max = min(max(int(math.ceil(columns[1])), x_min + 1), x_size)
+        y_min = min(max(int(math.floor(rows[0])), 0), y_size - 1)
+        y_max = min(max(int(math.ceil(rows[1])), y_min + 1), y_size)
+
+        return x_min, y_min, x_max - x_min, y_max - y_min
@@ -0,0 +1,15 @@
+#! /usr/env python
+
+from .Linear import Linear
+from scipy.interpolate import CloughTocher2DInterpolator
+
+
+class Cubic(Linear):
+    """
+    Piecewise cubic (Clough-Tocher) interpolation on the Delaunay triangulation of the points.
+    Cells outside of the convex hull of the points get the value of the nearest point.
+    """
+
+    @staticmethod
+    def interpolator(triangulation, values):
+        return CloughTocher2DInterpolator(triangulation, values)
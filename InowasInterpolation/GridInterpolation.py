@@ -0,0 +1,169 @@
+#! /usr/env python
+
+import abc
+import base64
+import multiprocessing
+import numpy as np
+
+from .ModelCache import ModelCache
+
+# Interpolation predicted by the forked worker processes
+_interpolation = None
+
+
+def predict_rows(rows):
+    start, end = rows
+    return start, end, _interpolation.predict_rows(start, end)
+
+
+def serialize_grid(grid, data_format=None):
+    """
+    Returns the grid as nested list, or with format 'base64' compact
+    as base64 encoded little-endian float32 values, row major.
+    """
+    if data_format == 'base64':
+        return dict(
+            format='base64',
+            dtype='float32',
+            shape=list(grid.shape),
+            data=base64.b64encode(grid.astype('<f4').tobytes()).decode('ascii')
+        )
+
+    return grid.tolist()
+
+
+class GridInterpolation(abc.ABC):
+    """
+    Interpolation of point values on a regular grid.
+    Subclasses implement fit() and predict(points), calculate() returns the (n_y, n_x) grid
+    or False if the interpolation failed.
+    The grid is predicted in blocks of rows with about chunk_size cells (parameter, 65536 by default),
+    optionally in a pool of processes.
+    Fitted models are kept in the ModelCache, subclasses name the attributes set by fit()
+    in fitted_attributes and the parameters the fit depends on in fit_parameters.
+    """
+
+    fitted_attributes = ()
+    fit_parameters = ()
+
+    _xMin = 0.0
+    _xMax = 0.0
+    _yMin = 0.0
+    _yMax = 0.0
+    _nX = 0
+    _nY = 0
+    _dX = 0.0
+    _dY = 0.0
+    _X = []
+    _Y = []
+    _parameters = {}
+
+    def __init__(self, data):
+
+        if 'bounding_box' in data:
+            bounding_box = data['bounding_box']
+
+            if 'x_min' in bounding_box:
+                self._xMin = float(bounding_box['x_min'])
+
+            if 'x_max' in bounding_box:
+                self._xMax = float(bounding_box['x_max'])
+
+            if 'y_min' in bounding_box:
+                self._yMin = float(bounding_box['y_min'])
+
+            if 'y_max' in bounding_box:
+                self._yMax = float(bounding_box['y_max'])
+
+        if 'grid_size' in data:
+            grid_size = data['grid_size']
+
+            if 'n_x' in grid_size:
+                self._nX = grid_size['n_x']
+
+            if 'n_y' in grid_size:
+                self._nY = grid_size['n_y']
+
+        self._dX = (self._xMax - self._xMin) / self._nX
+        self._dY = (self._yMax - self._yMin) / self._nY
+
+        self._X = []
+        self._Y = []
+
+        for point in data['point_values']:
+            if 'x' in point and 'y' in point:
+                self._X.append([point['x'], point['y']])
+
+            if 'value' in point:
+                self._Y.append(point['value'])
+
+        self._parameters = data.get('parameters', {})
+
+    def calculate(self, processes=1):
+
+        try:
+            self.fit_cached()
+            result = self.predict_grid(processes)
+        except:
+            result = False
+
+        return result
+
+    def model_key(self, name, parameters):
+        return ModelCache.key(name, self._X, self._Y, {p: self._parameters.get(p) for p in parameters})
+
+    def fit_cached(self):
+        """Fits the interpolation or restores the fitted model of the same points and fit parameters"""
+        key = self.model_key(self.__class__.__name__, self.fit_parameters)
+        model = ModelCache.get(key)
+        if model is not None:
+            for attribute, value in model.items():
+                setattr(self, attribute, value)
+            return
+
+        self.fit()
+        ModelCache.put(key, {attribute: getattr(self, attribute) for attribute in self.fitted_attributes})
+
+    def row_blocks(self):
+        rows = max(1, int(self._parameters.get('chunk_size', 65536)) // max(self._nX, 1))
+        return [(start, min(start + rows, self._nY)) for start in range(0, self._nY, rows)]
+
+    def predict_grid(self, processes=1):
+        global _interpolation
+
+        result = np.empty((self._nY, self._nX))
+        blocks = self.row_blocks()
+
+        if processes <= 1 or len(blocks) <= 1:
+            for start, end in blocks:
+                result[start:end] = self.predict_rows(start, end)
+            return result
+
+        # Workers are forked after the fit and inherit the fitted interpolation
+        _interpolation = self
+        try:
+            with multiprocessing.get_context('fork').Pool(processes=processes) as pool:
+                for start, end, block in pool.imap_unordered(predict_rows, blocks):
+                    result[start:end] = block
+        finally:
+            _interpolation = None
+
+        return result
+
+    def predict_rows(self, start, end):
+        return np.reshape(self.predict(self.grid_points(start, end)), (end - start, self._nX))
+
+    def grid_points(self, start=0, end=None):
+        """Returns the cell positions of the rows start to end, row by row"""
+        x_grid_x = np.linspace(self._xMin, self._xMin + self._dX * self._nX, self._nX)
+        x_grid_y = np.linspace(self._yMin, self._yMin + self._dY * self._nY, self._nY)[start:end]
+        xv, yv = np.meshgrid(x_grid_x, x_grid_y)
+        return np.dstack((xv.flatten(), yv.flatten()))[0]
+
+    @abc.abstractmethod
+    def fit(self):
+        """Fits the interpolation to the point values"""
+
+    @abc.abstractmethod
+    def predict(self, points):
+        """Returns the interpolated values of the (n, 2) points"""
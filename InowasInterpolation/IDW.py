@@ -0,0 +1,41 @@
+#! /usr/env python
+
+from .GridInterpolation import GridInterpolation
+from scipy.spatial import cKDTree
+import numpy as np
+
+
+class IDW(GridInterpolation):
+    """
+    Inverse distance weighting of the nearest point values.
+    Optional parameters:
+        neighbours: number of nearest points used for each cell, 12 by default
+        power: power of the inverse distances, 2 by default
+    """
+
+    fitted_attributes = ('_tree', '_values')
+
+    _tree = None
+    _values = None
+
+    def fit(self):
+        self._tree = cKDTree(self._X)
+        self._values = np.asarray(self._Y, dtype=float)
+
+    def predict(self, points):
+        neighbours = min(int(self._parameters.get('neighbours', 12)), len(self._values))
+        power = float(self._parameters.get('power', 2))
+
+        distances, idx = self._tree.query(points, k=neighbours)
+        if neighbours == 1:
+            return self._values[idx]
+
+        with np.errstate(divide='ignore'):
+            weights = distances ** -power
+
+        # Cells on a point get its value
+        exact = distances[:, 0] == 0
+        weights[exact] = 0.0
+        weights[exact, 0] = 1.0
+
+        return (weights * self._values[idx]).sum(axis=1) / weights.sum(axis=1)
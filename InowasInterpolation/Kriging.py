@@ -0,0 +1,270 @@
+#! /usr/env python
+
+"""
+Ordinary kriging of scattered point values.
+
+The semivariogram is fitted once to the experimental semivariogram of the
+observations and reused for all predictions. Predictions are made either
+with all observations (global kriging, the kriging system is factorized
+once and points are predicted in blocks) or with the nearest observations
+found with a KD-tree (local kriging).
+
+Local kriging groups the points in square tiles of about half the typical
+distance to the n-th nearest observation. The points of a tile share one
+kriging system of all observations within the distance to the n-th nearest
+observation of the tile center plus the tile diameter, which includes the
+n nearest observations of every point of the tile. The system is factorized
+once per tile instead of being solved once per point, and as it depends on
+the tile only, the estimates do not depend on the blocks of points predicted.
+"""
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.optimize import curve_fit
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist, pdist, squareform
+
+
+def spherical(h, sill, range_, nugget):
+    hr = np.minimum(h / range_, 1.0)
+    return nugget + sill * (1.5 * hr - 0.5 * hr ** 3)
+
+
+def exponential(h, sill, range_, nugget):
+    return nugget + sill * (1.0 - np.exp(-3.0 * h / range_))
+
+
+def gaussian(h, sill, range_, nugget):
+    return nugget + sill * (1.0 - np.exp(-(7.0 * h / (4.0 * range_)) ** 2))
+
+
+class Variogram:
+    models = dict(
+        spherical=spherical,
+        exponential=exponential,
+        gaussian=gaussian
+    )
+
+    # Observations used for the experimental semivariogram
+    max_points = 2000
+
+    def __init__(self, model='spherical', sill=1.0, range=1.0, nugget=0.0):
+        if model not in self.models:
+            raise ValueError('Unknown variogram model: ' + str(model))
+
+        self.model = model
+        self.sill = float(sill)
+        self.range = float(range)
+        self.nugget = float(nugget)
+
+    def __call__(self, h):
+        """Returns the semivariance of the distances h, zero for zero distances"""
+        gamma = self.models[self.model](h, self.sill, self.range, self.nugget)
+        return np.where(h > 0, gamma, 0.0)
+
+    def to_dict(self):
+        return dict(model=self.model, sill=self.sill, range=self.range, nugget=self.nugget)
+
+    @classmethod
+    def fit(cls, x, y, model='spherical', n_lags=20):
+        """Fits the variogram model to the experimental semivariogram of the points x with values y"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+
+        if len(x) > cls.max_points:
+            idx = np.random.RandomState(0).choice(len(x), cls.max_points, replace=False)
+            x, y = x[idx], y[idx]
+
+        distances = pdist(x)
+        semivariances = 0.5 * pdist(y[:, np.newaxis], 'sqeuclidean')
+
+        variance = float(np.var(y)) if len(y) > 1 else 0.0
+        max_lag = float(distances.max()) / 2 if len(distances) > 0 else 0.0
+        if variance <= 0 or max_lag <= 0:
+            return cls(model=model, sill=max(variance, 1.0), range=max(max_lag, 1.0), nugget=0.0)
+
+        lags = np.linspace(0, max_lag, n_lags + 1)
+        bins = np.digitize(distances, lags) - 1
+        in_range = bins < n_lags
+        counts = np.bincount(bins[in_range], minlength=n_lags)
+        lag_distances = np.bincount(bins[in_range], distances[in_range], minlength=n_lags)
+        lag_semivariances = np.bincount(bins[in_range], semivariances[in_range], minlength=n_lags)
+
+        filled = counts > 0
+        lag_distances = lag_distances[filled] / counts[filled]
+        lag_semivariances = lag_semivariances[filled] / counts[filled]
+
+        initial = [variance, max_lag / 2, 0.0]
+        if len(lag_distances) < 3:
+            return cls(model, *initial)
+
+        try:
+            parameters, _ = curve_fit(
+                cls.models[model], lag_distances, lag_semivariances, p0=initial,
+                bounds=([0.0, max_lag / n_lags, 0.0], [10 * variance, 10 * max_lag, variance])
+            )
+        except (RuntimeError, ValueError):
+            parameters = initial
+
+        return cls(model, *parameters)
+
+
+class Kriging:
+    """Ordinary kriging with a variogram which is fitted once"""
+
+    # Number of observations up to which all observations are used for each prediction
+    global_limit = 1000
+    default_neighbours = 32
+
+    # Size of the local kriging systems solved at once, in matrix elements
+    max_block_elements = 2 ** 22
+
+    def __init__(self, variogram=None, neighbours=None, model='spherical', chunk_size=4096):
+        self._variogram = variogram
+        self._neighbours = neighbours
+        self._model = model
+        self._chunk_size = chunk_size
+        self._x = None
+        self._y = None
+        self._tree = None
+        self._lu = None
+        self._tile_size = None
+
+    @property
+    def variogram(self):
+        return self._variogram
+
+    def fit(self, x, y):
+        x, y = self.merge_duplicates(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        if len(x) == 0:
+            raise ValueError('No point values to interpolate')
+
+        self._x = x
+        self._y = y
+
+        if self._variogram is None:
+            self._variogram = Variogram.fit(x, y, self._model)
+
+        if self._neighbours is None:
+            self._neighbours = None if len(x) <= self.global_limit else self.default_neighbours
+
+        if self._neighbours is None or self._neighbours >= len(x):
+            self._lu = lu_factor(self.kriging_matrix(squareform(pdist(x))))
+        else:
+            self._tree = cKDTree(x)
+            distances, _ = self._tree.query(x, k=self._neighbours + 1)
+            self._tile_size = max(float(np.median(distances[:, -1])) / 2, np.finfo(float).tiny)
+
+        return self
+
+    @staticmethod
+    def merge_duplicates(x, y):
+        """Returns unique points with the mean value of duplicates, duplicates make the kriging system singular"""
+        if len(x) == 0:
+            return x.reshape(0, 2), y
+
+        keys = np.ascontiguousarray(x).view(np.dtype((np.void, x.dtype.itemsize * x.shape[1]))).ravel()
+        _, index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        if len(index) == len(x):
+            return x, y
+
+        counts = np.bincount(inverse)
+        return x[index], np.bincount(inverse, y) / counts
+
+    def kriging_matrix(self, distances):
+        """Returns the ordinary kriging matrices of (..., n, n) distances"""
+        shape = distances.shape[:-2] + (distances.shape[-2] + 1, distances.shape[-1] + 1)
+        a = np.ones(shape)
+        a[..., :-1, :-1] = self._variogram(distances)
+        a[..., -1, -1] = 0.0
+        return a
+
+    def predict(self, points, out=None):
+        """Returns the estimates at the points, global prediction is done in blocks of chunk_size points"""
+        points = np.asarray(points, dtype=float)
+        if out is None:
+            out = np.empty(len(points))
+
+        if len(self._y) == 1:
+            out[:] = self._y[0]
+        elif self._tree is not None:
+            out[:] = self.predict_local(points)
+        else:
+            for start in range(0, len(points), self._chunk_size):
+                chunk = slice(start, start + self._chunk_size)
+                out[chunk] = self.predict_global(points[chunk])
+
+        return out
+
+    def predict_global(self, points):
+        b = np.ones((len(self._x) + 1, len(points)))
+        b[:-1] = self._variogram(cdist(self._x, points))
+        weights = lu_solve(self._lu, b)
+        return self._y.dot(weights[:-1])
+
+    def predict_local(self, points):
+        """Returns the estimates of the points with a kriging system per tile of points"""
+        if self._neighbours == 1:
+            return self.predict_points(points)
+
+        tiles = np.floor(points / self._tile_size).astype(np.int64)
+        _, tile_index = np.unique(
+            np.ascontiguousarray(tiles).view(np.dtype((np.void, tiles.dtype.itemsize * 2))).ravel(),
+            return_inverse=True
+        )
+        tile_index = tile_index.ravel()
+
+        result = np.empty(len(points))
+        order = np.argsort(tile_index, kind='mergesort')
+        starts = np.flatnonzero(np.diff(tile_index[order])) + 1
+        for cells in np.split(order, starts):
+            result[cells] = self.predict_tile(tiles[cells[0]], points[cells])
+
+        return result
+
+    def predict_tile(self, tile, points):
+        """Solves one kriging system for the points of a tile
+
+        The neighbourhood depends on the tile only, not on which of its points are
+        predicted, so a grid gives the same estimates however its rows are split.
+        """
+        center = (tile + 0.5) * self._tile_size
+        distances, _ = self._tree.query(center, k=self._neighbours)
+        neighbours = self._tree.query_ball_point(center, distances[-1] + np.sqrt(2) * self._tile_size)
+
+        x = self._x[neighbours]
+        y = self._y[neighbours]
+        lu = lu_factor(self.kriging_matrix(squareform(pdist(x))))
+
+        result = np.empty(len(points))
+        for start in range(0, len(points), self._chunk_size):
+            chunk = slice(start, start + self._chunk_size)
+            b = np.ones((len(x) + 1, len(points[chunk])))
+            b[:-1] = self._variogram(cdist(x, points[chunk]))
+            result[chunk] = y.dot(lu_solve(lu, b)[:-1])
+
+        return result
+
+    def predict_points(self, points):
+        """Returns the estimates of the points with a kriging system of the nearest observations of each point"""
+        distances, idx = self._tree.query(points, k=self._neighbours)
+        if self._neighbours == 1:
+            return self._y[idx]
+
+        result = np.empty(len(points))
+        block_size = max(1, self.max_block_elements // (self._neighbours + 1) ** 2)
+        for start in range(0, len(points), block_size):
+            block = slice(start, start + block_size)
+            neighbours = self._x[idx[block]]
+            a = self.kriging_matrix(np.hypot(
+                neighbours[:, :, np.newaxis, 0] - neighbours[:, np.newaxis, :, 0],
+                neighbours[:, :, np.newaxis, 1] - neighbours[:, np.newaxis, :, 1]
+            ))
+
+            b = np.ones(a.shape[:-1] + (1,))
+            b[:, :-1, 0] = self._variogram(distances[block])
+
+            weights = np.linalg.solve(a, b)[:, :-1, 0]
+            result[block] = (weights * self._y[idx[block]]).sum(axis=1)
+
+        return result
@@ -0,0 +1,43 @@
+#! /usr/env python
+
+from .GridInterpolation import GridInterpolation
+from scipy.interpolate import LinearNDInterpolator
+from scipy.spatial import Delaunay, cKDTree
+import numpy as np
+
+
+class Linear(GridInterpolation):
+    """
+    Linear interpolation on the Delaunay triangulation of the points.
+    Cells outside of the convex hull of the points get the value of the nearest point.
+    """
+
+    fitted_attributes = ('_interpolator', '_offset', '_tree', '_values')
+
+    _interpolator = None
+    _offset = None
+    _tree = None
+    _values = None
+
+    def fit(self):
+        # Triangulation of coordinates relative to the center of the points,
+        # projected coordinates are too large for a precise triangulation
+        points = np.asarray(self._X, dtype=float)
+        self._offset = points.mean(axis=0)
+        self._values = np.asarray(self._Y, dtype=float)
+        self._interpolator = self.interpolator(Delaunay(points - self._offset, qhull_options='QJ Qbb'), self._values)
+        self._tree = cKDTree(points)
+
+    @staticmethod
+    def interpolator(triangulation, values):
+        return LinearNDInterpolator(triangulation, values)
+
+    def predict(self, points):
+        result = self._interpolator(points - self._offset)
+
+        outside = np.isnan(result)
+        if outside.any():
+            _, idx = self._tree.query(points[outside])
+            result[outside] = self._values[idx]
+
+        return result
@@ -1,6 +1,5 @@
 #! /usr/env python
 
-from sklearn.gaussian_process import GaussianProcess
 import numpy as np
 
 
@@ -0,0 +1,56 @@
+"""
+Process wide cache of fitted interpolation models.
+
+Users interpolate the same point values on different grids, the
+interpolation server keeps the fitted models (and fitted variograms) so
+a request with the same point values and fit parameters skips the fit.
+Models are keyed by a hash of the method, the point values and the
+parameters the fit depends on and are evicted least recently used first
+when more than INTERPOLATION_MODEL_CACHE_SIZE (default 16) models are
+cached. A size of 0 disables the cache.
+
+The cache saves the fit only: the fitted variogram, the factorized kriging
+system of global kriging, the KD-tree of local kriging or the triangulation.
+The prediction on the grid is made on every request and, as it grows with
+the number of cells, dominates the time of large grids and of local kriging,
+a cached model does not make those requests much faster.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ModelCache:
+    max_models = int(os.environ.get('INTERPOLATION_MODEL_CACHE_SIZE', 16))
+
+    _models = OrderedDict()
+
+    @staticmethod
+    def key(name, x, y, parameters):
+        content = hashlib.sha256()
+        content.update(json.dumps({'name': name, 'parameters': parameters}, sort_keys=True).encode())
+        content.update(np.asarray(x, dtype=np.float64).tobytes())
+        content.update(np.asarray(y, dtype=np.float64).tobytes())
+        return content.hexdigest()
+
+    @classmethod
+    def get(cls, key):
+        """Returns the cached model, None if it is not cached"""
+        model = cls._models.get(key)
+        if model is not None:
+            cls._models.move_to_end(key)
+        return model
+
+    @classmethod
+    def put(cls, key, model):
+        if cls.max_models <= 0:
+            return
+
+        cls._models[key] = model
+        cls._models.move_to_end(key)
+        while len(cls._models) > cls.max_models:
+            cls._models.popitem(last=False)
@@ -0,0 +1,22 @@
+#! /usr/env python
+
+from .GridInterpolation import GridInterpolation
+from scipy.spatial import cKDTree
+import numpy as np
+
+
+class Nearest(GridInterpolation):
+    """Value of the nearest point"""
+
+    fitted_attributes = ('_tree', '_values')
+
+    _tree = None
+    _values = None
+
+    def fit(self):
+        self._tree = cKDTree(self._X)
+        self._values = np.asarray(self._Y, dtype=float)
+
+    def predict(self, points):
+        _, idx = self._tree.query(points)
+        return self._values[idx]
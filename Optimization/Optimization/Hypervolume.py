@@ -0,0 +1,92 @@
+import numpy as np
+
+
+class HypervolumeTracker:
+    """
+    Incremental hypervolume of a growing Pareto front.
+
+    Points are given in minimization space (fitness wvalues multiplied by -1). The region dominated
+    by a Pareto front hall of fame never shrinks, so only changed fronts are recalculated.
+    Up to 3 objectives the hypervolume is exact, for more objectives it is estimated with a fixed
+    set of Monte-Carlo samples, of which only the not yet dominated ones are tested against new points.
+    """
+
+    def __init__(self, ref_point, samples=100000, seed=0):
+        self.ref_point = np.asarray(ref_point, dtype=float)
+        self.samples = samples
+        self._random = np.random.RandomState(seed)
+        self._front = set()
+        self._value = 0.
+        self._lower = None
+        self._sample_points = None
+        self._dominated = None
+
+    @classmethod
+    def from_population(cls, pop, samples=100000):
+        """Reference point is the worst value of each objective in the population"""
+        points = -np.array([ind.fitness.wvalues for ind in pop])
+        return cls(np.max(points, 0), samples=samples)
+
+    def update(self, pop):
+        """Returns hypervolume of the individuals, recalculated only if they changed"""
+        front = set(tuple(-np.array(ind.fitness.wvalues)) for ind in pop)
+        new_points = front - self._front
+        if not new_points:
+            return self._value
+
+        self._front = front
+        points = np.array(list(front))
+        points = points[np.all(points < self.ref_point, axis=1)]
+        if len(points) == 0:
+            self._value = 0.
+        elif points.shape[1] == 1:
+            self._value = float(self.ref_point[0] - np.min(points))
+        elif points.shape[1] == 2:
+            self._value = self.hypervolume_2d(points, self.ref_point)
+        elif points.shape[1] == 3:
+            self._value = self.hypervolume_3d(points, self.ref_point)
+        else:
+            self._value = self.hypervolume_monte_carlo(points, np.array(list(new_points)))
+
+        return self._value
+
+    @staticmethod
+    def hypervolume_2d(points, ref_point):
+        """Exact 2D hypervolume by a sweep over the first objective"""
+        points = points[np.argsort(points[:, 0], kind='mergesort')]
+        y = np.minimum.accumulate(points[:, 1])
+        widths = np.diff(np.append(points[:, 0], ref_point[0]))
+        return float(np.sum(widths * (ref_point[1] - y)))
+
+    @classmethod
+    def hypervolume_3d(cls, points, ref_point):
+        """Exact 3D hypervolume by slicing along the third objective"""
+        points = points[np.argsort(points[:, 2], kind='mergesort')]
+        heights = np.diff(np.append(points[:, 2], ref_point[2]))
+        volume = 0.
+        for i, height in enumerate(heights):
+            if height > 0:
+                volume += height * cls.hypervolume_2d(points[:i + 1, :2], ref_point[:2])
+        return volume
+
+    def hypervolume_monte_carlo(self, points, new_points):
+        lower = np.min(points, 0)
+        if self._lower is None or np.any(lower < self._lower):
+            # The sampling box has to be enlarged, all samples are drawn again
+            self._lower = lower - 0.1 * (self.ref_point - lower)
+            self._sample_points = self._random.uniform(
+                self._lower, self.ref_point, size=(self.samples, len(self.ref_point))
+            )
+            self._dominated = np.zeros(self.samples, dtype=bool)
+            new_points = points
+
+        open_samples = np.flatnonzero(~self._dominated)
+        chunk_size = max(1, 2 ** 22 // (len(new_points) * len(self.ref_point)))
+        for start in range(0, len(open_samples), chunk_size):
+            chunk = open_samples[start:start + chunk_size]
+            self._dominated[chunk] = np.any(
+                np.all(self._sample_points[chunk, None, :] >= new_points[None, :, :], axis=2), axis=1
+            )
+
+        box_volume = np.prod(self.ref_point - self._lower)
+        return float(box_volume * np.mean(self._dominated))
@@ -3,19 +3,22 @@ import shutil
 import random
 import json
 import uuid
+import hashlib
 import numpy as np
 from mystic.solvers import NelderMeadSimplexSolver
 from mystic.monitors import Monitor
 from mystic.termination import CandidateRelativeTolerance as CRT
 from sklearn.cluster import KMeans
 from deap import base
-from deap.benchmarks.tools import diversity, convergence, hypervolume
+from deap.benchmarks.tools import diversity, convergence
 from deap import creator
 from deap import tools
 import copy
+from collections import OrderedDict
 import pika
 import logging
 import logging.config
+from Hypervolume import HypervolumeTracker
 
 
 class OptimizationBase(object):
@@ -24,10 +27,11 @@ class OptimizationBase(object):
 
     """
     logger = logging.getLogger('optimization')
+    fitness_cache_size = int(os.environ.get('FITNESS_CACHE_SIZE', 10000))
 
     def __init__(self, optimization_id, request_data, response_channel, response_queue, rabbit_host,
                  rabbit_port, rabbit_vhost, rabbit_user, rabbit_password, simulation_request_queue,
-                 simulation_response_queue):
+                 simulation_response_queue, data_folder=None):
 
         self.optimization_id = optimization_id
         self.response_queue = response_queue
@@ -75,6 +79,17 @@ class OptimizationBase(object):
         self.weights = [i["weight"] for i in self.request_data["optimization"]["objectives"]]
 
         self.var_map, self.bounds, self.initial_values = self.read_optimization_data()
+        self.compile_var_map()
+
+        # Fitness of the latest fitness_cache_size evaluated individuals, keyed by the effective individual
+        self._fitness_cache = OrderedDict()
+        self._fitness_cache_file = None
+        self._fitness_cache_lines = 0
+        if data_folder is not None:
+            self._fitness_cache_file = os.path.join(
+                data_folder, 'fitness_cache_{}.jsonl'.format(self.model_hash())
+            )
+            self.load_fitness_cache()
 
         # Rabbit stuff
         self.simulation_request_queue = simulation_request_queue
@@ -102,12 +117,13 @@ class OptimizationBase(object):
             durable=True
         )
 
-    def publish_simulation_job(self, individual, ind_id):
+    def publish_simulation_job(self, individual, ind_id, variables=None):
         self.logger.info("Requesting fitness for individual {}".format(individual))
         self.logger.debug("Publishing simulation job for individual {} to the queue: {}"
               .format(individual, self.simulation_request_queue))
 
-        objects_data = self.apply_individual(individual=individual)
+        # The template is serialized right away, so it is filled in place without copying
+        objects_data = self.fill_template(individual=individual, variables=variables)
 
         request_data = {
             'ind_id': ind_id,
@@ -127,23 +143,202 @@ class OptimizationBase(object):
         )
         return
 
+    def effective_individual(self, individual):
+        """Returns individual values as they are applied to the model: positions are integers"""
+        variables = np.asarray(individual, dtype=float).tolist()
+        for idx in self._position_index:
+            variables[idx] = int(variables[idx])
+
+        return variables
+
+    def individual_key(self, individual):
+        """Returns the effective individual as tuple, individuals with the same key are simulated once"""
+        return tuple(self.effective_individual(individual))
+
+    def model_hash(self):
+        """Hash of the model and optimization definition, identifies a fitness cache"""
+        definition = {
+            'data': self.request_data['data'],
+            'objectives': self.request_data['optimization']['objectives'],
+            'constraints': self.request_data['optimization'].get('constraints', []),
+            'var_template': self.var_template
+        }
+        return hashlib.sha1(json.dumps(definition, sort_keys=True).encode()).hexdigest()
+
+    def load_fitness_cache(self):
+        if not os.path.isfile(self._fitness_cache_file):
+            return
+
+        try:
+            with open(self._fitness_cache_file) as f:
+                for line in f:
+                    record = json.loads(line)
+                    self.add_cached_fitness(tuple(record['variables']), record['fitness'])
+                    self._fitness_cache_lines += 1
+            self.logger.info('Loaded {} cached fitness values from {}'.format(
+                len(self._fitness_cache), self._fitness_cache_file
+            ))
+        except Exception:
+            self.logger.warning('Could not read fitness cache {}'.format(self._fitness_cache_file), exc_info=True)
+
+        if self._fitness_cache_lines > len(self._fitness_cache):
+            self.write_fitness_cache()
+
+    def write_fitness_cache(self):
+        """Rewrites the cache file with the cached fitness values only"""
+        tmp_file = self._fitness_cache_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                for variables, fitness in self._fitness_cache.items():
+                    f.write(json.dumps({'variables': list(variables), 'fitness': fitness}) + '\n')
+            os.replace(tmp_file, self._fitness_cache_file)
+            self._fitness_cache_lines = len(self._fitness_cache)
+        except Exception:
+            self.logger.warning('Could not write fitness cache {}'.format(self._fitness_cache_file), exc_info=True)
+
+    def add_cached_fitness(self, key, fitness):
+        self._fitness_cache.pop(key, None)
+        self._fitness_cache[key] = fitness
+        while len(self._fitness_cache) > self.fitness_cache_size:
+            self._fitness_cache.popitem(last=False)
+
+    def get_cached_fitness(self, individual):
+        """Returns fitness of an already evaluated individual or None"""
+        return self._fitness_cache.get(self.individual_key(individual))
+
+    def cache_fitness(self, key, fitness):
+        """Caches the fitness of an individual key"""
+        self.add_cached_fitness(key, fitness)
+
+        if self._fitness_cache_file is None:
+            return
+
+        # The file is appended and compacted when it holds twice the cached values
+        if self._fitness_cache_lines >= 2 * self.fitness_cache_size:
+            self.write_fitness_cache()
+            return
+
+        try:
+            with open(self._fitness_cache_file, 'a') as f:
+                f.write(json.dumps({'variables': list(key), 'fitness': fitness}) + '\n')
+            self._fitness_cache_lines += 1
+        except Exception:
+            self.logger.warning('Could not write fitness cache {}'.format(self._fitness_cache_file), exc_info=True)
+
+    def evaluate_batch(self, individuals, on_result=None):
+        """
+        Simulates a batch of individuals in parallel and returns the list of their fitness values.
+        Individuals with the same effective values are simulated once, cached fitness values are reused.
+        on_result is called after every fetched simulation result.
+        """
+        # The key of an individual is used for the cache, the batch and the simulation job
+        keys = [self.individual_key(ind) for ind in individuals]
+        fitnesses = [self._fitness_cache.get(key) for key in keys]
+
+        jobs = {}
+        job_ids = {}
+        for i, ind in enumerate(individuals):
+            if fitnesses[i] is not None:
+                continue
+
+            key = keys[i]
+            if key in job_ids:
+                jobs[job_ids[key]].append(i)
+                continue
+
+            _id = len(jobs)
+            job_ids[key] = _id
+            jobs[_id] = [i]
+            self.publish_simulation_job(
+                ind, _id, variables=list(key)
+            )
+
+        self.logger.info('Publishing {} simulation jobs for {} individuals'.format(len(jobs), len(individuals)))
+        if not jobs:
+            return fitnesses
+
+        results = {}
+
+        consumer_tag = str(uuid.uuid4())
+
+        def consumer_callback(channel, method, properties, body):
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            content = json.loads(body.decode())
+            if content['status_code'] == '500':
+                raise Exception(
+                    'Error during evaluation occured.' + '\r\n' + \
+                    content['message']
+                )
+
+            results[content['ind_id']] = content['fitness']
+            if on_result is not None:
+                on_result()
+
+            if len(results) == len(jobs):
+                self.logger.debug('Fetched results from the simulation response queue: ' + self.simulation_response_queue)
+                self.channel.basic_cancel(
+                    consumer_tag=consumer_tag
+                )
+
+            return
+
+        self.logger.debug('Consuming results from the simulation response queue: ' + self.simulation_response_queue)
+        self.channel.basic_consume(
+            consumer_callback=consumer_callback,
+            queue=self.simulation_response_queue,
+            consumer_tag=consumer_tag
+        )
+        self.channel.start_consuming()
+
+        for _id, indices in jobs.items():
+            self.cache_fitness(keys[indices[0]], results[_id])
+            for i in indices:
+                fitnesses[i] = results[_id]
+
+        return fitnesses
+
+    def compile_var_map(self):
+        """
+        Resolves every variable of the var_map to the dictionary in the variables template
+        that holds its 'result', so individuals are written without searching the objects.
+        """
+        objects = {object_['id']: (idx, object_) for idx, object_ in enumerate(self.var_template)}
+
+        self._var_slots = []
+        variable_objects = set()
+        for keys in self.var_map:
+            idx, slot = objects[keys[0]]
+            for key in keys[1:]:
+                slot = slot[key]
+            self._var_slots.append(slot)
+            variable_objects.add(idx)
+
+        self._variable_objects = sorted(variable_objects)
+        self._position_index = [idx for idx, keys in enumerate(self.var_map) if keys[1] == 'position']
+        self._lower_bounds = np.array([i[0] for i in self.bounds], dtype=float)
+        self._upper_bounds = np.array([i[1] for i in self.bounds], dtype=float)
+
+    def fill_template(self, individual, variables=None):
+        """
+        Writes individual values into the shared variables template in place and returns it,
+        variables are the effective individual if they are already known.
+        """
+        if variables is None:
+            variables = self.effective_individual(individual)
+
+        for ind_value, slot in zip(variables, self._var_slots):
+            slot['result'] = ind_value
+
+        return self.var_template
+
     def apply_individual(self, individual):
-        """Write individual values to variable template and return the filled template"""
-        var_template = copy.deepcopy(self.var_template)
-        for ind_value, keys in zip(individual, self.var_map):
-            if keys[1] == 'position':
-                ind_value = int(ind_value)
-                
-            if keys[1] == 'concentration':
-                for object_ in var_template:
-                    if object_['id'] == keys[0]:
-                        object_[keys[1]][keys[2]][keys[3]]['result'] = ind_value
-                        break
-            else:
-                for object_ in var_template:
-                    if object_['id'] == keys[0]:
-                        object_[keys[1]][keys[2]]['result'] = ind_value
-                        break
+        """
+        Returns objects of an individual. Only objects with variables are copied,
+        objects with fixed values are shared with the variables template.
+        """
+        var_template = list(self.fill_template(individual))
+        for idx in self._variable_objects:
+            var_template[idx] = copy.deepcopy(var_template[idx])
 
         return var_template
 
@@ -215,7 +410,7 @@ class NSGA(OptimizationBase):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        self._hypervolume_ref_point = None
+        self._hypervolume_tracker = None
         self._diversity_ref_point = None
 
     def run(self):
@@ -275,6 +470,13 @@ class NSGA(OptimizationBase):
         self.logger.info('Generating response for iteration No. {}'.format(0))
         self.callback(final=False)
 
+        if self.request_data['optimization']['parameters'].get('asynchronous', False):
+            self.run_asynchronous(
+                pop=pop, ngen=ngen, mu=mu, cxpb=cxpb, mutpb=mutpb,
+                ncls=ncls, qbound=qbound, diversity_flg=diversity_flg
+            )
+            return
+
         # Begin the generational process
         for gen in range(1, ngen):
             offspring = self.generate_offspring(
@@ -284,12 +486,9 @@ class NSGA(OptimizationBase):
                 lambda_=mu
             )
             offspring = self.evaluate_population(pop=offspring)
-            combined_pop = pop + offspring
-
-            if diversity_flg:
-                pop = self.check_diversity(combined_pop, ncls, qbound, mu)
-            else:
-                pop = self.toolbox.select(combined_pop, mu)
+            pop = self.select_population(
+                pop + offspring, mu, ncls, qbound, diversity_flg
+            )
 
             self.hall_of_fame.update(pop)
             self.calculate_hypervolume(pop)
@@ -298,6 +497,127 @@ class NSGA(OptimizationBase):
 
         return
 
+    def run_asynchronous(self, pop, ngen, mu, cxpb, mutpb, ncls, qbound, diversity_flg):
+        """
+        Asynchronous generational process.
+
+        A new offspring is generated from the current population and published as soon as
+        a simulation result comes back, so the simulation workers do not wait for the slowest
+        simulation of a generation. Every mu evaluated offspring are merged into the population
+        by the usual selection, followed by the hall of fame, hypervolume and response update.
+        The number of offspring simulated at the same time is set by the 'slots' parameter,
+        by default the number of simulation workers.
+        """
+        slots = self.request_data['optimization']['parameters'].get(
+            'slots',
+            int(os.environ.get('NUM_SOLVERS_GA', 1)) * int(os.environ.get('NUM_SIMULATION_WORKERS', 1))
+        )
+        total = (ngen - 1) * mu
+        self.logger.info('Asynchronous evaluation of {} offspring in {} slots'.format(total, slots))
+
+        state = {'pop': pop, 'dispatched': 0, 'gen': 0, 'job_count': 0}
+        offspring = []
+        jobs = {}
+        job_ids = {}
+        consumer_tag = str(uuid.uuid4())
+        self._simulation_count = 0
+
+        def add_offspring(ind):
+            offspring.append(ind)
+            self._simulation_count += 1
+            if self.report_frequency > 0 and \
+                self._simulation_count % int(mu / self.report_frequency) == 0:
+                self.callback()
+
+            if len(offspring) < mu:
+                return
+
+            state['gen'] += 1
+            self._iter_count += 1
+            state['pop'] = self.select_population(
+                state['pop'] + offspring[:mu], mu, ncls, qbound, diversity_flg
+            )
+            del offspring[:mu]
+
+            self.hall_of_fame.update(state['pop'])
+            self.calculate_hypervolume(state['pop'])
+            self.logger.info('Generating response for iteration No. {}'.format(state['gen']))
+            self.callback(final=state['gen'] == ngen - 1)
+            self._simulation_count = 0
+
+        def dispatch():
+            while state['dispatched'] < total and len(jobs) < slots:
+                ind = self.generate_offspring(
+                    pop=state['pop'], cxpb=cxpb, mutpb=mutpb, lambda_=1
+                )[0]
+                state['dispatched'] += 1
+
+                if ind.fitness.valid:
+                    add_offspring(ind)
+                    continue
+
+                key = self.individual_key(ind)
+                fitness = self._fitness_cache.get(key)
+                if fitness is not None:
+                    ind.fitness.values = fitness
+                    add_offspring(ind)
+                    continue
+
+                if key in job_ids:
+                    jobs[job_ids[key]][1].append(ind)
+                    continue
+
+                _id = state['job_count']
+                state['job_count'] += 1
+                job_ids[key] = _id
+                jobs[_id] = (key, [ind])
+                self.publish_simulation_job(ind, _id, variables=list(key))
+
+        def consumer_callback(channel, method, properties, body):
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            content = json.loads(body.decode())
+            if content['status_code'] == '500':
+                raise Exception(
+                    'Error during evaluation occured.' + '\r\n' + \
+                    content['message']
+                )
+
+            job = jobs.pop(content['ind_id'], None)
+            if job is None:
+                # E.g. a result redelivered after its job was already answered
+                self.logger.warning('Ignoring simulation result of unknown job {}'.format(content['ind_id']))
+                return
+
+            key, inds = job
+            del job_ids[key]
+            self.cache_fitness(key, content['fitness'])
+            for ind in inds:
+                ind.fitness.values = content['fitness']
+                add_offspring(ind)
+
+            dispatch()
+            if not jobs:
+                self.logger.debug('Fetched all results from the simulation response queue: ' + self.simulation_response_queue)
+                self.channel.basic_cancel(consumer_tag=consumer_tag)
+
+        dispatch()
+        if not jobs:
+            return
+
+        self.logger.debug('Consuming results from the simulation response queue: ' + self.simulation_response_queue)
+        self.channel.basic_consume(
+            consumer_callback=consumer_callback,
+            queue=self.simulation_response_queue,
+            consumer_tag=consumer_tag
+        )
+        self.channel.start_consuming()
+
+    def select_population(self, combined_pop, mu, ncls, qbound, diversity_flg):
+        if diversity_flg:
+            return self.check_diversity(combined_pop, ncls, qbound, mu)
+
+        return self.toolbox.select(combined_pop, mu)
+
     def callback(self, final=False, status_code=200):
         """
         Generate response json of the NSGA algorithm
@@ -421,22 +741,15 @@ class NSGA(OptimizationBase):
 
         self.logger.info('Calculating hypervolume...')
 
-        if self._hypervolume_ref_point is None:
+        if self._hypervolume_tracker is None:
             self.logger.info('Calculating hypervolume reference point...')
-            worst_values = []
-            fitness_array = np.array([i.fitness.values for i in pop])
-            maxs = np.max(fitness_array, 0)
-            mins = np.min(fitness_array, 0)
-            for i, weight in enumerate(self.weights):
-                if weight <= 0:
-                    worst_values.append(maxs[i])
-                else:
-                    worst_values.append(mins[i])
-            self._hypervolume_ref_point = np.array(worst_values)
+            self._hypervolume_tracker = HypervolumeTracker.from_population(
+                pop, samples=self.request_data['optimization']['parameters'].get('hv_samples', 100000)
+            )
 
-        hv = hypervolume(pop, self._hypervolume_ref_point)
+        hv = self._hypervolume_tracker.update(self.hall_of_fame)
         self._progress_log.append(hv)
-        self.logger.info('Hypervolume of the generation: {}'.format(self._progress_log[-1]))
+        self.logger.info('Hypervolume of the hall of fame: {}'.format(self._progress_log[-1]))
 
     def evaluate_population(self, pop):
         self._simulation_count = 0
@@ -444,15 +757,7 @@ class NSGA(OptimizationBase):
 
         invalid_ind = [ind for ind in pop if not ind.fitness.valid]
 
-        results = {}
-        for _id, ind in enumerate(invalid_ind):
-            self.publish_simulation_job(
-                ind, _id
-            )
-
-        consumer_tag = str(uuid.uuid4())
-
-        def consumer_callback(channel, method, properties, body):
+        def on_result():
             self._simulation_count += 1
             if self.report_frequency > 0 and \
                 self._simulation_count % \
@@ -460,33 +765,11 @@ class NSGA(OptimizationBase):
                 self.report_frequency) == 0:
                 self.callback()
 
-            channel.basic_ack(delivery_tag=method.delivery_tag)
-            content = json.loads(body.decode())
-            if content['status_code'] == '500':
-                raise Exception(
-                    'Error during evaluation occured.' + '\r\n' + \
-                    content['message']
-                )
-
-            results[content['ind_id']] = content['fitness']
-            if len(results) == len(invalid_ind):
-                self.logger.debug('Fetched results from the simulation response queue: ' + self.simulation_response_queue)
-                self.channel.basic_cancel(
-                    consumer_tag=consumer_tag
-                )
-                
-            return
-
-        self.logger.debug('Consuming results from the simulation response queue: ' + self.simulation_response_queue)
-        self.channel.basic_consume(
-            consumer_callback=consumer_callback,
-            queue=self.simulation_response_queue,
-            consumer_tag=consumer_tag
-        )
-        self.channel.start_consuming()
+        fitnesses = self.evaluate_batch(invalid_ind, on_result=on_result)
+        for ind, fitness in zip(invalid_ind, fitnesses):
+            ind.fitness.values = fitness
 
-        for _id, ind in enumerate(invalid_ind):
-            ind.fitness.values = results[_id]
+        self._simulation_count = len(invalid_ind)
 
         return pop
 
@@ -501,61 +784,55 @@ class NSGA(OptimizationBase):
     def project_and_cluster(ncls, pop, weights):
         """Implementation of the Project And Cluster algorithm proposed by Syndhya et al."""
         fitnesses = np.array([ind.fitness.values for ind in pop])
-        fitnesses_reprojected = np.zeros(fitnesses.shape)
-        maxs = np.max(fitnesses, 0)
-        mins = np.min(fitnesses, 0)
-        worst_values = []
-        for i, weight in enumerate(weights):
-            if weight <= 0:
-                worst_values.append(maxs[i])
-            else:
-                worst_values.append(mins[i])
-        ws = np.array(worst_values) ** -1
+        worst_values = np.where(
+            np.array(weights) <= 0, np.max(fitnesses, 0), np.min(fitnesses, 0)
+        )
+        ws = worst_values ** -1.
 
-        for i, fitness in enumerate(fitnesses):
-            fitnesses_reprojected[i] = ((1 - np.dot(ws, fitness)) / np.dot(ws, ws)) * ws + fitness
+        # Projection of all fitness vectors onto the hyperplane through the worst values
+        fitnesses_reprojected = fitnesses + np.outer((1 - fitnesses.dot(ws)) / ws.dot(ws), ws)
 
         # Applying K-means clustering
         kmeans = KMeans(n_clusters=ncls, random_state=0).fit(fitnesses_reprojected)
         cluster_labels = kmeans.labels_
         centroids = kmeans.cluster_centers_
 
-        # Calculating cluster diversity index
-        Q_diversity = 0
-        for cluster_label, centroid in zip(np.unique(cluster_labels), centroids):
-            cluster_inds = [i for i, j in zip(pop, cluster_labels) if j == cluster_label]
-            sum_of_distances = 0
-            for ind in cluster_inds:
-                sum_of_distances += np.linalg.norm(centroid - ind.fitness.values)
-            Q_diversity += sum_of_distances / len(cluster_inds)
+        # Calculating cluster diversity index as sum of mean distances to the cluster centroids
+        distances = np.linalg.norm(fitnesses - centroids[cluster_labels], axis=1)
+        sums_of_distances = np.bincount(cluster_labels, weights=distances, minlength=len(centroids))
+        cluster_sizes = np.bincount(cluster_labels, minlength=len(centroids))
+        non_empty = cluster_sizes > 0
+        Q_diversity = np.sum(sums_of_distances[non_empty] / cluster_sizes[non_empty])
 
         return Q_diversity, cluster_labels
 
     @staticmethod
     def diversity_enhanced_selection(pop, cluster_labels, mu, selection_method):
         # Returns population with enhanced deversity
-        diverse_pop = []
-        cluster_pop_sorted = {}
+        cluster_labels = np.asarray(cluster_labels)
+        order = np.argsort(cluster_labels, kind='mergesort')
+        clusters, starts = np.unique(cluster_labels[order], return_index=True)
 
-        for cluster in np.unique(cluster_labels):
-            cluster_inds = [i for i, j in zip(pop, cluster_labels) if j == cluster]
-            cluster_pop_sorted[cluster] = selection_method(cluster_inds, len(cluster_inds))
+        selected = []
+        selected_clusters = []
+        selected_ranks = []
+        for cluster, indices in zip(clusters, np.split(order, starts[1:])):
+            cluster_pop_sorted = selection_method([pop[i] for i in indices], len(indices))
+            selected.extend(cluster_pop_sorted)
+            selected_clusters.append(np.full(len(cluster_pop_sorted), cluster))
+            selected_ranks.append(np.arange(len(cluster_pop_sorted)))
 
-        rank = 0
-        while len(diverse_pop) < mu:
-            for p in cluster_pop_sorted.values():
-                try:
-                    diverse_pop.append(p[rank])
-                except IndexError:
-                    pass
-                if len(diverse_pop) == mu:
-                    return diverse_pop
-            rank += 1
+        # Takes the best individual of every cluster, then the second best and so on
+        interleaved = np.lexsort(
+            (np.concatenate(selected_clusters), np.concatenate(selected_ranks))
+        )[:mu]
 
-        return diverse_pop
+        return [selected[i] for i in interleaved]
 
 
 class NelderMead(OptimizationBase):
+    name = 'Simplex'
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._best_scalar_fitness = None
@@ -640,7 +917,7 @@ class NelderMead(OptimizationBase):
         self._progress_log.append(self._best_scalar_fitness)
 
         result = {
-            'name': 'Simplex',
+            'name': self.name,
             'progress': {
                 'progress_log': self._progress_log,
                 'iteration': self._iter_count,
@@ -673,7 +950,40 @@ class NelderMead(OptimizationBase):
     def evaluate_single_solution(self, individual, *weights):
         """Returns scalar fitness if weghts, else vector fitness of a single individual"""
 
-        self.publish_simulation_job(individual, 0)
+        key = self.individual_key(individual)
+        fitness = self._fitness_cache.get(key)
+        if fitness is None:
+            fitness = self.simulate_single_solution(individual, variables=list(key))
+            self.cache_fitness(key, fitness)
+        else:
+            self.logger.info('Fitness of individual {} taken from cache: {}'.format(individual, fitness))
+
+        return self.scalarize(individual, fitness)
+
+    def scalarize(self, individual, fitness):
+        """Returns scalar fitness of an individual and keeps track of the best solution"""
+
+        if self.scalarization_method == 'achievement':
+            scalar_fitness = self.achievement_scalarization(fitness)
+        elif self.scalarization_method == 'linear':
+            scalar_fitness = self.linear_sclarization(fitness)
+
+        self.logger.info('Scalar fitness: {}'.format(scalar_fitness))
+
+        if self._best_scalar_fitness is not None and scalar_fitness >= self._best_scalar_fitness:
+            return scalar_fitness
+
+        else:
+            self._best_scalar_fitness = scalar_fitness
+            self._best_fitness = fitness
+            self._best_individual = individual
+
+        return scalar_fitness
+
+    def simulate_single_solution(self, individual, variables=None):
+        """Publishes a simulation job of a single individual and returns its fitness"""
+
+        self.publish_simulation_job(individual, 0, variables=variables)
 
         fitness = []
         consumer_tag = str(uuid.uuid4())
@@ -703,22 +1013,7 @@ class NelderMead(OptimizationBase):
         )
         self.channel.start_consuming()
 
-        if self.scalarization_method == 'achievement':
-            scalar_fitness = self.achievement_scalarization(fitness)
-        elif self.scalarization_method == 'linear':
-            scalar_fitness = self.linear_sclarization(fitness)
-
-        self.logger.info('Scalar fitness: {}'.format(scalar_fitness))
-
-        if self._best_scalar_fitness is not None and scalar_fitness >= self._best_scalar_fitness:
-            return scalar_fitness
-
-        else:
-            self._best_scalar_fitness = scalar_fitness
-            self._best_fitness = fitness
-            self._best_individual = individual
-
-        return scalar_fitness
+        return fitness
     
     def calculate_z(self, fitness_array):
         """Calculates nadir and utopian vectors from a fitness 
@@ -767,4 +1062,82 @@ class NelderMead(OptimizationBase):
         fitness_normalized_augemnted = [i + p * sum(augmentation) for i in fitness_normalized]
         scalar_fitness = max(fitness_normalized_augemnted)
 
-        return scalar_fitness
\ No newline at end of file
+        return scalar_fitness
+
+
+class PatternSearch(NelderMead):
+    """
+    Batch-parallel pattern (compass) search.
+
+    Every iteration polls the 2n points current +/- step along each variable at once,
+    so up to 2n simulations run in parallel. The best improving point becomes the new
+    current solution, otherwise all steps are halved. Stops after maxf evaluations or
+    when the relative step size falls below xtol.
+    """
+    name = 'Pattern search'
+
+    def run(self):
+        self.logger.info('Start local pattern search...')
+        parameters = self.request_data['optimization']['parameters']
+        maxf = parameters['maxf']
+        xtol = parameters['xtol']
+        initial_step = parameters.get('step', 0.25)
+
+        # Steps are only halved when no neighbour improves, xtol is the minimal step
+        if not xtol > 0 or not initial_step > 0:
+            raise Exception(
+                'Pattern search requires xtol > 0 and step > 0, got xtol: {}, step: {}'.format(xtol, initial_step)
+            )
+
+        lower = self._lower_bounds
+        upper = self._upper_bounds
+        ranges = upper - lower
+        ranges[ranges == 0] = 1
+        steps = initial_step * ranges
+
+        current = np.clip(np.array(self.initial_values, dtype=float), lower, upper)
+        current_scalar = self.evaluate_single_solution(list(current))
+        n_evaluations = 1
+
+        while n_evaluations < maxf and np.max(steps / ranges) >= xtol:
+            current_key = self.individual_key(current)
+            candidates = []
+            keys = set()
+            for i in range(len(current)):
+                for direction in (1, -1):
+                    candidate = current.copy()
+                    candidate[i] = np.clip(candidate[i] + direction * steps[i], lower[i], upper[i])
+                    key = self.individual_key(candidate)
+                    if key == current_key or key in keys:
+                        continue
+                    keys.add(key)
+                    candidates.append(list(candidate))
+
+            candidates = candidates[:maxf - n_evaluations]
+            if not candidates:
+                steps /= 2
+                continue
+
+            fitnesses = self.evaluate_batch(candidates)
+            n_evaluations += len(candidates)
+            scalars = [
+                self.scalarize(candidate, fitness) for candidate, fitness in zip(candidates, fitnesses)
+            ]
+            best = int(np.argmin(scalars))
+            if scalars[best] < current_scalar:
+                current = np.array(candidates[best])
+                current_scalar = scalars[best]
+            else:
+                steps /= 2
+
+            self.logger.info(
+                'Pattern search: {} evaluations, best scalar fitness: {}'.format(n_evaluations, current_scalar)
+            )
+            self.callback(individual=list(current))
+
+        self.callback(
+            individual=list(current),
+            final=True
+        )
+
+        return
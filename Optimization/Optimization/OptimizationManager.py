@@ -5,7 +5,7 @@ import shutil
 import logging
 import logging.config
 
-from Optimization import NSGA, NelderMead
+from Optimization import NSGA, NelderMead, PatternSearch
 
 
 class OptimizationManager(object):
@@ -117,7 +117,11 @@ class OptimizationManager(object):
                 'rabbit_user': os.environ['RABBITMQ_USER'],
                 'rabbit_password': os.environ['RABBITMQ_PASSWORD'],
                 'simulation_request_queue': os.environ['SIMULATION_REQUEST_QUEUE'],
-                'simulation_response_queue': os.environ['SIMULATION_RESPONSE_QUEUE']
+                'simulation_response_queue': os.environ['SIMULATION_RESPONSE_QUEUE'],
+                'data_folder': os.path.join(
+                    os.path.realpath(os.environ['OPTIMIZATION_DATA_FOLDER']),
+                    os.environ['OPTIMIZATION_ID']
+                )
             }
 
             if content['optimization']['parameters']['method'].lower() in ['ga', 'global']:
@@ -128,6 +132,10 @@ class OptimizationManager(object):
                 self.algorithm = NelderMead(
                     **kwargs
                 )
+            elif content['optimization']['parameters']['method'].lower() in ['pattern', 'pattern_search']:
+                self.algorithm = PatternSearch(
+                    **kwargs
+                )
             else:
                 raise Exception(
                     'Invalid optimization method name: {}' \
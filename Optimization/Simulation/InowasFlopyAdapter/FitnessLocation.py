@@ -0,0 +1,110 @@
+"""
+Compact representation of objective and constraint locations
+
+Author: Aybulat Fatkhutdinov
+"""
+
+import numpy as np
+
+
+class FitnessLocation:
+    """
+    Cells and time steps of an objective or constraint location.
+
+    A bbox location is kept as (lay, row, col) slices, an object location as
+    flat indices into the (nlay, nrow, ncol) array of a single time step.
+    """
+
+    def __init__(self, per_min, per_max, slices=None, cell_index=None):
+        self.per_min = per_min
+        self.per_max = per_max
+        self.slices = slices
+        self.cell_index = cell_index
+
+    def includes(self, time_idx):
+        return self.per_min <= time_idx < self.per_max
+
+    def extract(self, data):
+        """Returns flat values of the location from a (nlay, nrow, ncol) array"""
+        if self.slices is not None:
+            return data[self.slices].ravel()
+
+        return data.ravel()[self.cell_index]
+
+    @classmethod
+    def from_bbox(cls, location, nstp_flat, nlay, nrow, ncol):
+        try:
+            per_min = location['ts']['min']
+        except KeyError:
+            per_min = 0
+
+        try:
+            per_max = location['ts']['max']
+        except KeyError:
+            per_max = nstp_flat
+
+        try:
+            lay_min = location['lay']['min']
+        except KeyError:
+            lay_min = 0
+
+        try:
+            lay_max = location['lay']['max']
+        except KeyError:
+            lay_max = nlay
+
+        try:
+            col_min = location['col']['min']
+        except KeyError:
+            col_min = 0
+
+        try:
+            col_max = location['col']['max']
+        except KeyError:
+            col_max = ncol
+
+        try:
+            row_min = location['row']['min']
+        except KeyError:
+            row_min = 0
+
+        try:
+            row_max = location['row']['max']
+        except KeyError:
+            row_max = nrow
+
+        if per_min == per_max:
+            per_max += 1
+        if lay_min == lay_max:
+            lay_max += 1
+        if row_min == row_max:
+            row_max += 1
+        if col_min == col_max:
+            col_max += 1
+
+        return cls(
+            per_min, per_max,
+            slices=(slice(lay_min, lay_max), slice(row_min, row_max), slice(col_min, col_max))
+        )
+
+    @classmethod
+    def from_objects(cls, location, objects, nstp_flat, nlay, nrow, ncol):
+        lays = []
+        rows = []
+        cols = []
+        for obj in objects:
+            if obj['id'] in location['objects']:
+                lays.append(obj['position']['lay']['result'])
+                rows.append(obj['position']['row']['result'])
+                cols.append(obj['position']['col']['result'])
+
+        # A location without objects has no values, like an empty mask
+        if not lays:
+            return cls(0, nstp_flat, cell_index=np.array([], dtype=int))
+
+        cell_index = np.unique(np.ravel_multi_index(
+            (np.array(lays, dtype=int), np.array(rows, dtype=int), np.array(cols, dtype=int)),
+            (nlay, nrow, ncol)
+        ))
+
+        return cls(0, nstp_flat, cell_index=cell_index)
@@ -67,7 +67,7 @@ class InowasFlopyCalculationAdapter:
 
     logger = logging.getLogger('inowas_flopy_calculation_adapter')
 
-    def __init__(self, version, data, uuid):
+    def __init__(self, version, data, uuid, run=True):
         self._mf_data = data.get("mf")
         self._mt_data = data.get("mt")
         self._version = version
@@ -77,6 +77,14 @@ class InowasFlopyCalculationAdapter:
         if self._mf_data is not None:
             package_content = self.read_packages(self._mf_data)
             self.create_model(self.mf_package_order, package_content)
+
+            if not run:
+                # Build the models only, input is written and run later by the caller
+                if self._mt_data is not None:
+                    package_content = self.read_packages(self._mt_data)
+                    self.create_model(self.mt_package_order, package_content)
+                return
+
             self.write_input_model(self._mf)
             self.success, report = self.run_model(self._mf, model_type='mf')
             self._report += report
@@ -109,6 +117,20 @@ class InowasFlopyCalculationAdapter:
         self.logger.debug('Write %s input files' % model)
         model.write_input()
 
+    def run_models(self):
+        """Runs modflow and mt3d models with already written input files"""
+        self._report = ''
+        self.success, report = self.run_model(self._mf, model_type='mf')
+        self._report += report
+
+        if "hob" in self._mf_data["packages"]:
+            self.logger.debug('Calculate hob-statistics and write to file %s.hob.stat' % self._uuid)
+            self.run_hob_statistics(self._mf)
+
+        if self._mt is not None:
+            self.success, report = self.run_model(self._mt, model_type='mt')
+            self._report += report
+
     def run_model(self, model, model_type):
         normal_msg = 'normal termination'
         if model_type == 'mt':
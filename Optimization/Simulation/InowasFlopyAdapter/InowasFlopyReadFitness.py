@@ -5,16 +5,21 @@ Author: Aybulat Fatkhutdinov
 """
 
 import os
+import json
 import math
 import numpy as np
 import flopy
 import logging
 import logging.config
 
+from .FitnessLocation import FitnessLocation
+
 
 class InowasFlopyReadFitness:
     """Calculation of objective values of a model """
     logger = logging.getLogger('inowas_flopy_read_fitness')
+    # Bbox locations are the same for all simulations of an optimization
+    _bbox_locations = {}
 
     def __init__(self, optimization_data, flopy_adapter):
 
@@ -25,6 +30,7 @@ class InowasFlopyReadFitness:
         self.model_name = flopy_adapter._mf.namefile.split('.')[0]
         self.objects = self.optimization_data['objects']
 
+        self.output_values = self.read_output_values()
         objectives_values = self.read_objectives()
         constraints_exceeded = self.check_constraints()
 
@@ -43,19 +49,10 @@ class InowasFlopyReadFitness:
         "Returnes fitnes list"
         fitness = []
 
-        for objective in self.optimization_data["objectives"]:
-
-            if objective["type"] == "concentration":
-                mask = self.make_mask(
-                    objective["location"], self.objects, self.dis_package
-                )
-                value = self.read_concentration(objective, mask, self.model_ws, self.model_name)
+        for idx, objective in enumerate(self.optimization_data["objectives"]):
 
-            elif objective["type"] == "head":
-                mask = self.make_mask(
-                    objective["location"], self.objects, self.dis_package
-                )
-                value = self.read_head(objective, mask, self.model_ws, self.model_name)
+            if objective["type"] in ("concentration", "head"):
+                value = self.output_values.get(('objectives', idx))
           
             elif objective["type"] == "distance":
                 value = self.read_distance(objective, self.objects)
@@ -79,23 +76,10 @@ class InowasFlopyReadFitness:
         """Returns a list of penalty values"""
         constraints_exceeded = []
 
-        for constraint in self.optimization_data["constraints"]:
+        for idx, constraint in enumerate(self.optimization_data["constraints"]):
 
-            if constraint["type"] == 'head':
-                mask = self.make_mask(
-                    constraint["location"], self.objects, self.dis_package    
-                )
-                value = self.read_head(
-                    constraint, mask, self.model_ws, self.model_name
-                )
-   
-            elif constraint["type"] == 'concentration':
-                mask = self.make_mask(
-                    constraint["location"], self.objects, self.dis_package    
-                )
-                value = self.read_concentration(
-                    constraint, mask, self.model_ws, self.model_name
-                )
+            if constraint["type"] in ('head', 'concentration'):
+                value = self.output_values.get(('constraints', idx))
 
             elif constraint["type"] == "distance":
                 value = self.read_distance(constraint, self.objects)
@@ -145,50 +129,78 @@ class InowasFlopyReadFitness:
         return result
 
 
-    def read_head(self, data, mask, model_ws, model_name):
-        "Reads head file"
+    def read_output_values(self):
+        """
+        Reads head and concentration values of all objectives and constraints.
+
+        Every binary output file is opened once and read time step by time step,
+        only the cells and time steps of each location are kept.
+        Returns a dict {(section, index): values}, values are None if the file could not be read.
+        """
+        requests = {}
+        for section in ("objectives", "constraints"):
+            for idx, item in enumerate(self.optimization_data[section]):
+                if item["type"] == "head":
+                    file_name = os.path.join(self.model_ws, self.model_name) + '.hds'
+                elif item["type"] == "concentration":
+                    file_name = os.path.join(self.model_ws, item["conc_file_name"])
+                else:
+                    continue
 
-        self.logger.info('Read head values at location: {}'.format(data['location']))
-        
-        try:
-            head_file_object = flopy.utils.HeadFile(
-                os.path.join(model_ws, model_name) + '.hds')
-            head = head_file_object.get_alldata(
-                nodata=-9999
+                self.logger.info('Read {} values at location: {}'.format(item["type"], item['location']))
+                location = self.make_location_index(
+                    item["location"], self.objects, self.dis_package
+                )
+                requests.setdefault((item["type"], file_name), []).append(
+                    ((section, idx), location)
                 )
-            head = head[mask]
-
-            head_file_object.close()
 
-        except:
-            self.logger.error('Head file of the model: '+model_name+' could not be opened', exc_info=True)
-            head = None
+        output_values = {}
+        for (file_type, file_name), file_requests in requests.items():
+            output_values.update(
+                self.read_binary_file(file_type, file_name, file_requests)
+            )
 
-        self.logger.debug('Head value is: {}'.format(head))
-        return head
-    
-    def read_concentration(self, data, mask, model_ws, model_name):
-        "Reads concentrations file"
+        return output_values
 
-        self.logger.info('Read concentration values at location: {}'.format(data['location']))
+    def read_binary_file(self, file_type, file_name, file_requests, nodata=-9999):
+        """Streams a head or concentration file and collects values of the requested locations"""
+        values = {key: [] for key, _ in file_requests}
 
         try:
-            conc_file_object = flopy.utils.UcnFile(
-                os.path.join(model_ws, data["conc_file_name"]))
-            conc = conc_file_object.get_alldata(
-                nodata=-9999
-                )
-            conc = conc[mask]
+            if file_type == "head":
+                file_object = flopy.utils.HeadFile(file_name)
+            else:
+                file_object = flopy.utils.UcnFile(file_name)
+
+            for time_idx, totim in enumerate(file_object.get_times()):
+                active_requests = [
+                    (key, location) for key, location in file_requests
+                    if location.includes(time_idx)
+                ]
+                if not active_requests:
+                    continue
+
+                data = file_object.get_data(totim=totim)
+                for key, location in active_requests:
+                    values[key].append(location.extract(data))
+
+            file_object.close()
 
-            conc_file_object.close()
-        
         except:
-            self.logger.error('Concentrations file of the model: '+model_name+' could not be opened', exc_info=True)
-            conc = None
+            self.logger.error('{} file {} could not be opened'.format(file_type, file_name), exc_info=True)
+            return {key: None for key in values}
 
-        self.logger.debug('Concentration value is: {}'.format(conc))
-        return conc
-    
+        for key in values:
+            if values[key]:
+                value = np.concatenate(values[key])
+            else:
+                value = np.array([], dtype=np.float32)
+            value[value == nodata] = np.nan
+            values[key] = value
+            self.logger.debug('{} value is: {}'.format(file_type, value))
+
+        return values
 
     def read_flux(self, data, objects):
         "Reads wel fluxes"
@@ -310,84 +322,28 @@ class InowasFlopyReadFitness:
         self.logger.debug('distance value is: {}'.format(distances))
         return distances
 
-    def make_mask(self, location, objects, dis_package):
-        "Returns an array mask of location that has nper,nlay,nrow,ncol dimensions"
+    def make_location_index(self, location, objects, dis_package):
+        """
+        Returns a FitnessLocation of the location.
 
-        self.logger.info('Making mask array for location: {}'.format(location))
+        Bbox locations do not depend on the individual and are cached for all
+        simulations of the process, object locations are recomputed.
+        """
         nstp_flat = dis_package.nstp.array.sum()
         nrow = dis_package.nrow
         ncol = dis_package.ncol
         nlay = dis_package.nlay
 
         if location["type"] == 'bbox':
-            try:
-                per_min = location['ts']['min']
-            except KeyError:
-                per_min = 0
-
-            try:
-                per_max = location['ts']['max']
-            except KeyError:
-                per_max = nstp_flat
-
-            try:
-                lay_min = location['lay']['min']
-            except KeyError:
-                lay_min = 0
-
-            try:
-                lay_max = location['lay']['max']
-            except KeyError:
-                lay_max = nlay
-
-            try:
-                col_min = location['col']['min']
-            except KeyError:
-                col_min = 0
-
-            try:
-                col_max = location['col']['max']
-            except KeyError:
-                col_max = ncol
-
-            try:
-                row_min = location['row']['min']
-            except KeyError:
-                row_min = 0
-
-            try:
-                row_max = location['row']['min']
-            except KeyError:
-                row_max = nrow
-
-            if per_min == per_max:
-                per_max += 1
-            if lay_min == lay_max:
-                lay_max += 1
-            if row_min == row_max:
-                row_max += 1
-            if col_min == col_max:
-                col_max += 1
-        
-            mask = np.zeros((nstp_flat, nlay, nrow, ncol), dtype=bool)
-            mask[
-                per_min:per_max,
-                lay_min:lay_max,
-                row_min:row_max,
-                col_min:col_max
-            ] = True
+            key = (json.dumps(location, sort_keys=True), nstp_flat, nlay, nrow, ncol)
+            if key not in self._bbox_locations:
+                self.logger.info('Making location index for location: {}'.format(location))
+                self._bbox_locations[key] = FitnessLocation.from_bbox(
+                    location, nstp_flat, nlay, nrow, ncol
+                )
+            return self._bbox_locations[key]
 
         elif location["type"] == 'object':
-            lays = []
-            rows = []
-            cols = []
-            for obj in objects:
-                if obj['id'] in location['objects']:
-                    lays.append(obj['position']['lay']['result'])
-                    rows.append(obj['position']['row']['result'])
-                    cols.append(obj['position']['col']['result'])
-
-            mask = np.zeros((nstp_flat, nlay, nrow, ncol), dtype=bool)
-            mask[:,lays,rows,cols] = True
-        
-        return mask
\ No newline at end of file
+            return FitnessLocation.from_objects(
+                location, objects, nstp_flat, nlay, nrow, ncol
+            )
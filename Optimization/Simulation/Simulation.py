@@ -1,6 +1,8 @@
 import os
 import sys
+import copy
 import json
+import uuid
 import shutil
 import logging
 
@@ -10,6 +12,12 @@ from InowasFlopyAdapter.InowasFlopyCalculationAdapter import InowasFlopyCalculat
 
 class Simulation(object):
     logger = logging.getLogger('simulation')
+    # Packages that are changed by the optimization objects, see write_spd
+    dynamic_packages = {'flux': ('mf', 'wel'), 'concentration': ('mt', 'ssm')}
+    # MODFLOW packages with point sources, the SSM package is built from them (MXSS)
+    ssm_source_packages = ('wel', 'chd', 'ghb', 'riv', 'rch', 'drn', 'evt')
+    # Static model built once per process, (flopy_adapter, template_ws)
+    _template = None
 
     def __init__(self, simulation_id):
         # Set model workspace
@@ -34,6 +42,12 @@ class Simulation(object):
             data = json.load(f)
         
         self.simulation_id = simulation_id
+        self.template_ws = os.path.join(
+            os.path.realpath(os.environ['OPTIMIZATION_DATA_FOLDER']),
+            os.environ['OPTIMIZATION_ID'],
+            'template'
+        )
+        self.use_template = os.environ.get('USE_MODEL_TEMPLATE', '0').lower() in ('1', 'true')
         self.flopy_version = data.get('version', '3.2.6')
 
         self.model_data = data['data']
@@ -53,12 +67,16 @@ class Simulation(object):
     
     def evaluate(self, objects_data):
         """ """
-        self.model_data = self.write_spd(self.model_data, objects_data)
         self.optimization_data['objects'] = objects_data
 
-        flopy_adapter = InowasFlopyCalculationAdapter(
-            self.flopy_version, self.model_data, self.simulation_id
-        )
+        replaced_packages = None
+        if self.use_template:
+            flopy_adapter, replaced_packages = self.run_from_template(objects_data)
+        else:
+            self.model_data = self.write_spd(self.model_data, objects_data)
+            flopy_adapter = InowasFlopyCalculationAdapter(
+                self.flopy_version, self.model_data, self.simulation_id
+            )
         if not flopy_adapter.success:
             self.logger.error('Error during simulation occured.')
             # raise Exception(
@@ -66,15 +84,142 @@ class Simulation(object):
             #     flopy_adapter.response_message()
             # )
 
-        fitness = InowasFlopyReadFitness(
-            self.optimization_data, flopy_adapter
-        )
+        try:
+            fitness = InowasFlopyReadFitness(
+                self.optimization_data, flopy_adapter
+            )
+        finally:
+            if replaced_packages is not None:
+                self.restore_template(replaced_packages)
 
         self.logger.info('Deleting model files in: {}'.format(self.model_ws))
         shutil.rmtree(self.model_ws)
 
         return fitness.get_fitness()
     
+    def run_from_template(self, objects_data):
+        """
+        Runs the model in the simulation workspace using the static template model.
+        Only packages changed by the objects and the name files are written,
+        all other input files are linked from the template workspace.
+        Returns the flopy adapter and the replaced template packages, which have to be
+        restored with restore_template after the results are read.
+        """
+        flopy_adapter, template_ws = self.get_template()
+        changed_packages = self.changed_packages(objects_data)
+
+        spd_data = {}
+        for model, package in changed_packages:
+            spd_data[model] = {'packages': list(self.model_data[model]['packages'])}
+            if package in self.model_data[model]:
+                spd_data[model][package] = copy.deepcopy(self.model_data[model][package])
+        spd_data = self.write_spd(spd_data, objects_data)
+
+        models = {'mf': flopy_adapter._mf, 'mt': flopy_adapter._mt}
+        for model in models.values():
+            if model is not None:
+                model.change_model_ws(self.model_ws)
+
+        # Packages are rebuilt in the order of the adapter, SSM is built from the MODFLOW packages
+        written_files = []
+        replaced_packages = []
+        for model, package in changed_packages:
+            flopy_model = models[model]
+            template_package = flopy_model.get_package(package.upper())
+            index = len(flopy_model.packagelist)
+            if template_package is not None:
+                index = flopy_model.packagelist.index(template_package)
+                flopy_model.remove_package(package.upper())
+
+            flopy_adapter.create_package(package, spd_data[model][package])
+            flopy_package = flopy_model.get_package(package.upper())
+            flopy_model.packagelist.remove(flopy_package)
+            flopy_model.packagelist.insert(index, flopy_package)
+            replaced_packages.append((flopy_model, template_package, flopy_package))
+
+            flopy_package.write_file()
+            written_files += flopy_package.file_name
+
+        for model in models.values():
+            if model is not None:
+                model.write_name_file()
+                written_files.append(model.namefile)
+
+        for file_name in os.listdir(template_ws):
+            if file_name in written_files:
+                continue
+            source = os.path.join(template_ws, file_name)
+            target = os.path.join(self.model_ws, file_name)
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copyfile(source, target)
+
+        flopy_adapter.run_models()
+        return flopy_adapter, replaced_packages
+
+    def changed_packages(self, objects_data):
+        """Returns the (model, package) changed by the objects in the package order of the adapter"""
+        changed = set()
+        for obj in objects_data:
+            for key in obj:
+                if key in self.dynamic_packages:
+                    changed.add(self.dynamic_packages[key])
+
+        has_ssm = 'mt' in self.model_data and 'ssm' in self.model_data['mt']['packages']
+        if has_ssm and any(model == 'mf' and package in self.ssm_source_packages for model, package in changed):
+            changed.add(('mt', 'ssm'))
+
+        package_order = [('mf', package) for package in InowasFlopyCalculationAdapter.mf_package_order]
+        package_order += [('mt', package) for package in InowasFlopyCalculationAdapter.mt_package_order]
+        return [package for package in package_order if package in changed]
+
+    def restore_template(self, replaced_packages):
+        """Puts the template packages back in place of the packages rebuilt for the simulation"""
+        flopy_adapter, template_ws = Simulation._template
+        for flopy_model, template_package, flopy_package in reversed(replaced_packages):
+            if template_package is None:
+                flopy_model.remove_package(flopy_package.name[0])
+            else:
+                flopy_model.packagelist[flopy_model.packagelist.index(flopy_package)] = template_package
+
+        for model in (flopy_adapter._mf, flopy_adapter._mt):
+            if model is not None:
+                model.change_model_ws(template_ws)
+
+    def get_template(self):
+        """Builds the static model once per process and writes its input files to the template workspace"""
+        if Simulation._template is not None:
+            return Simulation._template
+
+        self.logger.info('Building template model in {}'.format(self.template_ws))
+        build_ws = self.template_ws + '-' + str(uuid.uuid4())
+        model_data = copy.deepcopy(self.model_data)
+        model_data['mf']['mf']['model_ws'] = build_ws
+        if 'mt' in model_data:
+            model_data['mt']['mt']['model_ws'] = build_ws
+
+        flopy_adapter = InowasFlopyCalculationAdapter(
+            self.flopy_version, model_data, 'template', run=False
+        )
+
+        if os.path.exists(self.template_ws):
+            self.logger.info('Using template input files written by another simulation server')
+        else:
+            flopy_adapter.write_input_model(flopy_adapter._mf)
+            if flopy_adapter._mt is not None:
+                flopy_adapter.write_input_model(flopy_adapter._mt)
+            try:
+                os.rename(build_ws, self.template_ws)
+            except OSError:
+                self.logger.info('Template input files were written by another simulation server')
+
+        if os.path.exists(build_ws):
+            shutil.rmtree(build_ws)
+
+        Simulation._template = (flopy_adapter, self.template_ws)
+        return Simulation._template
+
     @staticmethod
     def write_spd(model_data, objects_data):
         """Write optimization objects data to model data SPD"""
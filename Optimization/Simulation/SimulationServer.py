@@ -4,12 +4,20 @@ import os
 import sys
 import pika
 import json
+import functools
+import multiprocessing
 import logging
 import logging.config
 
 from Simulation import Simulation
 
 
+def run_simulation(simulation_id, objects_data):
+    """Runs a simulation, executed in a worker process of the simulation pool"""
+    simulation = Simulation(simulation_id=simulation_id)
+    return simulation.evaluate(objects_data)
+
+
 class SimulationServer(object):
     logger = logging.getLogger('simulation_server')
 
@@ -23,6 +31,13 @@ class SimulationServer(object):
 
         self.request_consumer_tag = 'simulation_request_consumer'
 
+        # Worker processes are started before connecting, so they do not inherit the connection
+        self.num_workers = int(os.environ.get('NUM_SIMULATION_WORKERS', 1))
+        self.pool = None
+        if self.num_workers > 1:
+            self.logger.info('Starting pool of {} simulation workers'.format(self.num_workers))
+            self.pool = multiprocessing.Pool(processes=self.num_workers)
+
     def connect(self):
         self.connection = pika.BlockingConnection(
             pika.ConnectionParameters(
@@ -41,6 +56,8 @@ class SimulationServer(object):
             queue=self.simulation_response_queue,
             durable=True
         )
+        if self.pool is not None:
+            self.channel.basic_qos(prefetch_count=self.num_workers)
 
     def consume(self):
         self.channel.basic_consume(
@@ -52,11 +69,13 @@ class SimulationServer(object):
 
     # noinspection PyUnusedLocal
     def on_request(self, channel, method, properties, body):
-        channel.basic_ack(delivery_tag=method.delivery_tag)
         content = json.loads(body.decode("utf-8"))
 
         if 'time_to_die' in content and content['time_to_die'] == True:
             self.logger.info("Stopping simulation server")
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            if self.pool is not None:
+                self.pool.terminate()
             self.channel.basic_cancel(consumer_tag=self.request_consumer_tag)
             self.connection.close()
             sys.exit()
@@ -65,26 +84,61 @@ class SimulationServer(object):
         objects_data = content['objects_data']
         simulation_id = content['simulation_id']
 
+        if self.pool is not None:
+            # The delivery is acknowledged when the worker has finished,
+            # results are published from the connection thread
+            on_result = functools.partial(
+                self.on_result, channel, method.delivery_tag, ind_id, simulation_id
+            )
+            self.pool.apply_async(
+                run_simulation, (simulation_id, objects_data),
+                callback=lambda fitness: self.connection.add_callback_threadsafe(
+                    functools.partial(on_result, fitness, None)
+                ),
+                error_callback=lambda e: self.connection.add_callback_threadsafe(
+                    functools.partial(on_result, None, e)
+                )
+            )
+            return
+
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+
         try:
-            simulation = Simulation(simulation_id=simulation_id)
-            fitness = simulation.evaluate(objects_data)
-            response = {
-                'status_code': '200',
-                'ind_id': ind_id,
-                'fitness': fitness,
-                'message': 'Successfully finished simulation task for optimization: {}, simulation: {}' \
-                    .format(self.optimization_id, simulation_id),
-            }
+            fitness = run_simulation(simulation_id, objects_data)
+            response = self.make_response(ind_id, simulation_id, fitness)
 
         except Exception as e:
             self.logger.error(str(e), exc_info=True)
-            response = {
+            response = self.make_response(ind_id, simulation_id, None, e)
+
+        self.publish_response(response)
+
+    def on_result(self, channel, delivery_tag, ind_id, simulation_id, fitness, error):
+        if error is not None:
+            self.logger.error('Simulation {} failed: {}'.format(simulation_id, error))
+        self.publish_response(
+            self.make_response(ind_id, simulation_id, fitness, error)
+        )
+        channel.basic_ack(delivery_tag=delivery_tag)
+
+    def make_response(self, ind_id, simulation_id, fitness, error=None):
+        if error is not None:
+            return {
                 'status_code': '500',
                 'ind_id': ind_id,
                 'fitness': None,
-                'message': str(e),
+                'message': str(error),
             }
 
+        return {
+            'status_code': '200',
+            'ind_id': ind_id,
+            'fitness': fitness,
+            'message': 'Successfully finished simulation task for optimization: {}, simulation: {}' \
+                .format(self.optimization_id, simulation_id),
+        }
+
+    def publish_response(self, response):
         response = json.dumps(response).encode()
 
         self.logger.info('Publishing result to the simulation response queue: {}' \
@@ -185,7 +185,8 @@ class Server(object):
 
         try:
             solvers_per_job = 1
-            if content['optimization']['parameters']['method'] == 'GA':
+            method = content['optimization']['parameters']['method']
+            if method == 'GA' or method.lower() in ['pattern', 'pattern_search']:
                 solvers_per_job = int(self.configuration['NUM_SOLVERS_GA'])
         except Exception as e:
             message = "Error. " + str(e)
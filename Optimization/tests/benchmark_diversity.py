@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+import numpy as np
+from deap import base, creator, tools
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Optimization'))
+from Optimization import NSGA
+
+weights = (-1.0, -1.0, 1.0)
+creator.create('FitnessBenchmark', base.Fitness, weights=weights)
+creator.create('IndividualBenchmark', list, fitness=creator.FitnessBenchmark)
+
+
+def make_population(pop_size):
+    pop = []
+    for fitness in np.random.rand(pop_size, len(weights)) * 100 + 1:
+        ind = creator.IndividualBenchmark([0])
+        ind.fitness.values = tuple(fitness)
+        pop.append(ind)
+    return pop
+
+
+print('{:>8} {:>6} {:>20} {:>20}'.format('pop_size', 'ncls', 'project_and_cluster', 'diversity_selection'))
+for pop_size in [100, 500, 2000]:
+    for ncls in [2, 10, 50]:
+        pop = make_population(2 * pop_size)
+
+        start = time.time()
+        Q_diversity, cluster_labels = NSGA.project_and_cluster(ncls=ncls, pop=pop, weights=weights)
+        t_cluster = time.time() - start
+
+        start = time.time()
+        NSGA.diversity_enhanced_selection(
+            pop=pop, cluster_labels=cluster_labels, mu=pop_size, selection_method=tools.selNSGA2
+        )
+        t_selection = time.time() - start
+
+        print('{:>8} {:>6} {:>19.3f}s {:>19.3f}s'.format(pop_size, ncls, t_cluster, t_selection))
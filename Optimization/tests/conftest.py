@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Optimization and simulation modules use imports relative to their folder
+optimization_folder = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, os.path.join(optimization_folder, 'Optimization'))
+sys.path.insert(0, os.path.join(optimization_folder, 'Simulation'))
+
+# Scripts sending requests to a running optimization server
+collect_ignore = [
+    'test_optimization_server_ga.py',
+    'test_optimization_server_simplex.py',
+    'test_stop_optimization.py'
+]
+
+
+def request_data(**parameters):
+    """Returns an optimization request of a well with a position and a flux variable"""
+    parameters = dict({'method': 'pattern', 'maxf': 200, 'xtol': 0.001}, **parameters)
+    return {
+        'data': {},
+        'optimization': {
+            'parameters': parameters,
+            'objectives': [{'type': 'head', 'weight': -1}],
+            'objects': [{
+                'id': 0,
+                'position': {
+                    'lay': {'min': 0, 'max': 0},
+                    'row': {'min': 0, 'max': 20, 'result': 2},
+                    'col': {'min': 0, 'max': 20, 'result': 2}
+                },
+                'flux': {'0': {'min': 0, 'max': 100, 'result': 90}}
+            }]
+        }
+    }
+
+
+class Channel:
+    """In-memory RabbitMQ channel, simulation jobs are answered with fitness_function(individual)"""
+
+    def __init__(self, fitness_function=None):
+        self.fitness_function = fitness_function
+        self.jobs = []
+        self.simulated = []
+        self.published = []
+        self._callback = None
+
+    def queue_declare(self, **kwargs):
+        pass
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        self.published.append(body)
+
+    def basic_consume(self, consumer_callback, queue, consumer_tag):
+        self._callback = consumer_callback
+
+    def basic_cancel(self, consumer_tag):
+        self._callback = None
+
+    def basic_ack(self, delivery_tag):
+        pass
+
+    def start_consuming(self):
+        class Method:
+            delivery_tag = 0
+
+        while self._callback is not None and self.jobs:
+            ind_id, individual = self.jobs.pop(0)
+            self.simulated.append(individual)
+            body = json.dumps({
+                'status_code': '200', 'ind_id': ind_id, 'fitness': self.fitness_function(individual)
+            }).encode()
+            self._callback(self, Method, None, body)
+
+
+@pytest.fixture
+def optimization(monkeypatch):
+    """Returns a factory of optimizations simulating individuals with a fitness function"""
+    import Optimization
+
+    def create(optimization_class, request_data, fitness_function, data_folder=None):
+        channel = Channel(fitness_function)
+
+        class Connection:
+            def __init__(self, parameters):
+                pass
+
+            def channel(self):
+                return channel
+
+        monkeypatch.setattr(Optimization.pika, 'BlockingConnection', Connection)
+        instance = optimization_class(
+            optimization_id='optimization', request_data=request_data, response_channel=Channel(),
+            response_queue='response', rabbit_host='localhost', rabbit_port=5672, rabbit_vhost='/',
+            rabbit_user='guest', rabbit_password='guest', simulation_request_queue='request',
+            simulation_response_queue='simulation_response', data_folder=data_folder
+        )
+        monkeypatch.setattr(
+            instance, 'publish_simulation_job',
+            lambda individual, ind_id, variables=None: channel.jobs.append((ind_id, list(individual)))
+        )
+        return instance
+
+    return create
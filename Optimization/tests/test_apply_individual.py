@@ -0,0 +1,80 @@
+import copy
+import json
+
+import pytest
+
+from Optimization import OptimizationBase
+from .conftest import request_data
+
+
+def variables_request():
+    """Request of a well with position, flux and concentration variables and a fixed well"""
+    data = request_data()
+    data['optimization']['objects'][0]['concentration'] = {
+        '0': {'NO3': {'min': 0, 'max': 10}, 'Cl': {'min': 2, 'max': 2}},
+        '1': {'NO3': {'min': 1, 'max': 5, 'result': 3}}
+    }
+    data['optimization']['objects'].append({
+        'id': 1,
+        'position': {'lay': {'min': 1, 'max': 1}, 'row': {'min': 4, 'max': 4}, 'col': {'min': 5, 'max': 5}},
+        'flux': {'0': {'min': -50, 'max': -50}},
+        'concentration': {'0': {'NO3': {'min': 0, 'max': 0}}}
+    })
+    return data
+
+
+def deepcopy_apply_individual(optimization, individual):
+    """Objects of an individual as written before the variables template was compiled"""
+    var_template = copy.deepcopy(optimization.var_template)
+    for ind_value, keys in zip(individual, optimization.var_map):
+        if keys[1] == 'position':
+            ind_value = int(ind_value)
+
+        if keys[1] == 'concentration':
+            for object_ in var_template:
+                if object_['id'] == keys[0]:
+                    object_[keys[1]][keys[2]][keys[3]]['result'] = ind_value
+                    break
+        else:
+            for object_ in var_template:
+                if object_['id'] == keys[0]:
+                    object_[keys[1]][keys[2]]['result'] = ind_value
+                    break
+
+    return var_template
+
+
+INDIVIDUALS = [[3.7, 12.2, 55.5, 4.25, 2.5], [0., 20., 100., 0., 1.], [19.99, 0.5, 0.125, 9.75, 4.5]]
+
+
+@pytest.fixture
+def base(optimization):
+    return optimization(OptimizationBase, variables_request(), None)
+
+
+def test_variables_of_all_types(base):
+    assert [keys[1:] for keys in base.var_map] == [
+        ('position', 'row'), ('position', 'col'), ('flux', '0'), ('concentration', '0', 'NO3'),
+        ('concentration', '1', 'NO3')
+    ]
+
+
+@pytest.mark.parametrize('individual', INDIVIDUALS)
+def test_apply_individual_equals_deepcopy(base, individual):
+    expected = deepcopy_apply_individual(base, individual)
+
+    assert base.apply_individual(individual) == expected
+    assert json.loads(json.dumps(base.fill_template(individual))) == expected
+    assert base.fill_template(individual, variables=base.effective_individual(individual)) == expected
+
+
+def test_apply_individual_does_not_change_shared_objects(base):
+    fixed_object = copy.deepcopy(base.var_template[1])
+
+    objects = [base.apply_individual(individual) for individual in INDIVIDUALS]
+    base.fill_template(INDIVIDUALS[0])
+
+    for individual, applied in zip(INDIVIDUALS, objects):
+        assert applied == deepcopy_apply_individual(base, individual)
+        assert applied[1] is base.var_template[1]
+    assert base.var_template[1] == fixed_object
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from deap import base, creator, tools
+from sklearn.cluster import KMeans
+
+from Optimization import NSGA
+
+WEIGHTS = (-1.0, -1.0, 1.0)
+
+if not hasattr(creator, 'FitnessDiversity'):
+    creator.create('FitnessDiversity', base.Fitness, weights=WEIGHTS)
+    creator.create('IndividualDiversity', list, fitness=creator.FitnessDiversity)
+
+
+def reference_project_and_cluster(ncls, pop, weights):
+    """Former loop implementation of NSGA.project_and_cluster"""
+    fitnesses = np.array([ind.fitness.values for ind in pop])
+    fitnesses_reprojected = np.zeros(fitnesses.shape)
+    maxs = np.max(fitnesses, 0)
+    mins = np.min(fitnesses, 0)
+    worst_values = []
+    for i, weight in enumerate(weights):
+        if weight <= 0:
+            worst_values.append(maxs[i])
+        else:
+            worst_values.append(mins[i])
+    ws = np.array(worst_values) ** -1
+
+    for i, fitness in enumerate(fitnesses):
+        fitnesses_reprojected[i] = ((1 - np.dot(ws, fitness)) / np.dot(ws, ws)) * ws + fitness
+
+    kmeans = KMeans(n_clusters=ncls, random_state=0).fit(fitnesses_reprojected)
+    cluster_labels = kmeans.labels_
+    centroids = kmeans.cluster_centers_
+
+    Q_diversity = 0
+    for cluster_label, centroid in zip(np.unique(cluster_labels), centroids):
+        cluster_inds = [i for i, j in zip(pop, cluster_labels) if j == cluster_label]
+        sum_of_distances = 0
+        for ind in cluster_inds:
+            sum_of_distances += np.linalg.norm(centroid - ind.fitness.values)
+        Q_diversity += sum_of_distances / len(cluster_inds)
+
+    return Q_diversity, cluster_labels
+
+
+def reference_diversity_enhanced_selection(pop, cluster_labels, mu, selection_method):
+    """Former loop implementation of NSGA.diversity_enhanced_selection"""
+    diverse_pop = []
+    cluster_pop_sorted = {}
+
+    for cluster in np.unique(cluster_labels):
+        cluster_inds = [i for i, j in zip(pop, cluster_labels) if j == cluster]
+        cluster_pop_sorted[cluster] = selection_method(cluster_inds, len(cluster_inds))
+
+    rank = 0
+    while len(diverse_pop) < mu:
+        for p in cluster_pop_sorted.values():
+            try:
+                diverse_pop.append(p[rank])
+            except IndexError:
+                pass
+            if len(diverse_pop) == mu:
+                return diverse_pop
+        rank += 1
+
+    return diverse_pop
+
+
+def make_population(pop_size, seed):
+    pop = []
+    for idx, fitness in enumerate(np.random.RandomState(seed).rand(pop_size, len(WEIGHTS)) * 100 + 1):
+        ind = creator.IndividualDiversity([idx])
+        ind.fitness.values = tuple(fitness)
+        pop.append(ind)
+    return pop
+
+
+@pytest.mark.parametrize('pop_size, ncls', [(20, 2), (100, 10), (200, 50)])
+def test_project_and_cluster_equals_reference(pop_size, ncls):
+    pop = make_population(pop_size, seed=pop_size)
+
+    Q_diversity, cluster_labels = NSGA.project_and_cluster(ncls=ncls, pop=pop, weights=WEIGHTS)
+    reference_Q_diversity, reference_labels = reference_project_and_cluster(ncls=ncls, pop=pop, weights=WEIGHTS)
+
+    np.testing.assert_array_equal(cluster_labels, reference_labels)
+    assert Q_diversity == pytest.approx(reference_Q_diversity)
+
+
+@pytest.mark.parametrize('pop_size, ncls, mu', [(20, 2, 10), (100, 10, 50), (100, 10, 100), (200, 50, 97)])
+def test_diversity_enhanced_selection_equals_reference(pop_size, ncls, mu):
+    pop = make_population(pop_size, seed=pop_size)
+    _, cluster_labels = NSGA.project_and_cluster(ncls=ncls, pop=pop, weights=WEIGHTS)
+
+    selected = NSGA.diversity_enhanced_selection(
+        pop=pop, cluster_labels=cluster_labels, mu=mu, selection_method=tools.selNSGA2
+    )
+    reference = reference_diversity_enhanced_selection(
+        pop=pop, cluster_labels=cluster_labels, mu=mu, selection_method=tools.selNSGA2
+    )
+
+    assert [ind[0] for ind in selected] == [ind[0] for ind in reference]
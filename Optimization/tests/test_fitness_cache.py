@@ -0,0 +1,64 @@
+import os
+
+from Optimization import OptimizationBase
+from .conftest import request_data
+
+
+def fitness(individual):
+    return [sum(individual)]
+
+
+def cache_lines(data_folder):
+    files = [name for name in os.listdir(data_folder) if name.startswith('fitness_cache_')]
+    assert len(files) == 1
+    with open(os.path.join(data_folder, files[0])) as f:
+        return f.readlines()
+
+
+def test_effective_individual_truncates_positions_only(optimization):
+    base = optimization(OptimizationBase, request_data(), fitness)
+
+    assert base.effective_individual([3.7, 25.2, 120.5]) == [3, 25, 120.5]
+    assert base.apply_individual([3.7, 25.2, 120.5])[0]['flux']['0']['result'] == 120.5
+
+
+def test_evaluates_effective_individuals_once(optimization):
+    base = optimization(OptimizationBase, request_data(), fitness)
+
+    assert base.evaluate_batch([[1.2, 2, 3.], [1.7, 2, 3.], [4, 5, 6.]]) == [[6.2], [6.2], [15.]]
+    assert base.channel.simulated == [[1.2, 2, 3.], [4, 5, 6.]]
+
+    assert base.evaluate_batch([[1, 2.9, 3.], [7, 8, 9.]]) == [[6.2], [24.]]
+    assert base.channel.simulated[2:] == [[7, 8, 9.]]
+
+
+def test_reloads_cache_of_the_same_model(optimization, tmpdir):
+    data_folder = str(tmpdir)
+    optimization(OptimizationBase, request_data(), fitness, data_folder).evaluate_batch([[1, 2, 3.], [4, 5, 6.]])
+
+    restarted = optimization(OptimizationBase, request_data(), fitness, data_folder)
+    assert restarted.evaluate_batch([[4, 5, 6.], [1, 2, 3.]]) == [[15.], [6.]]
+    assert restarted.channel.simulated == []
+
+    changed = request_data()
+    changed['optimization']['objectives'][0]['weight'] = 1
+    assert optimization(OptimizationBase, changed, fitness, data_folder).get_cached_fitness([1, 2, 3.]) is None
+
+
+def test_cache_is_capped(optimization, tmpdir, monkeypatch):
+    monkeypatch.setattr(OptimizationBase, 'fitness_cache_size', 3)
+    data_folder = str(tmpdir)
+    base = optimization(OptimizationBase, request_data(), fitness, data_folder)
+
+    individuals = [[i, i, float(i)] for i in range(10)]
+    for individual in individuals:
+        base.evaluate_batch([individual])
+        assert len(base._fitness_cache) <= 3
+        assert len(cache_lines(data_folder)) <= 6
+
+    assert base.get_cached_fitness(individuals[6]) is None
+    assert base.get_cached_fitness(individuals[9]) == [27.]
+
+    restarted = optimization(OptimizationBase, request_data(), fitness, data_folder)
+    assert list(restarted._fitness_cache.values()) == [[21.], [24.], [27.]]
+    assert len(cache_lines(data_folder)) == 3
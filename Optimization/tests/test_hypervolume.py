@@ -0,0 +1,69 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from Hypervolume import HypervolumeTracker
+
+
+class Individual:
+    class Fitness:
+        def __init__(self, wvalues):
+            self.wvalues = tuple(wvalues)
+
+    def __init__(self, point):
+        # Points are minimized, weighted values are maximized
+        self.fitness = self.Fitness(-np.asarray(point, dtype=float))
+
+
+def brute_force_hypervolume(points, ref_point):
+    """Number of unit cells dominated by integer points"""
+    lower = np.min(points, 0).astype(int)
+    cells = itertools.product(*[range(low, int(ref)) for low, ref in zip(lower, ref_point)])
+    return float(sum(1 for cell in cells if np.any(np.all(points <= cell, axis=1))))
+
+
+def integer_points(n, n_objectives, seed):
+    return np.random.RandomState(seed).randint(0, 10, size=(n, n_objectives)).astype(float)
+
+
+@pytest.mark.parametrize('n_objectives', [1, 2, 3])
+@pytest.mark.parametrize('seed', range(3))
+def test_exact_hypervolume(n_objectives, seed):
+    points = integer_points(8, n_objectives, seed)
+    ref_point = np.full(n_objectives, 10.)
+    tracker = HypervolumeTracker(ref_point)
+
+    assert tracker.update([Individual(point) for point in points]) == brute_force_hypervolume(points, ref_point)
+
+
+def test_points_beyond_the_reference_point_are_ignored():
+    tracker = HypervolumeTracker([10., 10.])
+
+    assert tracker.update([Individual([12., 1.]), Individual([5., 5.])]) == 25.
+
+
+def test_monte_carlo_hypervolume():
+    points = integer_points(6, 4, seed=0)
+    ref_point = np.full(4, 10.)
+    tracker = HypervolumeTracker(ref_point, samples=200000)
+
+    pop = [Individual(point) for point in points[:3]]
+    tracker.update(pop)
+    pop += [Individual(point) for point in points[3:]]
+    assert tracker.update(pop) == pytest.approx(brute_force_hypervolume(points, ref_point), rel=0.02)
+
+
+def test_unchanged_front_is_not_recalculated(monkeypatch):
+    tracker = HypervolumeTracker([10., 10., 10.])
+    pop = [Individual([1., 5., 3.]), Individual([4., 2., 6.])]
+    value = tracker.update(pop)
+
+    monkeypatch.setattr(HypervolumeTracker, 'hypervolume_3d', None)
+    assert tracker.update(list(reversed(pop))) == value
+
+
+def test_reference_point_from_population():
+    pop = [Individual([1., 5.]), Individual([4., 2.])]
+
+    np.testing.assert_array_equal(HypervolumeTracker.from_population(pop).ref_point, [4., 5.])
@@ -0,0 +1,154 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from Hypervolume import HypervolumeTracker
+from Optimization import NSGA
+from .conftest import request_data
+
+
+def nsga_request(**parameters):
+    parameters = dict({
+        'method': 'GA', 'ngen': 5, 'pop_size': 8, 'mutpb': 0.3, 'cxpb': 0.6, 'eta': 20, 'indpb': 0.5,
+        'ncls': 2, 'qbound': 0.25, 'diversity_flg': False, 'asynchronous': True, 'slots': 3
+    }, **parameters)
+    data = request_data(**parameters)
+    data['optimization']['objectives'] = [{'type': 'head', 'weight': -1}, {'type': 'flux', 'weight': -1}]
+    return data
+
+
+def fitness(individual):
+    row, col, flux = int(individual[0]), int(individual[1]), individual[2]
+    return [(row - 7) ** 2 + (col - 13) ** 2 + 100. - flux, flux + row]
+
+
+def publish_asynchronously(instance, publish):
+    """Replaces the job publishing of the asynchronous generations, after the initial population"""
+    run_asynchronous = instance.run_asynchronous
+
+    def run_with_publish(**kwargs):
+        instance.publish_simulation_job = publish
+        run_asynchronous(**kwargs)
+
+    instance.run_asynchronous = run_with_publish
+
+
+def responses(nsga):
+    return [json.loads(body.decode())['methods'][0] for body in nsga.response_channel.published]
+
+
+@pytest.fixture
+def nsga(optimization):
+    random.seed(0)
+
+    def create(data=None, fitness_function=fitness):
+        return optimization(NSGA, data or nsga_request(), fitness_function)
+
+    return create
+
+
+def test_simulates_at_most_slots_offspring_at_the_same_time(nsga):
+    instance = nsga()
+    in_flight = []
+    publish = instance.publish_simulation_job
+
+    def count_in_flight(individual, ind_id, variables=None):
+        publish(individual, ind_id, variables)
+        in_flight.append(len(instance.channel.jobs))
+
+    publish_asynchronously(instance, count_in_flight)
+    instance.run()
+
+    assert max(in_flight) == 3
+
+
+def small_request():
+    """Request of 9 distinct effective individuals, the flux is fixed"""
+    data = nsga_request(ngen=6, pop_size=6)
+    position = data['optimization']['objects'][0]['position']
+    position['row'] = {'min': 0, 'max': 2}
+    position['col'] = {'min': 0, 'max': 2}
+    data['optimization']['objects'][0]['flux']['0'] = {'min': 50, 'max': 50}
+    return data
+
+
+def fixed_flux_fitness(individual):
+    return fitness(list(individual) + [50.])
+
+
+def test_simulates_duplicate_offspring_once(nsga):
+    instance = nsga(small_request(), fixed_flux_fitness)
+    instance.run()
+
+    simulated = [tuple(instance.effective_individual(individual)) for individual in instance.channel.simulated]
+    assert len(simulated) == len(set(simulated))
+    assert len(simulated) <= 9
+
+
+def test_simulates_duplicate_offspring_in_flight_once(nsga, monkeypatch):
+    monkeypatch.setattr(NSGA, 'fitness_cache_size', 0)
+    instance = nsga(small_request(), fixed_flux_fitness)
+    publish = instance.publish_simulation_job
+    in_flight = []
+
+    def record_in_flight(individual, ind_id, variables=None):
+        publish(individual, ind_id, variables)
+        in_flight.append([tuple(instance.effective_individual(job[1])) for job in instance.channel.jobs])
+
+    publish_asynchronously(instance, record_in_flight)
+    instance.run()
+
+    assert all(len(keys) == len(set(keys)) for keys in in_flight)
+    assert responses(instance)[-1]['progress']['final']
+
+
+def test_reports_every_generation_and_the_last_one_as_final(nsga):
+    instance = nsga()
+    instance.run()
+
+    progress = [response['progress'] for response in responses(instance)]
+    assert [p['final'] for p in progress] == [False] * 4 + [True]
+    assert [p['iteration'] for p in progress] == [1, 2, 3, 4, 5]
+
+
+def test_hall_of_fame_and_hypervolume(nsga):
+    instance = nsga()
+    instance.run()
+
+    final = responses(instance)[-1]
+    solutions = [solution['fitness'] for solution in final['solutions']]
+    for solution in final['solutions']:
+        assert solution['fitness'] == fitness(solution['variables'])
+
+    # The Pareto front holds the best simulated value of each objective
+    simulated = [fitness(individual) for individual in instance.channel.simulated]
+    for objective in range(2):
+        assert min(s[objective] for s in solutions) == min(s[objective] for s in simulated)
+
+    hypervolumes = final['progress']['progress_log']
+    assert len(hypervolumes) == 5
+    assert hypervolumes == sorted(hypervolumes)
+
+    ref_point = instance._hypervolume_tracker.ref_point
+    points = [s for s in solutions if s[0] < ref_point[0] and s[1] < ref_point[1]]
+    assert hypervolumes[-1] == pytest.approx(HypervolumeTracker.hypervolume_2d(np.array(points), ref_point))
+
+
+def test_ignores_results_of_unknown_jobs(nsga):
+    instance = nsga()
+    publish = instance.publish_simulation_job
+    unknown = []
+
+    def publish_with_unknown_result(individual, ind_id, variables=None):
+        if not unknown:
+            unknown.append(ind_id)
+            instance.channel.jobs.append(('unknown', [0, 0, 0.]))
+        publish(individual, ind_id, variables)
+
+    publish_asynchronously(instance, publish_with_unknown_result)
+    instance.run()
+
+    assert [0, 0, 0.] in instance.channel.simulated
+    assert responses(instance)[-1]['progress']['final']
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from Optimization import PatternSearch
+from .conftest import request_data
+
+TARGET = {'row': 7, 'col': 13, 'flux': 30.}
+
+
+def distance(individual):
+    row, col, flux = individual
+    return [(row - TARGET['row']) ** 2 + (col - TARGET['col']) ** 2 + (flux - TARGET['flux']) ** 2]
+
+
+def final_solution(pattern_search):
+    response = json.loads(pattern_search.response_channel.published[-1].decode())
+    assert response['methods'][0]['progress']['final']
+    return response['methods'][0]['solutions'][0]
+
+
+def test_finds_minimum(optimization):
+    pattern_search = optimization(PatternSearch, request_data(), distance)
+    pattern_search.run()
+
+    row, col, flux = final_solution(pattern_search)['variables']
+    assert (int(row), int(col)) == (TARGET['row'], TARGET['col'])
+    assert flux == pytest.approx(TARGET['flux'], abs=0.2)
+    assert len(pattern_search.channel.simulated) <= 200
+
+
+def test_simulates_effective_individuals_once(optimization):
+    pattern_search = optimization(PatternSearch, request_data(), distance)
+    pattern_search.run()
+
+    simulated = [tuple(pattern_search.effective_individual(ind)) for ind in pattern_search.channel.simulated]
+    assert len(simulated) == len(set(simulated))
+
+
+def test_stops_without_distinct_neighbours(optimization):
+    data = request_data(maxf=10000, xtol=1e-12)
+    data['optimization']['objects'][0]['flux']['0'] = {'min': 50, 'max': 50}
+    pattern_search = optimization(PatternSearch, data, lambda ind: distance(list(ind) + [30.]))
+    pattern_search.run()
+
+    variables = pattern_search.effective_individual(final_solution(pattern_search)['variables'])
+    assert variables == [TARGET['row'], TARGET['col']]
+    assert len(pattern_search.channel.simulated) < 100
+
+
+@pytest.mark.parametrize('parameters', [{'xtol': 0}, {'xtol': -1}, {'step': 0}])
+def test_rejects_non_positive_steps(optimization, parameters):
+    pattern_search = optimization(PatternSearch, request_data(**parameters), distance)
+
+    with pytest.raises(Exception, match='xtol > 0 and step > 0'):
+        pattern_search.run()
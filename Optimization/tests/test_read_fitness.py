@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from InowasFlopyAdapter.FitnessLocation import FitnessLocation
+from InowasFlopyAdapter.InowasFlopyReadFitness import InowasFlopyReadFitness
+
+NT, NLAY, NROW, NCOL = 4, 2, 5, 6
+
+
+def write_binary_file(file_name, data, text, ucn=False):
+    """Writes (ntimes, nlay, nrow, ncol) data as single precision head or concentration file"""
+    if ucn:
+        header = np.dtype([('ntrans', 'i4'), ('kstp', 'i4'), ('kper', 'i4'), ('totim', 'f4'),
+                           ('text', 'S16'), ('ncol', 'i4'), ('nrow', 'i4'), ('ilay', 'i4')])
+    else:
+        header = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('pertim', 'f4'), ('totim', 'f4'),
+                           ('text', 'S16'), ('ncol', 'i4'), ('nrow', 'i4'), ('ilay', 'i4')])
+
+    with open(file_name, 'wb') as f:
+        for time_idx in range(data.shape[0]):
+            for lay in range(data.shape[1]):
+                record = np.zeros(1, header)
+                record['kstp'] = time_idx + 1
+                record['kper'] = 1
+                record['totim'] = time_idx + 1
+                record['text'] = text
+                record['ncol'] = data.shape[3]
+                record['nrow'] = data.shape[2]
+                record['ilay'] = lay + 1
+                f.write(record.tobytes())
+                f.write(data[time_idx, lay].astype('<f4').tobytes())
+
+
+class Stub:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+@pytest.fixture
+def model(tmpdir):
+    heads = np.random.RandomState(0).rand(NT, NLAY, NROW, NCOL).astype(np.float32) * 10
+    concentrations = heads / 10
+    write_binary_file(str(tmpdir.join('mf.hds')), heads, b'            HEAD')
+    write_binary_file(str(tmpdir.join('MT3D001.UCN')), concentrations, b'CONCENTRATION   ', ucn=True)
+
+    dis = Stub(nstp=Stub(array=np.array([NT])), nlay=NLAY, nrow=NROW, ncol=NCOL)
+    mf = Stub(get_package=lambda name: dis, model_ws=str(tmpdir), namefile='mf.nam')
+    return Stub(_mf=mf), heads, concentrations
+
+
+def well(obj_id, lay, row, col):
+    return {
+        'id': obj_id,
+        'position': {'lay': {'result': lay}, 'row': {'result': row}, 'col': {'result': col}},
+        'flux': {'0': {'result': -100.0}}
+    }
+
+
+def optimization_data(objectives, constraints=(), objects=()):
+    return {'objectives': list(objectives), 'constraints': list(constraints), 'objects': list(objects)}
+
+
+def objective(objective_type, location, summary_method='max'):
+    return {
+        'type': objective_type, 'conc_file_name': 'MT3D001.UCN', 'summary_method': summary_method,
+        'weight': 1, 'penalty_value': 999, 'location': location
+    }
+
+
+def test_bbox_values_are_the_masked_values(model):
+    flopy_adapter, heads, concentrations = model
+    location = {
+        'type': 'bbox', 'ts': {'min': 1, 'max': 3}, 'lay': {'min': 0, 'max': 1},
+        'row': {'min': 1, 'max': 3}, 'col': {'min': 2, 'max': 2}
+    }
+    fitness = InowasFlopyReadFitness(optimization_data([
+        objective('head', location, 'mean'),
+        objective('concentration', location, 'min')
+    ]), flopy_adapter)
+
+    mask = np.zeros(heads.shape, dtype=bool)
+    mask[1:3, 0:1, 1:3, 2:3] = True
+    assert fitness.get_fitness() == [np.nanmean(heads[mask]).item(), np.min(concentrations[mask]).item()]
+
+
+def test_object_values_are_the_masked_values(model):
+    flopy_adapter, heads, concentrations = model
+    objects = [well('a', 1, 4, 5), well('b', 0, 2, 1), well('c', 0, 0, 0)]
+    location = {'type': 'object', 'objects': ['a', 'b']}
+    fitness = InowasFlopyReadFitness(
+        optimization_data([objective('head', location, 'mean')], objects=objects), flopy_adapter
+    )
+
+    mask = np.zeros(heads.shape, dtype=bool)
+    mask[:, [1, 0], [4, 2], [5, 1]] = True
+    assert fitness.output_values[('objectives', 0)].tolist() == heads[mask].tolist()
+
+
+def test_object_location_without_objects_gets_penalty(model):
+    flopy_adapter, heads, concentrations = model
+    location = {'type': 'object', 'objects': ['missing']}
+    fitness = InowasFlopyReadFitness(
+        optimization_data([objective('head', location)], objects=[well('a', 0, 0, 0)]), flopy_adapter
+    )
+
+    assert fitness.get_fitness() == [999]
+
+
+def test_missing_output_file_gets_penalty(model, tmpdir):
+    flopy_adapter, heads, concentrations = model
+    tmpdir.join('mf.hds').remove()
+    fitness = InowasFlopyReadFitness(
+        optimization_data([objective('head', {'type': 'bbox'})]), flopy_adapter
+    )
+
+    assert fitness.get_fitness() == [999]
+
+
+def test_from_objects_without_objects():
+    location = FitnessLocation.from_objects({'type': 'object', 'objects': ['a']}, [], NT, NLAY, NROW, NCOL)
+
+    assert location.cell_index.dtype.kind == 'i'
+    assert location.extract(np.ones((NLAY, NROW, NCOL))).size == 0
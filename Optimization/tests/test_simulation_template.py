@@ -0,0 +1,102 @@
+import copy
+import json
+import os
+
+import pytest
+
+from InowasFlopyAdapter.InowasFlopyCalculationAdapter import InowasFlopyCalculationAdapter
+from Simulation import Simulation
+
+tests_folder = os.path.dirname(os.path.realpath(__file__))
+
+
+def well(row, col, flux, concentration=None):
+    obj = {
+        'position': {'lay': {'result': 0}, 'row': {'result': row}, 'col': {'result': col}},
+        'flux': {str(period): {'result': flux} for period in range(10)}
+    }
+    if concentration is not None:
+        obj['concentration'] = {
+            str(period): {'component1': {'result': concentration}} for period in range(10)
+        }
+    return obj
+
+
+@pytest.fixture
+def simulation(tmpdir, monkeypatch):
+    with open(os.path.join(tests_folder, 'input_optimization_ga.json')) as f:
+        content = json.load(f)
+
+    os.makedirs(str(tmpdir.join('optimization')))
+    with open(str(tmpdir.join('optimization', 'model.json')), 'w') as f:
+        json.dump({'version': content['version'], 'data': content['data'], 'optimization': content['optimization']}, f)
+
+    monkeypatch.setenv('OPTIMIZATION_DATA_FOLDER', str(tmpdir))
+    monkeypatch.setenv('OPTIMIZATION_ID', 'optimization')
+    monkeypatch.setenv('MODEL_FILE_NAME', 'model.json')
+    monkeypatch.setenv('USE_MODEL_TEMPLATE', '1')
+    monkeypatch.setattr(InowasFlopyCalculationAdapter, 'run_models', lambda self: None)
+    monkeypatch.setattr(Simulation, '_template', None)
+
+    return lambda simulation_id: Simulation(simulation_id)
+
+
+def read_files(workspace):
+    files = {}
+    for file_name in os.listdir(workspace):
+        with open(os.path.join(workspace, file_name)) as f:
+            files[file_name] = f.read()
+    return files
+
+
+def full_rebuild(simulation, objects_data, workspace):
+    model_data = copy.deepcopy(simulation.model_data)
+    model_data['mf']['mf']['model_ws'] = workspace
+    model_data['mt']['mt']['model_ws'] = workspace
+    model_data = Simulation.write_spd(model_data, objects_data)
+
+    flopy_adapter = InowasFlopyCalculationAdapter(simulation.flopy_version, model_data, 'full', run=False)
+    flopy_adapter.write_input_model(flopy_adapter._mf)
+    flopy_adapter.write_input_model(flopy_adapter._mt)
+    return read_files(workspace)
+
+
+def run_template(simulation, objects_data):
+    flopy_adapter, replaced_packages = simulation.run_from_template(copy.deepcopy(objects_data))
+    files = read_files(simulation.model_ws)
+    simulation.restore_template(replaced_packages)
+    return files
+
+
+@pytest.mark.parametrize('objects_data', [
+    [well(30, 30, -500)],
+    [well(30, 30, -500, 2.5), well(40, 50, 1000, 0.5)],
+])
+def test_template_input_equals_full_rebuild(simulation, tmpdir, objects_data):
+    template_files = run_template(simulation('simulation'), objects_data)
+    full_files = full_rebuild(simulation('reference'), objects_data, str(tmpdir.join('full')))
+
+    assert sorted(template_files) == sorted(full_files)
+    for file_name in full_files:
+        assert template_files[file_name] == full_files[file_name], file_name
+
+
+def test_ssm_is_rebuilt_for_wells_only(simulation):
+    assert simulation('simulation').changed_packages([well(30, 30, -500)]) == [('mf', 'wel'), ('mt', 'ssm')]
+    assert simulation('simulation').changed_packages([well(30, 30, -500, 1)]) == [('mf', 'wel'), ('mt', 'ssm')]
+
+
+def test_simulations_do_not_change_the_template(simulation, tmpdir):
+    first = simulation('first')
+    run_template(first, [well(30, 30, -500, 2.5), well(40, 50, 1000, 0.5), well(60, 60, 100, 1)])
+
+    flopy_adapter, template_ws = Simulation._template
+    template_packages = list(flopy_adapter._mf.packagelist) + list(flopy_adapter._mt.packagelist)
+
+    objects_data = [well(20, 25, -100)]
+    template_files = run_template(simulation('second'), objects_data)
+    full_files = full_rebuild(simulation('reference'), objects_data, str(tmpdir.join('full')))
+
+    assert template_files == full_files
+    assert list(flopy_adapter._mf.packagelist) + list(flopy_adapter._mt.packagelist) == template_packages
+    assert flopy_adapter._mf.model_ws == template_ws
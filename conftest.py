@@ -0,0 +1,3 @@
+# The optimization services have their own InowasFlopyAdapter package,
+# their tests run separately: python -m pytest Optimization/tests
+collect_ignore = ['Optimization', 'build']
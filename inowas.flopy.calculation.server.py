@@ -1,13 +1,17 @@
 #!/usr/bin/env python
 
+import functools
 import json
+import multiprocessing
 import os
 import pika
 import sys
 import traceback
 import warnings
 
+from InowasFlopyAdapter.CalculationCache import CalculationCache
 from InowasFlopyAdapter.InowasFlopyCalculationAdapter import InowasFlopyCalculationAdapter
+from InowasFlopyAdapter.ResponseEncoder import bounded_message, encode_response
 
 warnings.filterwarnings("ignore")
 
@@ -57,38 +61,54 @@ def process(content):
             data['mt']['mt']['model_ws'] = target_directory
 
         try:
-            flopy = InowasFlopyCalculationAdapter(version, data, calculation_id)
+            cache = CalculationCache.from_environment(datafolder)
+            cached = None
+            if cache is not None:
+                cached = cache.restore(version, data, target_directory)
+
+            if cached is not None:
+                print('Calculation results restored from cache')
+                response_data, response_message = cached
+            else:
+                if cache is not None:
+                    cache.release(target_directory)
+
+                flopy = InowasFlopyCalculationAdapter(version, data, calculation_id)
+                response_data = flopy.response()
+                response_message = flopy.response_message()
+
+                if cache is not None and flopy.success:
+                    cache.store(version, data, target_directory, response_data, response_message)
+
+            response_message, report_file = bounded_message(response_message, target_directory)
+
             response = {}
             response['status_code'] = "200"
             response['model_id'] = model_id
             response['calculation_id'] = calculation_id
-            response['data'] = flopy.response()
-            response['message'] = flopy.response_message()
-            response = str(response).replace('\'', '"')
-            return response
+            response['data'] = response_data
+            response['message'] = response_message
+            if report_file is not None:
+                response['report_file'] = report_file
+            return encode_response(response)
         except:
             response = {}
             response['status_code'] = "500"
             response['model_id'] = model_id
             response['calculation_id'] = calculation_id
             response['message'] = traceback.format_exc(limit=1)
-            response = json.dumps(response)
-            return response
+            return encode_response(response)
 
-    return dict(
+    return encode_response(dict(
         status_code=500,
         model_id=model_id,
         calculation_id=calculation_id,
         message="Internal Server Error. Request data does not fit. \"m_type\" should have the content "
                 "\"flopy_calculation\" "
-    )
-
+    ))
 
-def on_request(ch, method, props, body):
-    content = json.loads(body.decode("utf-8"))
-    ch.basic_ack(delivery_tag=method.delivery_tag)
-    response = process(content)
 
+def publish_response(response):
     write_channel.basic_publish(
         exchange='',
         routing_key='flopy_calculation_finished_queue',
@@ -98,8 +118,54 @@ def on_request(ch, method, props, body):
         ))
 
 
+def on_result(ch, delivery_tag, response):
+    publish_response(response)
+    ch.basic_ack(delivery_tag=delivery_tag)
+
+
+def on_error(ch, delivery_tag, content, error):
+    print('Calculation worker failed: %s' % str(error))
+    on_result(ch, delivery_tag, encode_response(dict(
+        status_code="500",
+        model_id=content.get("model_id"),
+        calculation_id=content.get("calculation_id"),
+        message=str(error)
+    )))
+
+
+def on_request(ch, method, props, body):
+    content = json.loads(body.decode("utf-8"))
+
+    if pool is not None:
+        # The calculation runs in a worker process, the delivery is acknowledged
+        # and the result published from the connection thread when it has finished
+        pool.apply_async(
+            process, (content,),
+            callback=lambda response: connection.add_callback_threadsafe(
+                functools.partial(on_result, ch, method.delivery_tag, response)
+            ),
+            error_callback=lambda e: connection.add_callback_threadsafe(
+                functools.partial(on_error, ch, method.delivery_tag, content, e)
+            )
+        )
+        return
+
+    ch.basic_ack(delivery_tag=method.delivery_tag)
+    response = process(content)
+    publish_response(response)
+
+
 print(os.environ)
 
+datafolder = os.path.realpath(sys.argv[1])
+
+# Worker processes are started before connecting, so they do not inherit the connection
+number_of_workers = int(os.environ.get('CALCULATION_WORKERS', 1))
+pool = None
+if number_of_workers > 1:
+    print('Starting pool of %s calculation workers' % number_of_workers)
+    pool = multiprocessing.Pool(processes=number_of_workers)
+
 connection = pika.BlockingConnection(
     pika.ConnectionParameters(
         host=get_config_parameter('RABBITMQ_HOST'),
@@ -109,7 +175,8 @@ connection = pika.BlockingConnection(
             get_config_parameter('RABBITMQ_USER'),
             get_config_parameter('RABBITMQ_PASSWORD')
         ),
-        heartbeat_interval=0
+        # Calculations in worker processes keep the connection responsive for heartbeats
+        heartbeat_interval=None if pool is not None else 0
     ))
 
 read_channel = connection.channel()
@@ -118,12 +185,10 @@ read_channel.queue_declare(queue=get_config_parameter('CALCULATION_QUEUE'), dura
 write_channel = connection.channel()
 write_channel.queue_declare(queue=get_config_parameter('CALCULATION_FINISHED_QUEUE'), durable=True)
 
-datafolder = os.path.realpath(sys.argv[1])
-
 scriptfolder = os.path.dirname(os.path.realpath(__file__))
 binfolder = os.path.join(scriptfolder, 'bin')
 
-read_channel.basic_qos(prefetch_count=1)
+read_channel.basic_qos(prefetch_count=number_of_workers)
 read_channel.basic_consume(on_request, queue=get_config_parameter('CALCULATION_QUEUE'))
 
 print(" [x] Awaiting RPC requests")
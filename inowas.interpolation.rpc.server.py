@@ -6,11 +6,27 @@ import json
 import numpy
 import pika
 import warnings
+from InowasInterpolation import Cubic
 from InowasInterpolation import Gaussian
+from InowasInterpolation import IDW
+from InowasInterpolation import Linear
 from InowasInterpolation import Mean
+from InowasInterpolation import Nearest
+from InowasInterpolation.GridInterpolation import serialize_grid
 
 warnings.filterwarnings("ignore")
 
+# Grids are predicted in a pool of processes with more than one worker
+number_of_workers = int(os.environ.get('INTERPOLATION_WORKERS', 1))
+
+grid_interpolations = dict(
+    gaussian=Gaussian.Gaussian,
+    idw=IDW.IDW,
+    nearest=Nearest.Nearest,
+    linear=Linear.Linear,
+    cubic=Cubic.Cubic
+)
+
 
 def get_config_parameter(name):
     if os.environ[name]:
@@ -34,13 +50,17 @@ def process(content):
     print('Version: %s' % version)
 
     if m_type == 'interpolation':
-        if 'gaussian' in data['methods']:
-            print('Running gaussian interpolation...')
-            interpolation = Gaussian.Gaussian(data)
-            result = interpolation.calculate()
+        # Methods are tried in the given order until one succeeds
+        for method in data['methods']:
+            if method not in grid_interpolations:
+                continue
+
+            print('Running %s interpolation...' % method)
+            interpolation = grid_interpolations[method](data)
+            result = interpolation.calculate(processes=number_of_workers)
             print('Finished ...')
             if isinstance(result, numpy.ndarray):
-                return result.tolist()
+                return serialize_grid(result, data.get('format'))
 
         if 'mean' in data['methods']:
             print('Running mean interpolation...')
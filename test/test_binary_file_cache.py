@@ -0,0 +1,127 @@
+import os
+from collections import OrderedDict
+
+import pytest
+
+from InowasFlopyAdapter.BinaryFileCache import BinaryFileCache
+
+
+class OpenedFile:
+    def __init__(self, filename, **kwargs):
+        self.filename = filename
+        self.kwargs = kwargs
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class OtherFile(OpenedFile):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    monkeypatch.setattr(BinaryFileCache, '_files', OrderedDict())
+    monkeypatch.setattr(BinaryFileCache, '_bytes', 0)
+    monkeypatch.setattr(BinaryFileCache, '_opened', {})
+    monkeypatch.setattr(BinaryFileCache, '_listings', OrderedDict())
+    monkeypatch.setattr(BinaryFileCache, 'max_files', 32)
+    monkeypatch.setattr(BinaryFileCache, 'max_bytes', 1024)
+
+
+def output_file(tmpdir, name, size=10):
+    filename = str(tmpdir.join(name))
+    with open(filename, 'wb') as f:
+        f.write(b'x' * size)
+    return filename
+
+
+def test_returns_the_opened_file(tmpdir):
+    filename = output_file(tmpdir, 'mf.hds')
+    opened = BinaryFileCache.get(filename, OpenedFile, precision='single')
+
+    assert BinaryFileCache.get(filename, OpenedFile, precision='single') is opened
+    assert BinaryFileCache.get(filename, OpenedFile, precision='double') is not opened
+    assert BinaryFileCache.get(filename, OtherFile, precision='single') is not opened
+
+
+def test_reopens_a_file_with_another_modification_time(tmpdir):
+    filename = output_file(tmpdir, 'mf.hds')
+    opened = BinaryFileCache.get(filename, OpenedFile)
+    other = BinaryFileCache.get(filename, OtherFile)
+    os.utime(filename, (1, 1))
+
+    reopened = BinaryFileCache.get(filename, OpenedFile)
+    assert reopened is not opened
+    assert opened.closed and other.closed
+    assert BinaryFileCache._bytes == 10
+
+
+def test_reopens_a_file_with_another_size(tmpdir):
+    filename = output_file(tmpdir, 'mf.hds')
+    opened = BinaryFileCache.get(filename, OpenedFile)
+    stat = os.stat(filename)
+    output_file(tmpdir, 'mf.hds', size=20)
+    os.utime(filename, (stat.st_atime, stat.st_mtime))
+
+    assert BinaryFileCache.get(filename, OpenedFile) is not opened
+    assert opened.closed
+    assert BinaryFileCache._bytes == 20
+
+
+def test_evicts_least_recently_used_by_number_of_files(tmpdir, monkeypatch):
+    monkeypatch.setattr(BinaryFileCache, 'max_files', 2)
+    a = BinaryFileCache.get(output_file(tmpdir, 'a'), OpenedFile)
+    b = BinaryFileCache.get(output_file(tmpdir, 'b'), OpenedFile)
+    BinaryFileCache.get(a.filename, OpenedFile)
+    c = BinaryFileCache.get(output_file(tmpdir, 'c'), OpenedFile)
+
+    assert b.closed and not a.closed and not c.closed
+    assert [key[0] for key in BinaryFileCache._files] == [a.filename, c.filename]
+    assert BinaryFileCache.get(b.filename, OpenedFile) is not b
+
+
+def test_evicts_least_recently_used_by_bytes(tmpdir, monkeypatch):
+    monkeypatch.setattr(BinaryFileCache, 'max_bytes', 25)
+    a = BinaryFileCache.get(output_file(tmpdir, 'a'), OpenedFile)
+    b = BinaryFileCache.get(output_file(tmpdir, 'b'), OpenedFile)
+    c = BinaryFileCache.get(output_file(tmpdir, 'c'), OpenedFile)
+
+    assert a.closed and not b.closed and not c.closed
+    assert BinaryFileCache._bytes == 20
+
+    # The most recently opened file is kept even if it is larger than the limit
+    large = BinaryFileCache.get(output_file(tmpdir, 'large', size=100), OpenedFile)
+    assert b.closed and c.closed and not large.closed
+    assert BinaryFileCache._bytes == 100
+
+
+def test_file_opened_by_several_classes_counts_once(tmpdir, monkeypatch):
+    monkeypatch.setattr(BinaryFileCache, 'max_bytes', 15)
+    filename = output_file(tmpdir, 'mf.hds')
+    opened = BinaryFileCache.get(filename, OpenedFile)
+    other = BinaryFileCache.get(filename, OtherFile)
+
+    assert not opened.closed and not other.closed
+    assert BinaryFileCache._bytes == 10
+
+    BinaryFileCache.remove(next(iter(BinaryFileCache._files)))
+    assert BinaryFileCache._bytes == 10
+    BinaryFileCache.remove(next(iter(BinaryFileCache._files)))
+    assert BinaryFileCache._bytes == 0
+
+
+def test_listings_are_kept_until_the_workspace_changes(tmpdir, monkeypatch):
+    monkeypatch.setattr(BinaryFileCache, 'max_files', 2)
+    workspaces = [tmpdir.mkdir(name) for name in ('a', 'b', 'c')]
+    output_file(workspaces[0], 'mf.hds')
+
+    assert BinaryFileCache.list_workspace(str(workspaces[0])) == ['mf.hds']
+    output_file(workspaces[0], 'mt.ucn')
+    os.utime(str(workspaces[0]), (1, 1))
+    assert sorted(BinaryFileCache.list_workspace(str(workspaces[0]))) == ['mf.hds', 'mt.ucn']
+
+    for workspace in workspaces:
+        BinaryFileCache.list_workspace(str(workspace))
+    assert list(BinaryFileCache._listings) == [str(workspaces[1]), str(workspaces[2])]
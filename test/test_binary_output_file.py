@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from InowasFlopyAdapter.BinaryOutputFile import BinaryOutputFile
+
+TIMES = [0.1, 1.2, 3650.5]
+
+
+def write_binary_file(file_name, data, times, text, precision='single', ucn=False):
+    """Writes (ntimes, nlay, nrow, ncol) data as head or concentration file"""
+    real = '<f4' if precision == 'single' else '<f8'
+    header = BinaryOutputFile.header_dtype('ucn' if ucn else 'head', precision)
+
+    with open(file_name, 'wb') as f:
+        for time_idx, totim in enumerate(times):
+            for lay in range(data.shape[1]):
+                record = np.zeros(1, header)
+                record['kstp'] = time_idx + 1
+                record['kper'] = 1
+                record['totim'] = totim
+                record['text'] = text
+                record['ncol'] = data.shape[3]
+                record['nrow'] = data.shape[2]
+                record['ilay'] = lay + 1
+                f.write(record.tobytes())
+                f.write(data[time_idx, lay].astype(real).tobytes())
+
+
+@pytest.fixture
+def data():
+    return np.arange(len(TIMES) * 2 * 3 * 4, dtype=float).reshape(len(TIMES), 2, 3, 4) / 7.
+
+
+@pytest.mark.parametrize('precision', ['single', 'double'])
+@pytest.mark.parametrize('ucn', [False, True])
+def test_detects_precision(tmpdir, data, precision, ucn):
+    filename = str(tmpdir.join('output'))
+    write_binary_file(filename, data, TIMES, 'CONCENTRATION' if ucn else 'HEAD', precision, ucn)
+
+    assert BinaryOutputFile.detect_precision(filename, 'ucn' if ucn else 'head') == precision
+
+    output_file = BinaryOutputFile(filename, file_type='ucn' if ucn else 'head')
+    assert (output_file.nlay, output_file.nrow, output_file.ncol) == (2, 3, 4)
+    np.testing.assert_allclose(output_file.get_layer(1.2, 1), data[1, 1], rtol=1e-6)
+
+
+@pytest.mark.parametrize('precision', ['single', 'double'])
+def test_times_have_the_shortest_representation(tmpdir, data, precision):
+    filename = str(tmpdir.join('mf.hds'))
+    write_binary_file(filename, data, TIMES, 'HEAD', precision)
+    output_file = BinaryOutputFile(filename)
+
+    assert output_file.get_times() == TIMES
+    assert [record[0] for record in output_file.get_records()] == [t for t in TIMES for _ in range(2)]
+    assert [totim for totim, value in output_file.get_ts([(1, 2, 3)])[0]] == TIMES
+
+
+def test_matches_exact_times(tmpdir, data):
+    filename = str(tmpdir.join('mf.hds'))
+    write_binary_file(filename, data, [1., 1.00001, 2.], 'HEAD')
+    output_file = BinaryOutputFile(filename)
+
+    np.testing.assert_allclose(output_file.get_layer(1.00001, 0), data[1, 0], rtol=1e-6)
+    np.testing.assert_allclose(output_file.get_layer(np.float32(1.00001), 0), data[1, 0], rtol=1e-6)
+
+    with pytest.raises(ValueError, match='totim 1.5 and layer 0'):
+        output_file.get_layer(1.5, 0)
+
+    with pytest.raises(ValueError, match='totim 1.0 and layer 2'):
+        output_file.get_layer(1.0, 2)
+
+
+def test_equals_flopy(tmpdir, data):
+    bf = pytest.importorskip('flopy.utils.binaryfile')
+    filename = str(tmpdir.join('mf.hds'))
+    write_binary_file(filename, data, TIMES, 'HEAD')
+
+    output_file = BinaryOutputFile(filename)
+    heads = bf.HeadFile(filename)
+
+    assert output_file.get_times() == [float(str(t)) for t in heads.get_times()]
+    for totim in output_file.get_times():
+        np.testing.assert_array_equal(
+            np.array([output_file.get_layer(totim, layer) for layer in range(2)]),
+            heads.get_data(totim=np.float32(totim))
+        )
+
+    time_series = np.array(output_file.get_ts([(1, 2, 3)])[0])
+    flopy_time_series = heads.get_ts((1, 2, 3))
+    np.testing.assert_array_equal(time_series[:, 1], flopy_time_series[:, 1])
+    assert time_series[:, 0].tolist() == [float(str(t)) for t in flopy_time_series[:, 0].astype(np.float32)]
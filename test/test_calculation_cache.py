@@ -0,0 +1,149 @@
+import os
+import threading
+
+import pytest
+
+from InowasFlopyAdapter.CalculationCache import CalculationCache
+
+DATA = {'mf': {'mf': {'modelname': 'mf', 'model_ws': '/data/a'}, 'dis': {'nlay': 1}}}
+
+
+def write(filename, content):
+    directory = os.path.dirname(filename)
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(filename, 'w') as f:
+        f.write(content)
+
+
+def read(filename):
+    with open(filename) as f:
+        return f.read()
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return CalculationCache(str(tmpdir.join('cache')))
+
+
+@pytest.fixture
+def calculated(tmpdir, cache):
+    workspace = str(tmpdir.join('calculated'))
+    write(os.path.join(workspace, 'mf.hds'), 'heads')
+    write(os.path.join(workspace, 'mf.list'), 'list')
+    write(os.path.join(workspace, 'summary.json'), '{}')
+    write(os.path.join(workspace, 'tiles', 'head_0.npy'), 'tile')
+    write(os.path.join(workspace, 'configuration.json'), 'request')
+    cache.store('3.2.9', DATA, workspace, {'heads': [1.0]}, 'normal termination')
+    return workspace
+
+
+def test_key_ignores_workspace_and_model_name():
+    other = {'mf': {'mf': {'modelname': 'other', 'model_ws': '/data/b'}, 'dis': {'nlay': 1}}}
+
+    assert CalculationCache.key('3.2.9', DATA) == CalculationCache.key('3.2.9', other)
+    assert CalculationCache.key('3.2.9', DATA) != CalculationCache.key('3.2.8', DATA)
+
+
+def test_restore(tmpdir, cache, calculated):
+    workspace = str(tmpdir.join('restored'))
+    os.makedirs(workspace)
+
+    assert cache.restore('3.2.9', DATA, workspace) == ({'heads': [1.0]}, 'normal termination')
+    assert read(os.path.join(workspace, 'mf.hds')) == 'heads'
+    assert read(os.path.join(workspace, 'tiles', 'head_0.npy')) == 'tile'
+    assert not os.path.exists(os.path.join(workspace, 'configuration.json'))
+
+    # Model output is linked, files rewritten in place by the post-processing are copied
+    assert os.stat(os.path.join(workspace, 'mf.hds')).st_nlink > 1
+    assert os.stat(os.path.join(workspace, 'summary.json')).st_nlink == 1
+    assert os.stat(os.path.join(workspace, 'tiles', 'head_0.npy')).st_nlink == 1
+
+
+def test_restore_unknown_calculation(tmpdir, cache):
+    assert cache.restore('3.2.9', DATA, str(tmpdir)) is None
+
+
+def test_release_removes_only_cache_links(tmpdir, cache, calculated):
+    workspace = str(tmpdir.join('restored'))
+    os.makedirs(workspace)
+    write(str(tmpdir.join('own_file')), 'own')
+    os.link(str(tmpdir.join('own_file')), os.path.join(workspace, 'own_link'))
+    cache.restore('3.2.9', DATA, workspace)
+
+    cache.release(workspace)
+
+    assert not os.path.exists(os.path.join(workspace, 'mf.hds'))
+    assert os.path.exists(os.path.join(workspace, 'own_link'))
+    assert os.path.exists(os.path.join(workspace, 'summary.json'))
+
+
+def test_rewriting_files_does_not_change_the_cache(tmpdir, cache, calculated):
+    # The calculated workspace shares its output with the cache after store
+    cache.release(calculated)
+    write(os.path.join(calculated, 'mf.hds'), 'new heads')
+
+    workspace = str(tmpdir.join('restored'))
+    os.makedirs(workspace)
+    cache.restore('3.2.9', DATA, workspace)
+    write(os.path.join(workspace, 'summary.json'), '{"changed": true}')
+
+    other = str(tmpdir.join('other'))
+    os.makedirs(other)
+    cache.restore('3.2.9', DATA, other)
+    assert read(os.path.join(other, 'mf.hds')) == 'heads'
+    assert read(os.path.join(other, 'summary.json')) == '{}'
+
+
+def test_evict_by_size_is_throttled(tmpdir, calculated):
+    cache = CalculationCache(str(tmpdir.join('cache')), max_size_mb=0, eviction_interval=3600)
+    cache.evict(force=True)
+    assert os.listdir(str(tmpdir.join('cache'))) == ['.last_eviction']
+
+    cache.store('3.2.9', DATA, calculated, {}, '')
+    cache.store('3.2.9', {'other': 1}, calculated, {}, '')
+    assert len(os.listdir(str(tmpdir.join('cache')))) == 3
+
+
+def test_eviction_while_restoring_is_a_cache_miss(tmpdir, monkeypatch, calculated):
+    cache = CalculationCache(str(tmpdir.join('cache')), max_size_mb=0)
+    workspace = str(tmpdir.join('restored'))
+    os.makedirs(workspace)
+
+    link = os.link
+
+    def evict_and_link(source, target):
+        cache.evict(force=True)
+        link(source, target)
+
+    monkeypatch.setattr(os, 'link', evict_and_link)
+
+    assert cache.restore('3.2.9', DATA, workspace) is None
+    assert os.listdir(str(tmpdir.join('cache'))) == ['.last_eviction']
+    assert not os.path.exists(os.path.join(workspace, 'mf.hds'))
+    assert not os.path.exists(os.path.join(workspace, '.calculation_cache_links'))
+
+
+def test_concurrent_evict_and_restore(tmpdir, calculated):
+    cache = CalculationCache(str(tmpdir.join('cache')), max_size_mb=0)
+
+    for i in range(20):
+        cache.store('3.2.9', DATA, calculated, {'heads': [1.0]}, 'normal termination')
+        workspace = str(tmpdir.join('restored_' + str(i)))
+        os.makedirs(workspace)
+
+        evicting = threading.Thread(target=cache.evict, kwargs={'force': True})
+        evicting.start()
+        restored = cache.restore('3.2.9', DATA, workspace)
+        evicting.join()
+
+        # Either the whole calculation is restored or the workspace does not link into the cache
+        if restored is not None:
+            assert restored == ({'heads': [1.0]}, 'normal termination')
+            assert read(os.path.join(workspace, 'mf.hds')) == 'heads'
+            assert read(os.path.join(workspace, 'mf.list')) == 'list'
+        else:
+            assert not os.path.exists(os.path.join(workspace, 'mf.hds'))
+            assert not os.path.exists(os.path.join(workspace, 'mf.list'))
+
+        assert os.listdir(str(tmpdir.join('cache'))) == ['.last_eviction']
@@ -0,0 +1,232 @@
+import base64
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from InowasInterpolation.Cubic import Cubic
+from InowasInterpolation.Gaussian import Gaussian
+from InowasInterpolation.GridInterpolation import GridInterpolation, serialize_grid
+from InowasInterpolation.IDW import IDW
+from InowasInterpolation.Kriging import Kriging, Variogram
+from InowasInterpolation.Linear import Linear
+from InowasInterpolation.ModelCache import ModelCache
+from InowasInterpolation.Nearest import Nearest
+
+
+@pytest.fixture(autouse=True)
+def model_cache(monkeypatch):
+    monkeypatch.setattr(ModelCache, '_models', OrderedDict())
+
+
+def request(points, values, n_x=20, n_y=15, **parameters):
+    return {
+        'bounding_box': {'x_min': 500000., 'x_max': 501000., 'y_min': 5700000., 'y_max': 5700750.},
+        'grid_size': {'n_x': n_x, 'n_y': n_y},
+        'point_values': [{'x': x, 'y': y, 'value': value} for (x, y), value in zip(points.tolist(), values)],
+        'parameters': parameters
+    }
+
+
+def random_points(n, seed=0):
+    random = np.random.RandomState(seed)
+    return np.column_stack((random.uniform(500000., 501000., n), random.uniform(5700000., 5700750., n)))
+
+
+def plane(points):
+    return 3. + 0.01 * (points[:, 0] - 500000.) - 0.02 * (points[:, 1] - 5700000.)
+
+
+def smooth(points):
+    return np.sin((points[:, 0] - 500000.) / 150.) + np.cos((points[:, 1] - 5700000.) / 100.)
+
+
+@pytest.mark.parametrize('neighbours', [None, 10])
+def test_kriging_is_exact_on_points(neighbours):
+    points = random_points(200)
+    values = plane(points) + np.random.RandomState(1).rand(200)
+    variogram = Variogram('exponential', sill=1., range=500., nugget=0.)
+    kriging = Kriging(variogram=variogram, neighbours=neighbours).fit(points, values)
+
+    np.testing.assert_allclose(kriging.predict(points), values, atol=1e-6)
+
+
+def test_local_kriging_of_tiles_is_close_to_kriging_of_each_point():
+    points = random_points(400)
+    kriging = Kriging(variogram=Variogram('spherical', sill=1., range=400.), neighbours=16).fit(points, smooth(points))
+
+    cells = Gaussian(request(points, smooth(points), n_x=100, n_y=75)).grid_points()
+    tiled = kriging.predict(cells)
+
+    per_point = kriging.predict_points(cells)
+
+    # Tiles use more than the nearest points, the estimates are at least as close to the field
+    np.testing.assert_allclose(tiled, per_point, atol=0.1)
+    assert np.sqrt(np.mean((tiled - smooth(cells)) ** 2)) <= np.sqrt(np.mean((per_point - smooth(cells)) ** 2))
+
+
+def test_local_kriging_of_a_tile_uses_the_nearest_points_of_all_its_cells():
+    points = random_points(300)
+    kriging = Kriging(variogram=Variogram('gaussian', sill=1., range=300.), neighbours=8).fit(points, smooth(points))
+    tile = np.floor(np.array([500500., 5700375.]) / kriging._tile_size)
+    cells = tile * kriging._tile_size + np.random.RandomState(5).uniform(0, kriging._tile_size, (40, 2))
+
+    used = []
+    query_ball_point = kriging._tree.query_ball_point
+    kriging._tree = type('Tree', (), {
+        'query': kriging._tree.query,
+        'query_ball_point': lambda self, center, radius: used.append(query_ball_point(center, radius)) or used[-1]
+    })()
+    kriging.predict_tile(tile, cells)
+
+    _, nearest = kriging._tree.query(cells, k=8)
+    assert set(nearest.ravel()) <= set(used[0])
+
+
+def test_local_kriging_does_not_depend_on_the_points_predicted_together():
+    points = random_points(300)
+    kriging = Kriging(variogram=Variogram('spherical', sill=1., range=400.), neighbours=12).fit(points, smooth(points))
+    cells = Gaussian(request(points, smooth(points), n_x=40, n_y=30)).grid_points()
+
+    np.testing.assert_allclose(
+        np.concatenate([kriging.predict(cells[start:start + 7]) for start in range(0, len(cells), 7)]),
+        kriging.predict(cells)
+    )
+
+
+def test_kriging_merges_duplicate_points():
+    points = np.array([[0., 0.], [0., 0.], [10., 0.], [0., 10.]])
+    kriging = Kriging(variogram=Variogram('gaussian', sill=1., range=20.)).fit(points, [1., 3., 5., 7.])
+
+    np.testing.assert_allclose(kriging.predict([[0., 0.]]), [2.])
+
+
+def test_fitted_variogram():
+    points = random_points(300)
+    variogram = Variogram.fit(points, plane(points) + np.random.RandomState(1).normal(0., 0.5, 300))
+
+    assert variogram.model == 'spherical'
+    assert variogram.sill > 0 and variogram.range > 0 and variogram.nugget >= 0
+    assert Variogram(**variogram.to_dict()).to_dict() == variogram.to_dict()
+
+
+def test_gaussian_with_fixed_variogram():
+    points = random_points(30)
+    variogram = {'model': 'exponential', 'sill': 2., 'range': 300., 'nugget': 0.}
+    interpolation = Gaussian(request(points, plane(points), variogram=variogram))
+    grid = interpolation.calculate()
+
+    expected = Kriging(variogram=Variogram(**variogram)).fit(points, plane(points)).predict(interpolation.grid_points())
+    np.testing.assert_allclose(grid.ravel(), expected)
+
+
+def test_grid_interpolation_is_abstract():
+    with pytest.raises(TypeError):
+        GridInterpolation(request(random_points(3), [1., 2., 3.]))
+
+
+def test_nearest():
+    points = random_points(30)
+    values = np.arange(30.)
+    interpolation = Nearest(request(points, values))
+    grid = interpolation.calculate()
+
+    cells = interpolation.grid_points()
+    nearest = np.argmin(((cells[:, None, :] - points[None, :, :]) ** 2).sum(axis=2), axis=1)
+    np.testing.assert_array_equal(grid.ravel(), values[nearest])
+
+
+def test_idw_is_exact_on_points():
+    points = random_points(30)
+    values = np.random.RandomState(1).rand(30)
+    interpolation = IDW(request(points, values, power=3))
+    interpolation.fit()
+
+    np.testing.assert_allclose(interpolation.predict(points), values)
+    assert np.all(interpolation.predict(random_points(50, seed=2)) <= values.max())
+
+
+def test_idw_with_one_neighbour_is_nearest():
+    points = random_points(30)
+    values = np.arange(30.)
+
+    np.testing.assert_array_equal(
+        IDW(request(points, values, neighbours=1)).calculate(),
+        Nearest(request(points, values)).calculate()
+    )
+
+
+@pytest.mark.parametrize('interpolation_class', [Linear, Cubic])
+def test_linear_and_cubic_reproduce_planes(interpolation_class):
+    points = random_points(40)
+    interpolation = interpolation_class(request(points, plane(points)))
+    interpolation.fit()
+
+    inside = random_points(200, seed=3)
+    inside = inside[interpolation._interpolator.tri.find_simplex(inside - interpolation._offset) >= 0]
+    np.testing.assert_allclose(interpolation.predict(inside), plane(inside), atol=1e-4)
+
+
+def test_linear_outside_the_hull_is_nearest():
+    points = np.array([[500400., 5700300.], [500600., 5700300.], [500600., 5700500.], [500400., 5700500.]])
+    values = [1., 2., 3., 4.]
+    interpolation = Linear(request(points, values))
+    interpolation.fit()
+
+    corners = np.array([[500000., 5700000.], [501000., 5700000.], [501000., 5700750.], [500000., 5700750.]])
+    np.testing.assert_array_equal(interpolation.predict(corners), values)
+
+@pytest.mark.parametrize('interpolation_class, parameters', [
+    (IDW, {}), (Linear, {}), (Gaussian, {}), (Gaussian, {'neighbours': 8})
+])
+def test_row_blocks_and_processes_equal_a_single_block(interpolation_class, parameters):
+    points = random_points(40)
+    values = plane(points)
+
+    expected = interpolation_class(request(points, values, n_x=23, n_y=17, **parameters)).calculate()
+    blocks = interpolation_class(request(points, values, n_x=23, n_y=17, chunk_size=50, **parameters))
+    assert len(blocks.row_blocks()) == 9
+
+    np.testing.assert_allclose(blocks.calculate(), expected)
+    np.testing.assert_allclose(blocks.calculate(processes=2), expected)
+
+
+def test_calculation_failure_returns_false():
+    assert IDW(request(np.empty((0, 2)), [])).calculate() is False
+
+
+def test_serialize_grid():
+    grid = np.arange(6.).reshape(2, 3) / 3.
+
+    assert serialize_grid(grid) == grid.tolist()
+
+    serialized = serialize_grid(grid, 'base64')
+    assert serialized['shape'] == [2, 3] and serialized['dtype'] == 'float32'
+    np.testing.assert_array_equal(
+        np.frombuffer(base64.b64decode(serialized['data']), dtype='<f4').reshape(2, 3),
+        grid.astype(np.float32)
+    )
+
+
+def test_fitted_models_are_cached(monkeypatch):
+    points = random_points(30)
+    fits = []
+    monkeypatch.setattr(IDW, 'fit', lambda self: fits.append(1) or Nearest.fit(self))
+
+    first = IDW(request(points, plane(points))).calculate()
+    second = IDW(request(points, plane(points), n_x=5)).calculate()
+    IDW(request(points, plane(points) + 1)).calculate()
+
+    assert len(fits) == 2
+    assert second.shape == (15, 5)
+    assert first.shape == (15, 20)
+
+
+def test_model_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(ModelCache, 'max_models', 2)
+    ModelCache.put('a', 1)
+    ModelCache.put('b', 2)
+    ModelCache.get('a')
+    ModelCache.put('c', 3)
+
+    assert (ModelCache.get('a'), ModelCache.get('b'), ModelCache.get('c')) == (1, None, 3)
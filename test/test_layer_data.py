@@ -0,0 +1,49 @@
+import base64
+
+import numpy as np
+import pytest
+
+from InowasFlopyAdapter.LayerData import serialize_layer
+
+
+def decode(serialized):
+    """Returns the masked array of a base64 serialized layer"""
+    shape = serialized['shape']
+    size = int(np.prod(shape))
+    data = np.frombuffer(base64.b64decode(serialized['data']), dtype='<f4').reshape(shape)
+    nodata = np.unpackbits(np.frombuffer(base64.b64decode(serialized['nodata']), dtype=np.uint8))[:size]
+    return np.ma.masked_array(data, mask=nodata.reshape(shape).astype(bool))
+
+
+def layer(nodata_cells):
+    data = np.arange(15, dtype=float).reshape(3, 5) * 1.23456 - 4.
+    data.flat[nodata_cells] = -1e30
+    return data
+
+
+@pytest.mark.parametrize('nodata_cells', [[], [0, 7, 14], list(range(15))])
+def test_base64_round_trip(nodata_cells):
+    data = layer(nodata_cells)
+    serialized = serialize_layer(data, 'base64')
+    expected = np.ma.masked_less(np.round(data, 2), -999).astype(np.float32)
+
+    assert (serialized['format'], serialized['dtype'], serialized['shape']) == ('base64', 'float32', [3, 5])
+    decoded = decode(serialized)
+    np.testing.assert_array_equal(decoded.mask, np.ma.getmaskarray(expected))
+    np.testing.assert_array_equal(decoded.filled(0), expected.filled(0))
+
+
+def test_all_nodata_layer():
+    decoded = decode(serialize_layer(layer(list(range(15))), 'base64'))
+
+    assert decoded.mask.all()
+    assert serialize_layer(layer(list(range(15)))) == [[None] * 5] * 3
+
+
+def test_nested_list_with_none_for_nodata():
+    data = layer([0, 7])
+    serialized = serialize_layer(data)
+
+    assert serialized[0][0] is None and serialized[1][2] is None
+    assert serialized[2][4] == round(data[2, 4], 2)
+    assert serialize_layer(layer([])) == np.round(layer([]), 2).tolist()
@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pytest
+
+from InowasFlopyAdapter.ListBudget import ListBudget
+
+TERMS = ['STORAGE', 'CONSTANT HEAD', 'WELLS', 'RIVER LEAKAGE', 'HEAD DEP BOUNDS']
+
+
+def budget_block(sp, ts, totim, values_in, values_out):
+    block = '\n\n  VOLUMETRIC BUDGET FOR ENTIRE MODEL AT END OF TIME STEP%5d, STRESS PERIOD%4d\n' % (ts, sp)
+    block += '  ' + '-' * 78 + '\n\n'
+    block += '     CUMULATIVE VOLUMES      L**3       RATES FOR THIS TIME STEP      L**3/T\n'
+    block += '     ------------------                 ------------------------\n\n'
+    block += '           IN:                                      IN:\n'
+    block += '           ---                                      ---\n'
+    for term, value in zip(TERMS, values_in):
+        block += '%20s =%17.4f   %20s =%17.4f\n' % (term, value * totim, term, value)
+    block += '\n%20s =%17.4f   %20s =%17.4f\n\n' % ('TOTAL IN', sum(values_in) * totim, 'TOTAL IN', sum(values_in))
+    block += '          OUT:                                     OUT:\n'
+    block += '          ----                                     ----\n'
+    for term, value in zip(TERMS, values_out):
+        block += '%20s =%17.4f   %20s =%17.4f\n' % (term, value * totim, term, value)
+    block += '\n%20s =%17.4f   %20s =%17.4f\n\n' % (
+        'TOTAL OUT', sum(values_out) * totim, 'TOTAL OUT', sum(values_out)
+    )
+    block += '%20s =%17.4E   %20s =%17.4E\n\n' % ('IN - OUT', 1.234e-3 * totim, 'IN - OUT', 1.5e-4)
+    block += '%20s =%17.2f   %20s =%17.2f\n\n\n\n\n' % ('PERCENT DISCREPANCY', 0.01, 'PERCENT DISCREPANCY', -0.02)
+    block += '         TIME SUMMARY AT END OF TIME STEP%5d IN STRESS PERIOD%5d\n' % (ts, sp)
+    block += '                    SECONDS     MINUTES      HOURS       DAYS        YEARS\n'
+    block += '                    ' + '-' * 59 + '\n'
+    times = (('   TIME STEP LENGTH', 1.5), (' STRESS PERIOD TIME', ts * 1.5), ('         TOTAL TIME', totim))
+    for label, days in times:
+        block += label + '%12.5G%12.5G%12.5G%12.5G%12.5G\n' % (
+            days * 86400, days * 1440, days * 24, days, days / 365.25
+        )
+    block += ' SOLVING FOR HEAD\n'
+    return block
+
+
+@pytest.fixture
+def list_file(tmpdir):
+    random = np.random.RandomState(0)
+    blocks = []
+    for sp in range(1, 4):
+        for ts in range(1, 4):
+            totim = ((sp - 1) * 3 + ts) * 1.5
+            blocks.append(budget_block(sp, ts, totim, random.uniform(0, 5000, 5), random.uniform(0, 5000, 5)))
+
+    filename = str(tmpdir.join('mf.list'))
+    with open(filename, 'w') as f:
+        f.write('MODFLOW LIST FILE\n' + ''.join(blocks))
+
+    return filename
+
+
+def test_budget_equals_flopy(list_file):
+    mflistfile = pytest.importorskip('flopy.utils.mflistfile')
+    mf_list = mflistfile.MfListBudget(list_file)
+    budget = ListBudget.load(list_file)
+
+    assert budget.get_times() == [float(totim) for totim in mf_list.get_times()]
+    for totim in budget.get_times():
+        for incremental in (False, True):
+            expected = {}
+            for x in mf_list.get_data(totim=totim, incremental=incremental):
+                name = x[2].decode('UTF-8') if isinstance(x[2], bytes) else str(x[2])
+                # Newer flopy versions add the time step length
+                if name != 'tslen':
+                    expected[name] = str(x[1])
+            assert budget.get_data(totim, incremental=incremental) == expected
+
+
+def test_budget_values(list_file):
+    budget = ListBudget.load(list_file)
+
+    assert budget.get_times() == [1.5 * i for i in range(1, 10)]
+    assert budget.names[:2] == ['STORAGE_IN', 'CONSTANT_HEAD_IN']
+    assert 'IN-OUT' in budget.names and 'PERCENT_DISCREPANCY' in budget.names
+    np.testing.assert_array_equal(budget.time_step, [0, 1, 2] * 3)
+    np.testing.assert_array_equal(budget.stress_period, [0, 0, 0, 1, 1, 1, 2, 2, 2])
+
+    data = budget.get_data(3.0, incremental=True)
+    assert float(data['STORAGE_OUT']) < 0 < float(data['STORAGE_IN'])
+    assert data['PERCENT_DISCREPANCY'] == '-0.02'
+
+
+def test_cache_file_is_parsed_once(list_file, monkeypatch):
+    times = ListBudget.load(list_file).get_times()
+    assert os.path.exists(list_file + '.budget.npz')
+
+    monkeypatch.setattr(ListBudget, 'parse', None)
+    assert ListBudget.load(list_file).get_times() == times
+
+
+def test_cache_file_is_parsed_again_for_a_newer_list_file(list_file):
+    ListBudget.load(list_file)
+    with open(list_file) as f:
+        content = f.read()
+    with open(list_file, 'w') as f:
+        f.write(content[:content.index('VOLUMETRIC BUDGET', 1000)])
+
+    cache_mtime = os.path.getmtime(list_file + '.budget.npz')
+    os.utime(list_file, (cache_mtime + 10, cache_mtime + 10))
+
+    assert ListBudget.load(list_file).get_times() == [1.5]
@@ -0,0 +1,67 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+gdal = pytest.importorskip('osgeo.gdal')
+
+# The geo processing modules import each other relative to their folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'InowasGeoProcessing'))
+
+from RasterFile import RasterFile  # noqa: E402
+from InowasGeoProcessing import InowasGeoProcessing  # noqa: E402
+
+DATA = np.arange(8 * 6, dtype=np.int16).reshape(6, 8)
+
+
+@pytest.fixture
+def raster(tmpdir):
+    """Single band GTiff of 8 x 6 pixels of 10 x 10 m with the origin at (1000, 2000)"""
+    memory = gdal.GetDriverByName('MEM').Create('', DATA.shape[1], DATA.shape[0], 1, gdal.GDT_Int16)
+    memory.SetGeoTransform((1000., 10., 0., 2000., 0., -10.))
+    memory.GetRasterBand(1).WriteArray(DATA)
+
+    filename = str(tmpdir.join('raster.tif'))
+    gdal.GetDriverByName('GTiff').CreateCopy(filename, memory)
+    return filename
+
+
+def test_reads_full_resolution_in_band_data_type(raster):
+    data = RasterFile(raster).get_data()
+
+    assert data == [DATA.tolist()]
+    assert isinstance(data[0][0][0], int)
+
+
+def test_reads_resampled_as_float(raster):
+    data = np.array(RasterFile(raster).get_data(width=4, height=3, method='average'))
+
+    assert data.shape == (1, 3, 4)
+    assert data.dtype == np.float64
+    np.testing.assert_allclose(data[0], DATA.reshape(3, 2, 4, 2).mean(axis=(1, 3)))
+
+
+def test_reads_bounding_box_window(raster):
+    raster_file = RasterFile(raster)
+    raster_file.open_file()
+    bounding_box = {'x_min': 1015, 'x_max': 1040, 'y_min': 1960, 'y_max': 1985}
+
+    assert raster_file.window(bounding_box) == (1, 1, 3, 3)
+    assert raster_file.get_data(bounding_box=bounding_box) == [DATA[1:4, 1:4].tolist()]
+
+
+def test_maps_legacy_methods_to_linear(raster):
+    assert RasterFile.resample_algorithm('wrap') == RasterFile.resample_algorithm('linear')
+    assert RasterFile(raster).get_data(4, 3, method='constant') == RasterFile(raster).get_data(4, 3)
+
+
+def test_rejects_unknown_methods(raster, tmpdir):
+    with pytest.raises(ValueError):
+        RasterFile.resample_algorithm('bicubic')
+
+    response = InowasGeoProcessing(str(tmpdir), {
+        'method': 'extractRasterData',
+        'parameters': {'file': os.path.basename(raster), 'width': 4, 'height': 3, 'method': 'bicubic'}
+    }).response()
+    assert response['status_code'] == 422
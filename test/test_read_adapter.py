@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from InowasFlopyAdapter.InowasFlopyReadAdapter import InowasFlopyReadAdapter
+from test_binary_output_file import write_binary_file
+
+TIMES = [1., 2.5, 10.]
+
+REQUESTS = [
+    {'timeseries': {'type': 'head', 'cells': [[0, 1, 2], [1, 2, 3]]}},
+    {'layerdata': {'type': 'concentration', 'totim': 2.5, 'layer': 1}},
+    {'layerdata': {'type': 'head', 'totim': 10., 'layer': 0, 'format': 'base64'}},
+    {'filelist': True},
+    {'timeseries': {'type': 'concentration', 'layer': 1, 'row': 0, 'column': 3}},
+    {'layerdata': {'type': 'head', 'totim': 1., 'layer': 1}},
+    {'timeseries': {'type': 'head', 'layer': 0, 'row': 2, 'column': 1}}
+]
+
+
+@pytest.fixture
+def workspace(tmpdir):
+    data = np.random.RandomState(0).rand(len(TIMES), 2, 3, 4) * 10.
+    write_binary_file(str(tmpdir.join('mf.hds')), data, TIMES, 'HEAD')
+    write_binary_file(str(tmpdir.join('MT3D001.UCN')), data / 10., TIMES, 'CONCENTRATION', ucn=True)
+    return str(tmpdir)
+
+
+def test_batch_equals_the_single_requests_in_order(workspace):
+    expected = [InowasFlopyReadAdapter('3.2.9', workspace, request).read_request(request) for request in REQUESTS]
+
+    response = InowasFlopyReadAdapter('3.2.9', workspace, {'batch': REQUESTS}).response()
+
+    assert response['status_code'] == 200
+    assert response['response'] == expected
+    assert all(data not in (None, []) for data in expected)
+
+
+def test_batch_is_read_grouped_by_output_file(workspace, monkeypatch):
+    adapter = InowasFlopyReadAdapter('3.2.9', workspace, {'batch': REQUESTS})
+    read = []
+    read_request = adapter.read_request
+    monkeypatch.setattr(adapter, 'read_request', lambda request: read.append(request) or read_request(request))
+
+    adapter.read_batch(REQUESTS)
+
+    assert [InowasFlopyReadAdapter.output_file(request) for request in read] == [
+        ('concentration', 'layerdata'), ('concentration', 'timeseries'), ('filelist', 'filelist'),
+        ('head', 'layerdata'), ('head', 'layerdata'), ('head', 'timeseries'), ('head', 'timeseries')
+    ]
+    # Requests of the same file and type keep their order
+    assert read[3] is REQUESTS[2] and read[4] is REQUESTS[5]
@@ -0,0 +1,58 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from InowasFlopyAdapter.ReadHead import ReadHead
+from InowasFlopyAdapter.ReadSummary import ReadSummary
+from test_binary_output_file import write_binary_file
+
+TIMES = [1., 2.5, 10.]
+
+
+def write_heads(workspace, times):
+    filename = os.path.join(workspace, 'mf.hds')
+    write_binary_file(filename, np.ones((len(times), 2, 3, 4)), times, 'HEAD')
+    return filename
+
+
+@pytest.fixture
+def workspace(tmpdir):
+    workspace = str(tmpdir)
+    write_heads(workspace, TIMES)
+    write_binary_file(str(tmpdir.join('MT3D001.UCN')), np.zeros((2, 2, 3, 4)), TIMES[:2], 'CONCENTRATION', ucn=True)
+    return workspace
+
+
+def summary_file(workspace):
+    with open(os.path.join(workspace, 'summary.json')) as f:
+        return json.load(f)
+
+
+def test_summary_of_all_outputs(workspace):
+    summary = ReadSummary(workspace).read()
+
+    assert summary == {
+        'budgets': [], 'concentrations': TIMES[:2], 'drawdowns': [], 'heads': TIMES, 'number_of_layers': 2
+    }
+    assert summary_file(workspace) == summary
+
+
+def test_persisted_summary_is_read(workspace, monkeypatch):
+    summary = ReadSummary(workspace).read()
+
+    monkeypatch.setattr(ReadHead, 'read_times', lambda self: pytest.fail('outputs read again'))
+    assert ReadSummary(workspace).read() == summary
+
+
+def test_summary_is_not_reused_after_outputs_changed(workspace):
+    ReadSummary(workspace).read()
+    summary_mtime = os.path.getmtime(os.path.join(workspace, 'summary.json'))
+
+    filename = write_heads(workspace, [5., 6.])
+    os.utime(filename, (summary_mtime + 10, summary_mtime + 10))
+
+    summary = ReadSummary(workspace).read()
+    assert summary['heads'] == [5., 6.]
+    assert summary_file(workspace)['heads'] == [5., 6.]
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from InowasFlopyAdapter import ResponseEncoder
+from InowasFlopyAdapter.ResponseEncoder import REPORT_FILE, bounded_message, encode_response
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def encoder(request, monkeypatch):
+    if request.param == 'orjson':
+        if ResponseEncoder.orjson is None:
+            pytest.skip('orjson is not installed')
+    else:
+        monkeypatch.setattr(ResponseEncoder, 'orjson', None)
+    return encode_response
+
+
+def test_encodes_json_bytes(encoder):
+    response = {'status_code': '200', 'data': {'heads': [0.0, 1.5], 'number_of_layers': 2}, 'message': 'ok'}
+    encoded = encoder(response)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded.decode()) == response
+
+
+def test_nan_and_infinity_are_null(encoder):
+    encoded = encoder({'values': [1.0, float('nan'), float('inf'), -float('inf')], 'nested': ({'x': float('nan')},)})
+
+    assert json.loads(encoded.decode()) == {'values': [1.0, None, None, None], 'nested': [{'x': None}]}
+
+
+def test_orjson_does_not_copy_the_response(monkeypatch):
+    if ResponseEncoder.orjson is None:
+        pytest.skip('orjson is not installed')
+    monkeypatch.setattr(ResponseEncoder, 'finite_values', lambda value: pytest.fail('response copied'))
+
+    assert json.loads(encode_response({'values': [float('nan')]}).decode()) == {'values': [None]}
+
+
+def test_short_message_is_kept(tmpdir):
+    assert bounded_message('normal termination', str(tmpdir), max_length=100) == ('normal termination', None)
+    assert not tmpdir.join(REPORT_FILE).exists()
+
+
+def test_long_message_is_written_to_report(tmpdir):
+    message = 'a' * 100 + 'b' * 100
+    bounded, report_file = bounded_message(message, str(tmpdir), max_length=50)
+
+    assert report_file == REPORT_FILE
+    assert tmpdir.join(REPORT_FILE).read() == message
+    assert bounded.startswith('a' * 25) and bounded.endswith('b' * 25)
+    assert REPORT_FILE in bounded
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+
+from InowasFlopyAdapter.ResultTiles import ResultTiles
+from test_binary_output_file import write_binary_file
+
+TIMES = [0.1, 1.2]
+
+
+@pytest.fixture
+def data():
+    data = np.random.RandomState(0).rand(len(TIMES), 2, 5, 7)
+    data[0, 0, 0, 0] = -9999.
+    return data
+
+
+@pytest.fixture
+def tiles(tmpdir, data, monkeypatch):
+    filename = str(tmpdir.join('mf.hds'))
+    write_binary_file(filename, data, TIMES, 'HEAD')
+    monkeypatch.setattr(ResultTiles, 'min_size', 2)
+    return ResultTiles(filename, 'head', file_type='head')
+
+
+def test_aggregate_leaves_out_nodata():
+    data = np.array([[-9999., 1., 2.], [3., 4., 5.]])
+    aggregated = ResultTiles.aggregate(data, 2)
+
+    np.testing.assert_array_equal(aggregated[:, 0, 0], [1., 8. / 3., 4.])
+    np.testing.assert_array_equal(aggregated[:, 0, 1], [2., 3.5, 5.])
+
+
+def test_written_tiles_equal_aggregated_layers(tiles, data):
+    index = tiles.write()
+
+    assert index['times'] == TIMES
+    assert [level['zoom'] for level in index['levels']] == [1, 2]
+    for time_idx, totim in enumerate(TIMES):
+        for layer in range(2):
+            for aggregation in ResultTiles.aggregations:
+                expected = ResultTiles.aggregate(
+                    data[time_idx, layer].astype('<f4'), 2
+                )[ResultTiles.aggregations.index(aggregation)]
+                tile = tiles.read_tile(totim, layer, 1, aggregation)
+                np.testing.assert_allclose(tile, expected, rtol=1e-6)
+
+
+def test_reads_layers_without_tiles(tiles, data):
+    assert tiles.read_tile(1.2, 1, 1, 'mean') is None
+
+    np.testing.assert_allclose(
+        tiles.read_layer(1.2, 1, zoom=1, aggregation='max'),
+        ResultTiles.aggregate(data[1, 1].astype('<f4'), 2)[2], rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        tiles.read_layer(1.2, 1, window={'row': {'min': 1, 'max': 3}, 'col': {'min': 2, 'max': 7}}),
+        data[1, 1, 1:3, 2:7], rtol=1e-6
+    )
+
+
+def test_rejects_unknown_times(tiles):
+    tiles.write()
+    assert os.path.exists(tiles._index_file)
+
+    with pytest.raises(ValueError, match='totim 0.5'):
+        tiles.read_tile(0.5, 0, 1, 'mean')
+
+    with pytest.raises(ValueError, match='totim 0.5'):
+        tiles.read_layer(0.5, 0, zoom=0)